@@ -7,10 +7,19 @@ export { createStateAdapter } from './src/state/create-state-adapter'
 export { setupCronHandlers, CronManager } from './src/cron-handler'
 export { isApiStep, isCronStep, isEventStep, isNoopStep } from './src/guards'
 export { LockedData } from './src/locked-data'
-export { getStepConfig, getStreamConfig } from './src/get-step-config'
-export { StateAdapter } from './src/state/state-adapter'
+export {
+  getStepConfig,
+  getStepConfigs,
+  getStreamConfig,
+  getStreamConfigs,
+  ConfigOptions,
+  ConfigResult,
+} from './src/get-step-config'
+export { ConfigCache } from './src/config-cache'
+export { StateAdapter, StateManager } from './src/state/state-adapter'
 export { createMermaidGenerator } from './src/mermaid-generator'
 export { StreamConfig, MotiaStream } from './src/types-stream'
+export { StreamPatch } from './src/streams/stream-patch'
 export { getProjectIdentifier, getUserIdentifier, isAnalyticsEnabled, trackEvent } from './src/analytics/utils'
 export { Motia } from './src/motia'
 export { NoPrinter, Printer } from './src/printer'
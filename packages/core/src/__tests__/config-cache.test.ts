@@ -0,0 +1,64 @@
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { ConfigCache } from '../config-cache'
+
+describe('ConfigCache', () => {
+  let baseDir: string
+  let stepFile: string
+  let depFile: string
+
+  beforeEach(() => {
+    baseDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-config-cache-'))
+    stepFile = path.join(baseDir, 'steps', 'api_step.py')
+    depFile = path.join(baseDir, 'steps', 'services.py')
+
+    fs.mkdirSync(path.join(baseDir, 'steps'))
+    fs.writeFileSync(stepFile, 'config = {}')
+    fs.writeFileSync(depFile, 'VALUE = 1')
+  })
+
+  afterEach(() => {
+    fs.rmSync(baseDir, { recursive: true, force: true })
+  })
+
+  it('should return a config saved by another instance', () => {
+    const cache = new ConfigCache(baseDir)
+    cache.set(stepFile, { name: 'api' }, [depFile])
+    cache.save()
+
+    expect(new ConfigCache(baseDir).get(stepFile)).toEqual({ name: 'api' })
+  })
+
+  it('should miss when the step file changes', () => {
+    const cache = new ConfigCache(baseDir)
+    cache.set(stepFile, { name: 'api' }, [depFile])
+    cache.save()
+
+    fs.writeFileSync(stepFile, 'config = {"name": "changed"}')
+
+    expect(new ConfigCache(baseDir).get(stepFile)).toBeUndefined()
+  })
+
+  it('should miss when a dependency changes or is removed', () => {
+    const cache = new ConfigCache(baseDir)
+    cache.set(stepFile, { name: 'api' }, [depFile])
+    cache.save()
+
+    fs.writeFileSync(depFile, 'VALUE = 2')
+    expect(new ConfigCache(baseDir).get(stepFile)).toBeUndefined()
+
+    fs.rmSync(depFile)
+    expect(new ConfigCache(baseDir).get(stepFile)).toBeUndefined()
+  })
+
+  it('should hit when a file is touched without changing its content', () => {
+    const cache = new ConfigCache(baseDir)
+    cache.set(stepFile, { name: 'api' }, [depFile])
+    cache.save()
+
+    fs.writeFileSync(depFile, 'VALUE = 1')
+
+    expect(new ConfigCache(baseDir).get(stepFile)).toEqual({ name: 'api' })
+  })
+})
@@ -2,6 +2,7 @@ import path from 'path'
 import { LockedData } from '../locked-data'
 import { createApiStep, createCronStep, createEventStep, createNoopStep } from './fixtures/step-fixtures'
 import { NoPrinter } from '../printer'
+import { getIgnoredExecutorReason } from '../step-validator'
 
 describe('LockedData', () => {
   describe('step creation', () => {
@@ -48,6 +49,36 @@ describe('LockedData', () => {
     })
   })
 
+  describe('step executor', () => {
+    const pythonStepPath = path.join(process.cwd(), '/playground/steps/crunch_step.py')
+
+    it('should warn when the runner mode cannot run the step in the process pool', () => {
+      const printer = new NoPrinter()
+      const printIgnoredExecutor = jest.spyOn(printer, 'printIgnoredExecutor')
+      const lockedData = new LockedData(process.cwd(), 'memory', printer)
+      const step = createEventStep({ executor: 'process' }, pythonStepPath)
+
+      lockedData.createStep(step, { disableTypeCreation: true })
+
+      expect(lockedData.activeSteps).toEqual([step])
+      expect(printIgnoredExecutor).toHaveBeenCalledWith(
+        step,
+        expect.stringContaining('MOTIA_PYTHON_RUNNER_MODE=worker'),
+      )
+    })
+
+    it('should only honour the executor of Python steps in worker mode', () => {
+      const pythonStep = createEventStep({ executor: 'process' }, pythonStepPath)
+
+      expect(getIgnoredExecutorReason(pythonStep, 'worker')).toBeUndefined()
+      expect(getIgnoredExecutorReason(pythonStep, 'zygote')).toContain('zygote mode')
+      expect(getIgnoredExecutorReason(createEventStep({ executor: 'process' }), 'worker')).toContain(
+        'only Python steps',
+      )
+      expect(getIgnoredExecutorReason(createEventStep(), 'process')).toBeUndefined()
+    })
+  })
+
   describe('step filtering', () => {
     let lockedData: LockedData
 
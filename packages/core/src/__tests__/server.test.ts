@@ -7,6 +7,8 @@ import { createApiStep } from './fixtures/step-fixtures'
 import { MemoryStateAdapter } from '../state/adapters/memory-state-adapter'
 import path from 'path'
 import { NoPrinter } from '../printer'
+import { MemoryStreamAdapter } from '../streams/adapters/memory-stream-adapter'
+import { BaseStreamItem, MotiaStream } from '../types-stream'
 
 const config = { isVerbose: true }
 
@@ -118,4 +120,84 @@ describe('Server', () => {
       await server.close()
     })
   })
+
+  describe('Streams', () => {
+    type Message = { message: string; done?: boolean }
+
+    const baseDir = path.join(__dirname, 'steps')
+    let lockedData: LockedData
+    let server: MotiaServer
+
+    const createStream = (adapter: MotiaStream<Message>) => {
+      return lockedData.createStream<Message>({
+        filePath: '__motia.messages',
+        hidden: true,
+        config: {
+          name: 'messages',
+          baseConfig: { storageType: 'custom', factory: () => adapter },
+          schema: null as never,
+        },
+      })()
+    }
+
+    beforeEach(async () => {
+      lockedData = new LockedData(baseDir, 'memory', new NoPrinter())
+      server = await createServer(lockedData, createEventManager(), new MemoryStateAdapter(), config)
+    })
+
+    afterEach(async () => server?.close())
+
+    it('should append and patch without setting the whole item through the stream', async () => {
+      const stream = createStream(new MemoryStreamAdapter<Message>())
+      const set = jest.spyOn(stream, 'set')
+
+      expect(await stream.append('group', 'item', 'message', 'Hello')).toMatchObject({ id: 'item', message: 'Hello' })
+      await stream.append('group', 'item', 'message', ' world')
+      await stream.patch('group', 'item', { done: true })
+
+      expect(await stream.get('group', 'item')).toMatchObject({ message: 'Hello world', done: true })
+      expect(set).not.toHaveBeenCalled()
+    })
+
+    it('should use the append and patch operations of the adapter', async () => {
+      class AtomicAdapter extends MemoryStreamAdapter<Message> {
+        operations: string[] = []
+
+        async append(groupId: string, id: string, field: string, value: unknown) {
+          this.operations.push('append')
+          return super.append(groupId, id, field, value)
+        }
+
+        async patch(groupId: string, id: string, patch: Record<string, unknown>) {
+          this.operations.push('patch')
+          return super.patch(groupId, id, patch)
+        }
+      }
+      const adapter = new AtomicAdapter()
+      const stream = createStream(adapter)
+
+      await stream.append('group', 'item', 'message', 'Hello')
+      await stream.patch('group', 'item', { done: true })
+
+      expect(adapter.operations).toEqual(['append', 'patch'])
+      expect(await stream.get('group', 'item')).toMatchObject({ message: 'Hello', done: true })
+    })
+
+    it('should append to the items of adapters without an append operation', async () => {
+      const items: Record<string, BaseStreamItem<Message>> = {}
+      const adapter = {
+        get: async (groupId: string, id: string) => items[`${groupId}:${id}`] ?? null,
+        set: async (groupId: string, id: string, data: Message) => (items[`${groupId}:${id}`] = { ...data, id }),
+        delete: async () => null,
+        getGroup: async () => [],
+        send: async () => {},
+      } as unknown as MotiaStream<Message>
+      const stream = createStream(adapter)
+
+      await stream.append('group', 'item', 'message', 'Hello')
+      await stream.append('group', 'item', 'message', ' world')
+
+      expect(items['group:item']).toEqual({ id: 'item', message: 'Hello world' })
+    })
+  })
 })
@@ -0,0 +1,83 @@
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { FileStateAdapter } from '../state/adapters/default-state-adapter'
+import { MemoryStateAdapter } from '../state/adapters/memory-state-adapter'
+import { StateManager, withBulkOperations } from '../state/state-adapter'
+
+describe('StateAdapter bulk operations', () => {
+  let tmpDir: string
+
+  beforeAll(() => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-state-'))
+  })
+
+  afterAll(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true })
+  })
+
+  const adapters: [string, () => MemoryStateAdapter | FileStateAdapter][] = [
+    ['memory', () => new MemoryStateAdapter()],
+    ['file', () => new FileStateAdapter({ adapter: 'default', filePath: fs.mkdtempSync(path.join(tmpDir, 'file-')) })],
+  ]
+
+  describe.each(adapters)('%s adapter', (_, createAdapter) => {
+    it('should set and get many keys in the order requested', async () => {
+      const state = createAdapter()
+
+      await state.setMany('trace', { a: { value: 1 }, b: 'two', c: [3] })
+
+      expect(await state.getMany('trace', ['c', 'missing', 'a'])).toEqual([[3], null, { value: 1 }])
+      expect(await state.get('trace', 'b')).toEqual('two')
+    })
+
+    it('should delete many keys and return the deleted values', async () => {
+      const state = createAdapter()
+
+      await state.setMany('trace', { a: 1, b: 2, c: 3 })
+
+      expect(await state.deleteMany('trace', ['a', 'missing', 'c'])).toEqual([1, null, 3])
+      expect(await state.getMany('trace', ['a', 'b', 'c'])).toEqual([null, 2, null])
+    })
+  })
+})
+
+describe('withBulkOperations', () => {
+  // An adapter written before the bulk operations
+  const createLegacyAdapter = (): StateManager & { calls: string[] } => {
+    const adapter = new MemoryStateAdapter()
+    const calls: string[] = []
+
+    return {
+      calls,
+      get: (groupId, key) => (calls.push(`get ${key}`), adapter.get(groupId, key)),
+      set: (groupId, key, value) => (calls.push(`set ${key}`), adapter.set(groupId, key, value)),
+      delete: (groupId, key) => (calls.push(`delete ${key}`), adapter.delete(groupId, key)),
+      getGroup: (groupId) => adapter.getGroup(groupId),
+      clear: (groupId) => adapter.clear(groupId),
+    }
+  }
+
+  it('should run the bulk operations one key at a time when the adapter does not implement them', async () => {
+    const adapter = createLegacyAdapter()
+    const state = withBulkOperations(adapter)
+
+    await state.setMany('trace', { a: 1, b: 2, c: 3 })
+
+    expect(await state.getMany('trace', ['c', 'missing', 'a'])).toEqual([3, null, 1])
+    expect(await state.deleteMany('trace', ['a', 'missing', 'c'])).toEqual([1, null, 3])
+    expect(await state.getMany('trace', ['a', 'b', 'c'])).toEqual([null, 2, null])
+    expect(adapter.calls.slice(0, 3)).toEqual(['set a', 'set b', 'set c'])
+  })
+
+  it('should use the bulk operations of the adapter when it implements them', async () => {
+    const adapter = new MemoryStateAdapter()
+    const setMany = jest.spyOn(adapter, 'setMany')
+
+    const state = withBulkOperations(adapter)
+    await state.setMany('trace', { a: 1 })
+
+    expect(state).toBe(adapter)
+    expect(setMany).toHaveBeenCalledWith('trace', { a: 1 })
+  })
+})
@@ -0,0 +1,59 @@
+import fs from 'fs'
+
+describe('createStepInput', () => {
+  let createStepInput: typeof import('../process-communication/step-input').createStepInput
+
+  beforeAll(async () => {
+    // the threshold is read when the module is loaded
+    process.env.MOTIA_INPUT_FILE_THRESHOLD = '64'
+    createStepInput = (await import('../process-communication/step-input')).createStepInput
+  })
+
+  afterAll(() => {
+    delete process.env.MOTIA_INPUT_FILE_THRESHOLD
+  })
+
+  it('should send small inputs through the channel', async () => {
+    const input = { message: 'hello' }
+    const stepInput = await createStepInput(input)
+
+    expect(stepInput.message).toEqual({ args: input })
+  })
+
+  it('should send inputs that do not serialize to JSON through the channel', async () => {
+    const stepInput = await createStepInput(undefined)
+
+    expect(stepInput.message).toEqual({ args: undefined })
+  })
+
+  it('should write large inputs to a file that release removes', async () => {
+    const input = { message: 'a'.repeat(100) }
+    const stepInput = await createStepInput(input)
+
+    if (!fs.existsSync('/dev/shm')) {
+      expect(stepInput.message).toEqual({ args: input })
+      return
+    }
+
+    const { argsFile } = stepInput.message as { argsFile: string }
+    expect(argsFile).toMatch(/^\/dev\/shm\/motia-input-.*\.json$/)
+    expect(JSON.parse(fs.readFileSync(argsFile, 'utf-8'))).toEqual(input)
+    expect(fs.statSync(argsFile).mode & 0o777).toBe(0o600)
+
+    stepInput.release()
+    await new Promise((resolve) => setTimeout(resolve, 10))
+
+    expect(fs.existsSync(argsFile)).toBe(false)
+  })
+
+  it('should compare the size of the input in bytes', async () => {
+    // 40 characters that take 120 bytes in UTF-8
+    const input = '€'.repeat(40)
+    const stepInput = await createStepInput(input)
+
+    if (fs.existsSync('/dev/shm')) {
+      expect(stepInput.message).toHaveProperty('argsFile')
+      stepInput.release()
+    }
+  })
+})
@@ -0,0 +1,30 @@
+import { MemoryStreamAdapter } from '../streams/adapters/memory-stream-adapter'
+
+type Message = { message: string; tags?: string[]; meta?: Record<string, unknown> }
+
+describe('StreamAdapter incremental updates', () => {
+  it('should append to string and array fields', async () => {
+    const stream = new MemoryStreamAdapter<Message>()
+
+    await stream.set('group', 'item', { message: 'Hello', tags: ['a'] })
+    await stream.append('group', 'item', 'message', ' world')
+    await stream.append('group', 'item', 'tags', 'b')
+
+    expect(await stream.get('group', 'item')).toEqual({ message: 'Hello world', tags: ['a', 'b'] })
+  })
+
+  it('should create the item when appending to a missing one', async () => {
+    const stream = new MemoryStreamAdapter<Message>()
+
+    expect(await stream.append('group', 'item', 'message', 'Hello')).toEqual({ id: 'item', message: 'Hello' })
+  })
+
+  it('should apply a JSON merge patch', async () => {
+    const stream = new MemoryStreamAdapter<Message>()
+
+    await stream.set('group', 'item', { message: 'Hello', meta: { a: 1, b: 2 } })
+    await stream.patch('group', 'item', { meta: { a: null, c: 3 } })
+
+    expect(await stream.get('group', 'item')).toEqual({ message: 'Hello', meta: { b: 2, c: 3 } })
+  })
+})
@@ -0,0 +1,13 @@
+import { appendToField, applyMergePatch } from '../streams/stream-patch'
+import cases from './fixtures/stream-patch-cases.json'
+
+// @motiadev/stream-client and the Python runner are tested against the same cases, see stream-patch.ts
+describe('stream patch helpers', () => {
+  it.each(cases.mergePatch)('should apply the merge patch %j', ({ target, patch, expected }) => {
+    expect(applyMergePatch(target, patch)).toEqual(expected)
+  })
+
+  it.each(cases.append)('should append to the field of %j', ({ item, field, value, expected }) => {
+    expect(appendToField(item, field, value)).toEqual(expected)
+  })
+})
@@ -2,7 +2,11 @@ import path from 'path'
 import { trackEvent } from './analytics/utils'
 import { Motia } from './motia'
 import { ProcessManager } from './process-communication/process-manager'
+import { RpcHandlerRegistry } from './process-communication/rpc-processor-interface'
+import { createStepInput } from './process-communication/step-input'
+import { getStepWorker } from './process-communication/step-worker'
 import { Event, Step } from './types'
+import { StreamPatch } from './streams/stream-patch'
 import { BaseStreamItem, StateStreamEvent, StateStreamEventChannel } from './types-stream'
 import { isAllowedToEmit } from './utils'
 import { Logger } from './logger'
@@ -13,10 +17,16 @@ type StateGetInput = { traceId: string; key: string }
 type StateSetInput = { traceId: string; key: string; value: unknown }
 type StateDeleteInput = { traceId: string; key: string }
 type StateClearInput = { traceId: string }
+type LogBatchInput = { entries: unknown[]; stats?: { sent: number; dropped: number } }
+type StateGetManyInput = { traceId: string; keys: string[] }
+type StateSetManyInput = { traceId: string; values: Record<string, unknown> }
+type StateDeleteManyInput = { traceId: string; keys: string[] }
 
 type StateStreamGetInput = { groupId: string; id: string }
 type StateStreamSendInput = { channel: StateStreamEventChannel; event: StateStreamEvent<unknown> }
 type StateStreamMutateInput = { groupId: string; id: string; data: BaseStreamItem }
+type StateStreamAppendInput = { groupId: string; id: string; field: string; value: unknown }
+type StateStreamPatchInput = { groupId: string; id: string; patch: StreamPatch }
 
 const getLanguageBasedRunner = (
   stepFilePath = '',
@@ -48,6 +58,15 @@ const getLanguageBasedRunner = (
   throw Error(`Unsupported file extension ${stepFilePath}`)
 }
 
+const PYTHON_RUNNER_MODE = process.env.MOTIA_PYTHON_RUNNER_MODE ?? 'process'
+
+/**
+ * worker: one long-lived process runs every invocation
+ * zygote: one long-lived process forks a pre-warmed child per invocation
+ */
+const isWorkerMode = (stepFilePath: string) =>
+  stepFilePath.endsWith('.py') && (PYTHON_RUNNER_MODE === 'worker' || PYTHON_RUNNER_MODE === 'zygote')
+
 type CallStepFileOptions = {
   step: Step
   traceId: string
@@ -57,6 +76,145 @@ type CallStepFileOptions = {
   tracer: Tracer
 }
 
+type RegisterHandlersOptions<TData> = CallStepFileOptions & {
+  onResult: (result: TData) => void
+  onClose: (err?: TraceError) => void
+}
+
+const registerStepHandlers = <TData>(
+  registry: RpcHandlerRegistry,
+  options: RegisterHandlersOptions<TData>,
+  motia: Motia,
+) => {
+  const { step, traceId, tracer, logger, onResult, onClose } = options
+  const streamConfig = motia.lockedData.getStreams()
+
+  registry.handler<TraceError | undefined>('close', async (err) => {
+    onClose(err)
+
+    if (err) {
+      trackEvent('step_execution_error', {
+        stepName: step.config.name,
+        traceId,
+        message: err.message,
+      })
+    }
+
+    if (err) {
+      tracer.end({
+        message: err.message,
+        code: err.code,
+        stack: err.stack?.replace(new RegExp(`${motia.lockedData.baseDir}/`), ''),
+      })
+    } else {
+      tracer.end()
+    }
+  })
+  registry.handler<unknown>('log', async (input: unknown) => logger.log(input))
+  registry.handler<LogBatchInput>('log.batch', async (input) => {
+    input.entries.forEach((entry) => logger.log(entry))
+
+    if (input.stats) {
+      logger.debug('Step log lines', { sent: input.stats.sent, dropped: input.stats.dropped })
+    }
+  })
+
+  registry.handler<StateGetInput, unknown>('state.get', async (input) => {
+    tracer.stateOperation('get', input)
+    return motia.state.get(input.traceId, input.key)
+  })
+
+  registry.handler<StateSetInput, unknown>('state.set', async (input) => {
+    tracer.stateOperation('set', { traceId: input.traceId, key: input.key, value: true })
+    return motia.state.set(input.traceId, input.key, input.value)
+  })
+
+  registry.handler<StateDeleteInput, unknown>('state.delete', async (input) => {
+    tracer.stateOperation('delete', input)
+    return motia.state.delete(input.traceId, input.key)
+  })
+
+  registry.handler<StateGetManyInput, unknown[]>('state.getMany', async (input) => {
+    tracer.stateOperation('getMany', input)
+    return motia.state.getMany(input.traceId, input.keys)
+  })
+
+  registry.handler<StateSetManyInput, void>('state.setMany', async (input) => {
+    tracer.stateOperation('setMany', { traceId: input.traceId, keys: Object.keys(input.values) })
+    return motia.state.setMany(input.traceId, input.values)
+  })
+
+  registry.handler<StateDeleteManyInput, unknown[]>('state.deleteMany', async (input) => {
+    tracer.stateOperation('deleteMany', input)
+    return motia.state.deleteMany(input.traceId, input.keys)
+  })
+
+  registry.handler<StateClearInput, void>('state.clear', async (input) => {
+    tracer.stateOperation('clear', input)
+    return motia.state.clear(input.traceId)
+  })
+
+  registry.handler<StateStreamGetInput>(`state.getGroup`, (input) => {
+    tracer.stateOperation('getGroup', input)
+    return motia.state.getGroup(input.groupId)
+  })
+
+  registry.handler<TData, void>('result', async (input) => {
+    onResult(input)
+  })
+
+  registry.handler<Event, unknown>('emit', async (input) => {
+    const flows = step.config.flows
+
+    if (!isAllowedToEmit(step, input.topic)) {
+      tracer.emitOperation(input.topic, input.data, false)
+      return motia.printer.printInvalidEmit(step, input.topic)
+    }
+
+    tracer.emitOperation(input.topic, input.data, true)
+    return motia.eventManager.emit({ ...input, traceId, flows, logger, tracer }, step.filePath)
+  })
+
+  Object.entries(streamConfig).forEach(([name, streamFactory]) => {
+    const stateStream = streamFactory()
+
+    registry.handler<StateStreamGetInput>(`streams.${name}.get`, async (input) => {
+      tracer.streamOperation(name, 'get', input)
+      return stateStream.get(input.groupId, input.id)
+    })
+
+    registry.handler<StateStreamMutateInput>(`streams.${name}.set`, async (input) => {
+      tracer.streamOperation(name, 'set', { groupId: input.groupId, id: input.id, data: true })
+      return stateStream.set(input.groupId, input.id, input.data)
+    })
+
+    registry.handler<StateStreamAppendInput>(`streams.${name}.append`, async (input) => {
+      tracer.streamOperation(name, 'append', { groupId: input.groupId, id: input.id, data: true })
+      return stateStream.append(input.groupId, input.id, input.field, input.value)
+    })
+
+    registry.handler<StateStreamPatchInput>(`streams.${name}.patch`, async (input) => {
+      tracer.streamOperation(name, 'patch', { groupId: input.groupId, id: input.id, data: true })
+      return stateStream.patch(input.groupId, input.id, input.patch)
+    })
+
+    registry.handler<StateStreamGetInput>(`streams.${name}.delete`, async (input) => {
+      tracer.streamOperation(name, 'delete', input)
+      return stateStream.delete(input.groupId, input.id)
+    })
+
+    registry.handler<StateStreamGetInput>(`streams.${name}.getGroup`, async (input) => {
+      tracer.streamOperation(name, 'getGroup', input)
+      return stateStream.getGroup(input.groupId)
+    })
+
+    registry.handler<StateStreamSendInput>(`streams.${name}.send`, async (input) => {
+      tracer.streamOperation(name, 'send', input)
+      return stateStream.send(input.channel, input.event)
+    })
+  })
+}
+
 export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia): Promise<TData | undefined> => {
   const { step, traceId, data, tracer, logger, contextInFirstArg = false } = options
 
@@ -65,17 +223,10 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
   return new Promise((resolve, reject) => {
     const streamConfig = motia.lockedData.getStreams()
     const streams = Object.keys(streamConfig).map((name) => ({ name }))
-    const jsonData = JSON.stringify({ data, flows, traceId, contextInFirstArg, streams })
+    const input = { data, flows, traceId, contextInFirstArg, streams }
     const { runner, command, args } = getLanguageBasedRunner(step.filePath)
     let result: TData | undefined
 
-    const processManager = new ProcessManager({
-      command,
-      args: [...args, runner, step.filePath, jsonData],
-      logger,
-      context: 'StepExecution',
-    })
-
     trackEvent('step_execution_started', {
       stepName: step.config.name,
       language: command,
@@ -83,100 +234,54 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
       streams: streams.length,
     })
 
-    processManager
-      .spawn()
-      .then(() => {
-        processManager.handler<TraceError | undefined>('close', async (err) => {
-          processManager.kill()
-
-          if (err) {
-            trackEvent('step_execution_error', {
-              stepName: step.config.name,
-              traceId,
-              message: err.message,
-            })
-          }
-
-          if (err) {
-            tracer.end({
-              message: err.message,
-              code: err.code,
-              stack: err.stack?.replace(new RegExp(`${motia.lockedData.baseDir}/`), ''),
-            })
-          } else {
-            tracer.end()
-          }
-        })
-        processManager.handler<unknown>('log', async (input: unknown) => logger.log(input))
-
-        processManager.handler<StateGetInput, unknown>('state.get', async (input) => {
-          tracer.stateOperation('get', input)
-          return motia.state.get(input.traceId, input.key)
-        })
-
-        processManager.handler<StateSetInput, unknown>('state.set', async (input) => {
-          tracer.stateOperation('set', { traceId: input.traceId, key: input.key, value: true })
-          return motia.state.set(input.traceId, input.key, input.value)
-        })
-
-        processManager.handler<StateDeleteInput, unknown>('state.delete', async (input) => {
-          tracer.stateOperation('delete', input)
-          return motia.state.delete(input.traceId, input.key)
+    if (isWorkerMode(step.filePath)) {
+      const worker = getStepWorker({ command, args: [...args, runner, `--${PYTHON_RUNNER_MODE}`] })
+      const register = (registry: RpcHandlerRegistry) =>
+        registerStepHandlers<TData>(
+          registry,
+          { ...options, onResult: (input) => (result = input), onClose: () => {} },
+          motia,
+        )
+
+      worker
+        .invoke(step.filePath, input, register)
+        .then(() => resolve(result))
+        .catch((error) => {
+          const message = error instanceof Error ? error.message : String(error)
+          tracer.end({ message, code: error?.code, stack: error?.stack })
+          trackEvent('step_execution_error', { stepName: step.config.name, traceId, message })
+          reject(error)
         })
 
-        processManager.handler<StateClearInput, void>('state.clear', async (input) => {
-          tracer.stateOperation('clear', input)
-          return motia.state.clear(input.traceId)
-        })
+      return
+    }
 
-        processManager.handler<StateStreamGetInput>(`state.getGroup`, (input) => {
-          tracer.stateOperation('getGroup', input)
-          return motia.state.getGroup(input.groupId)
-        })
+    // the Python runner receives its input as the first message instead of a command line argument
+    const isPython = step.filePath.endsWith('.py')
+    // large inputs are written to their file while the process starts
+    const pendingInput = isPython ? createStepInput(input) : undefined
+    const releaseInput = () => pendingInput?.then((stepInput) => stepInput.release())
 
-        processManager.handler<TData, void>('result', async (input) => {
-          result = input
-        })
-
-        processManager.handler<Event, unknown>('emit', async (input) => {
-          const flows = step.config.flows
+    const processManager = new ProcessManager({
+      command,
+      args: isPython ? [...args, runner, step.filePath] : [...args, runner, step.filePath, JSON.stringify(input)],
+      logger,
+      context: 'StepExecution',
+    })
 
-          if (!isAllowedToEmit(step, input.topic)) {
-            tracer.emitOperation(input.topic, input.data, false)
-            return motia.printer.printInvalidEmit(step, input.topic)
+    processManager
+      .spawn()
+      .then(() => {
+        registerStepHandlers<TData>(
+          processManager,
+          { ...options, onResult: (input) => (result = input), onClose: () => processManager.kill() },
+          motia,
+        )
+
+        pendingInput?.then((stepInput) => {
+          if (processManager.process) {
+            processManager.send({ type: 'input', ...stepInput.message })
           }
-
-          tracer.emitOperation(input.topic, input.data, true)
-          return motia.eventManager.emit({ ...input, traceId, flows, logger, tracer }, step.filePath)
-        })
-
-        Object.entries(streamConfig).forEach(([name, streamFactory]) => {
-          const stateStream = streamFactory()
-
-          processManager.handler<StateStreamGetInput>(`streams.${name}.get`, async (input) => {
-            tracer.streamOperation(name, 'get', input)
-            return stateStream.get(input.groupId, input.id)
-          })
-
-          processManager.handler<StateStreamMutateInput>(`streams.${name}.set`, async (input) => {
-            tracer.streamOperation(name, 'set', { groupId: input.groupId, id: input.id, data: true })
-            return stateStream.set(input.groupId, input.id, input.data)
-          })
-
-          processManager.handler<StateStreamGetInput>(`streams.${name}.delete`, async (input) => {
-            tracer.streamOperation(name, 'delete', input)
-            return stateStream.delete(input.groupId, input.id)
-          })
-
-          processManager.handler<StateStreamGetInput>(`streams.${name}.getGroup`, async (input) => {
-            tracer.streamOperation(name, 'getGroup', input)
-            return stateStream.getGroup(input.groupId)
-          })
-
-          processManager.handler<StateStreamSendInput>(`streams.${name}.send`, async (input) => {
-            tracer.streamOperation(name, 'send', input)
-            return stateStream.send(input.channel, input.event)
-          })
         })
 
         processManager.onStdout((data) => {
@@ -192,6 +297,7 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
 
         processManager.onProcessClose((code) => {
           processManager.close()
+          releaseInput()
 
           if (code !== 0 && code !== null) {
             const error = { message: `Process exited with code ${code}`, code }
@@ -206,6 +312,7 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
 
         processManager.onProcessError((error) => {
           processManager.close()
+          releaseInput()
           tracer.end({
             message: error.message,
             code: error.code,
@@ -226,6 +333,7 @@ export const callStepFile = <TData>(options: CallStepFileOptions, motia: Motia):
         })
       })
       .catch((error) => {
+        releaseInput()
         tracer.end({
           message: error.message,
           code: error.code,
@@ -0,0 +1,123 @@
+import crypto from 'crypto'
+import fs from 'fs'
+import path from 'path'
+
+const CACHE_VERSION = 1
+
+type CacheEntry = {
+  hash: string
+  deps: Record<string, string>
+  config: unknown
+}
+
+type CacheFile = {
+  version: number
+  entries: Record<string, CacheEntry>
+}
+
+/**
+ * On-disk cache of step configs stored in `<baseDir>/.motia/config-cache.json`.
+ *
+ * Each entry is keyed by the step file path and holds the content hash of the step file
+ * and of every local module it imported while its config was read, an entry is only used
+ * when all of those hashes still match.
+ */
+export class ConfigCache {
+  private readonly filePath: string
+  private entries?: Record<string, CacheEntry>
+  private readonly hashes = new Map<string, string | null>()
+  private dirty = false
+
+  constructor(baseDir: string) {
+    this.filePath = path.join(baseDir, '.motia', 'config-cache.json')
+  }
+
+  get<T>(filePath: string): T | undefined {
+    const entry = this.load()[filePath]
+
+    if (!entry || this.hash(filePath) !== entry.hash) {
+      return undefined
+    }
+
+    for (const [dep, hash] of Object.entries(entry.deps)) {
+      if (this.hash(dep) !== hash) {
+        return undefined
+      }
+    }
+
+    return entry.config as T
+  }
+
+  set(filePath: string, config: unknown, deps: string[]) {
+    const hash = this.hash(filePath)
+
+    if (!hash) {
+      return
+    }
+
+    const depHashes: Record<string, string> = {}
+
+    for (const dep of deps) {
+      const depHash = this.hash(dep)
+
+      if (!depHash) {
+        return
+      }
+
+      depHashes[dep] = depHash
+    }
+
+    this.load()[filePath] = { hash, deps: depHashes, config }
+    this.dirty = true
+  }
+
+  save() {
+    // hashes are only memoized while reading a batch of configs, files may change afterwards
+    this.hashes.clear()
+
+    if (!this.dirty || !this.entries) {
+      return
+    }
+
+    const data: CacheFile = { version: CACHE_VERSION, entries: this.entries }
+    const tmpPath = `${this.filePath}.${process.pid}.tmp`
+
+    try {
+      fs.mkdirSync(path.dirname(this.filePath), { recursive: true })
+      fs.writeFileSync(tmpPath, JSON.stringify(data), 'utf-8')
+      fs.renameSync(tmpPath, this.filePath)
+      this.dirty = false
+    } catch {
+      // the cache is best effort, configs are read from the step files when it is missing
+    }
+  }
+
+  private load(): Record<string, CacheEntry> {
+    if (!this.entries) {
+      try {
+        const data: CacheFile = JSON.parse(fs.readFileSync(this.filePath, 'utf-8'))
+        this.entries = data.version === CACHE_VERSION ? data.entries : {}
+      } catch {
+        this.entries = {}
+      }
+    }
+
+    return this.entries
+  }
+
+  private hash(filePath: string): string | null {
+    let hash = this.hashes.get(filePath)
+
+    if (hash === undefined) {
+      try {
+        hash = crypto.createHash('sha1').update(fs.readFileSync(filePath)).digest('hex')
+      } catch {
+        hash = null
+      }
+
+      this.hashes.set(filePath, hash)
+    }
+
+    return hash
+  }
+}
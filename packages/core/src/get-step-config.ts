@@ -1,4 +1,6 @@
+import os from 'os'
 import path from 'path'
+import { ConfigCache } from './config-cache'
 import { StepConfig } from './types'
 import { globalLogger } from './logger'
 import { StreamConfig } from './types-stream'
@@ -86,10 +88,164 @@ const getConfig = <T>(file: string): Promise<T | null> => {
   })
 }
 
-export const getStepConfig = (file: string): Promise<StepConfig | null> => {
-  return getConfig<StepConfig>(file)
+export type ConfigResult<T> = {
+  filePath: string
+  config: T | null
+  error?: string
 }
 
-export const getStreamConfig = (file: string): Promise<StreamConfig | null> => {
-  return getConfig<StreamConfig>(file)
+export type ConfigOptions = {
+  concurrency?: number
+  cache?: ConfigCache
+}
+
+type BatchMessage<T> = { filePath: string; config?: T; error?: string; deps?: string[] }
+
+type BatchResult<T> = ConfigResult<T> & { deps?: string[] }
+
+const DEFAULT_BATCH_CONCURRENCY = Math.max(1, Math.min(os.cpus().length, 4))
+
+/**
+ * Loads the config of many Python files in one interpreter, receiving one message per file
+ */
+const getPythonConfigBatch = <T>(files: string[]): Promise<BatchResult<T>[]> => {
+  const runner = path.join(__dirname, 'python', 'get-config.py')
+  const command = 'python'
+
+  return new Promise((resolve, reject) => {
+    const results = new Map<string, BatchResult<T>>()
+
+    const processManager = new ProcessManager({
+      command,
+      args: [runner, '--batch', ...files],
+      logger: globalLogger,
+      context: 'Config',
+    })
+
+    processManager
+      .spawn()
+      .then(() => {
+        processManager.onMessage<BatchMessage<T>>((message) => {
+          const { filePath, config = null, error, deps } = message
+          results.set(filePath, { filePath, config, error, deps })
+          globalLogger.debug(`[Config] Read config via ${processManager.commType?.toUpperCase()}`, {
+            filePath,
+            config,
+            error,
+            communicationType: processManager.commType,
+          })
+        })
+
+        processManager.onProcessClose((code) => {
+          processManager.close()
+          const missingError = code !== 0 ? `Process exited with code ${code}` : undefined
+
+          resolve(
+            files.map(
+              (filePath) =>
+                results.get(filePath) ?? {
+                  filePath,
+                  config: null,
+                  error: missingError ?? `No config found for file ${filePath}`,
+                },
+            ),
+          )
+        })
+
+        processManager.onProcessError((error) => {
+          processManager.close()
+          if (error.code === 'ENOENT') {
+            reject(`Executable ${command} not found`)
+          } else {
+            reject(error)
+          }
+        })
+      })
+      .catch((error) => {
+        reject(`Failed to spawn process: ${error}`)
+      })
+  })
+}
+
+const getConfigs = async <T>(files: string[], options: ConfigOptions = {}): Promise<ConfigResult<T>[]> => {
+  const { concurrency = DEFAULT_BATCH_CONCURRENCY, cache } = options
+  const results = new Map<string, ConfigResult<T>>()
+  const pythonFiles: string[] = []
+
+  for (const filePath of files.filter((file) => file.endsWith('.py'))) {
+    const config = cache?.get<T>(filePath)
+
+    if (config) {
+      results.set(filePath, { filePath, config })
+    } else {
+      pythonFiles.push(filePath)
+    }
+  }
+
+  if (pythonFiles.length > 0) {
+    const chunkSize = Math.ceil(pythonFiles.length / Math.max(1, concurrency))
+    const chunks: string[][] = []
+
+    for (let i = 0; i < pythonFiles.length; i += chunkSize) {
+      chunks.push(pythonFiles.slice(i, i + chunkSize))
+    }
+
+    const batches = await Promise.all(chunks.map((chunk) => getPythonConfigBatch<T>(chunk)))
+
+    batches.flat().forEach(({ deps, ...result }) => {
+      results.set(result.filePath, result)
+
+      if (cache && deps && result.config) {
+        cache.set(result.filePath, result.config, deps)
+      }
+    })
+  }
+
+  cache?.save()
+
+  for (const filePath of files) {
+    if (!results.has(filePath)) {
+      const result = await getConfig<T>(filePath)
+        .then((config): ConfigResult<T> => ({ filePath, config }))
+        .catch((error): ConfigResult<T> => ({ filePath, config: null, error: String(error) }))
+
+      results.set(filePath, result)
+    }
+  }
+
+  return files.map((filePath) => results.get(filePath) as ConfigResult<T>)
+}
+
+const getCachedConfig = async <T>(file: string, cache?: ConfigCache): Promise<T | null> => {
+  if (!cache || !file.endsWith('.py')) {
+    return getConfig<T>(file)
+  }
+
+  const [{ config, error }] = await getConfigs<T>([file], { concurrency: 1, cache })
+
+  if (error) {
+    throw error
+  }
+
+  return config
+}
+
+export const getStepConfig = (file: string, cache?: ConfigCache): Promise<StepConfig | null> => {
+  return getCachedConfig<StepConfig>(file, cache)
+}
+
+export const getStreamConfig = (file: string, cache?: ConfigCache): Promise<StreamConfig | null> => {
+  return getCachedConfig<StreamConfig>(file, cache)
+}
+
+/**
+ * Reads the config of many files at once, Python files are loaded in batches sharing one interpreter,
+ * split across `concurrency` processes. When a cache is given, unchanged Python steps are read from it.
+ */
+export const getStepConfigs = (files: string[], options?: ConfigOptions): Promise<ConfigResult<StepConfig>[]> => {
+  return getConfigs<StepConfig>(files, options)
+}
+
+export const getStreamConfigs = (files: string[], options?: ConfigOptions): Promise<ConfigResult<StreamConfig>[]> => {
+  return getConfigs<StreamConfig>(files, options)
 }
@@ -2,7 +2,7 @@ import fs from 'fs'
 import path from 'path'
 import { isApiStep, isCronStep, isEventStep } from './guards'
 import { Printer } from './printer'
-import { validateStep } from './step-validator'
+import { getIgnoredExecutorReason, validateStep } from './step-validator'
 import { FileStreamAdapter } from './streams/adapters/file-stream-adapter'
 import { MemoryStreamAdapter } from './streams/adapters/memory-stream-adapter'
 import { StreamAdapter } from './streams/adapters/stream-adapter'
@@ -343,9 +343,15 @@ export class LockedData {
 
     if (!validationResult.success) {
       this.printer.printValidationError(step.filePath, validationResult)
+      return false
+    }
+
+    const ignoredExecutorReason = getIgnoredExecutorReason(step)
+    if (ignoredExecutorReason) {
+      this.printer.printIgnoredExecutor(step, ignoredExecutorReason)
     }
 
-    return validationResult.success
+    return true
   }
 
   private createStreamAdapter<TData>(streamName: string): StreamAdapter<TData> {
@@ -16,6 +16,18 @@ export class RpcStateManager implements InternalStateManager {
     return this.sender.send<T>('state.delete', { traceId, key })
   }
 
+  async getMany<T>(traceId: string, keys: string[]): Promise<(T | null)[]> {
+    return this.sender.send<(T | null)[]>('state.getMany', { traceId, keys })
+  }
+
+  async setMany<T>(traceId: string, values: Record<string, T>) {
+    await this.sender.send('state.setMany', { traceId, values })
+  }
+
+  async deleteMany<T>(traceId: string, keys: string[]): Promise<(T | null)[]> {
+    return this.sender.send<(T | null)[]>('state.deleteMany', { traceId, keys })
+  }
+
   async clear(traceId: string) {
     await this.sender.send('state.clear', { traceId })
   }
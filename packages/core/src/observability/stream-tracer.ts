@@ -75,12 +75,14 @@ export class StreamTracer implements Tracer {
     operation: StreamOperation,
     input: { groupId: string; id: string; data?: unknown },
   ) {
-    if (operation === 'set') {
+    // Repeated writes to the same item, like streamed tokens, are shown as a single event
+    if (operation === 'set' || operation === 'append' || operation === 'patch') {
       const lastEvent = this.trace.events[this.trace.events.length - 1]
 
       if (
         lastEvent &&
         lastEvent.type === 'stream' &&
+        lastEvent.operation === operation &&
         lastEvent.streamName === streamName &&
         lastEvent.data.groupId === input.groupId &&
         lastEvent.data.id === input.id
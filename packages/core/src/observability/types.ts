@@ -36,13 +36,13 @@ export interface Trace {
 
 export type TraceEvent = StateEvent | EmitEvent | StreamEvent | LogEntry
 
-export type StateOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear'
-export type StreamOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear' | 'send'
+export type StateOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear' | 'getMany' | 'setMany' | 'deleteMany'
+export type StreamOperation = 'get' | 'getGroup' | 'set' | 'delete' | 'clear' | 'send' | 'append' | 'patch'
 
 export interface StateEvent {
   type: 'state'
   timestamp: number
-  operation: 'get' | 'getGroup' | 'set' | 'delete' | 'clear'
+  operation: StateOperation
   key?: string
   duration?: number
   data: unknown
@@ -76,6 +76,12 @@ export class Printer {
     )
   }
 
+  printIgnoredExecutor(step: Step, reason: string) {
+    console.log(
+      `${warning} ${stepTag} ${this.getStepType(step)} ${this.getStepPath(step)} sets ${colors.yellow('executor: process')}, but ${reason}`,
+    )
+  }
+
   printInvalidSchema(topic: string, step: Step[]) {
     console.log(`${error} Topic ${colors.bold(colors.blue(topic))} has incompatible schemas in the following steps:`)
     step.forEach((step) => {
@@ -130,6 +136,7 @@ export class NoPrinter extends Printer {
   printStepCreated() {}
   printStepUpdated() {}
   printStepRemoved() {}
+  printIgnoredExecutor() {}
   printFlowCreated() {}
   printFlowUpdated() {}
   printFlowRemoved() {}
@@ -2,7 +2,7 @@ import { spawn, ChildProcess } from 'child_process'
 import { createCommunicationConfig, CommunicationType } from './communication-config'
 import { RpcProcessor } from '../step-handler-rpc-processor'
 import { RpcStdinProcessor } from '../step-handler-rpc-stdin-processor'
-import { RpcProcessorInterface, RpcHandler, MessageCallback } from './rpc-processor-interface'
+import { RpcProcessorInterface, RpcHandler, MessageCallback, InvocationRouter } from './rpc-processor-interface'
 import { Logger } from '../logger'
 
 export interface ProcessManagerOptions {
@@ -58,6 +58,20 @@ export class ProcessManager {
     this.processor.onMessage(callback)
   }
 
+  onInvocation(router: InvocationRouter): void {
+    if (!this.processor) {
+      throw new Error('Process not spawned yet. Call spawn() first.')
+    }
+    this.processor.onInvocation(router)
+  }
+
+  send(message: unknown): void {
+    if (!this.processor) {
+      throw new Error('Process not spawned yet. Call spawn() first.')
+    }
+    this.processor.send(message)
+  }
+
   onProcessClose(callback: (code: number | null) => void): void {
     if (!this.child) {
       throw new Error('Process not spawned yet. Call spawn() first.')
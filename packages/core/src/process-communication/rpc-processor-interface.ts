@@ -1,10 +1,16 @@
 export type RpcHandler<TInput, TOutput> = (input: TInput) => Promise<TOutput>
 export type MessageCallback<T = unknown> = (message: T) => void
+export type InvocationRouter = (invocationId: string, method: string, input: unknown) => Promise<unknown>
 
-export interface RpcProcessorInterface {
+export interface RpcHandlerRegistry {
   handler<TInput, TOutput = unknown>(method: string, handler: RpcHandler<TInput, TOutput>): void
-  handle(method: string, input: unknown): Promise<unknown>
+}
+
+export interface RpcProcessorInterface extends RpcHandlerRegistry {
+  handle(method: string, input: unknown, invocationId?: string): Promise<unknown>
   onMessage<T = unknown>(callback: MessageCallback<T>): void
+  onInvocation(router: InvocationRouter): void
+  send(message: unknown): void
   init(): Promise<void>
   close(): void
 }
@@ -0,0 +1,56 @@
+import { randomUUID } from 'crypto'
+import fs from 'fs'
+import path from 'path'
+
+const SHARED_MEMORY_DIR = '/dev/shm'
+const INPUT_FILE_THRESHOLD = Number(process.env.MOTIA_INPUT_FILE_THRESHOLD ?? 1024 * 1024)
+
+export type StepInputMessage = { args: unknown } | { argsFile: string }
+
+export type StepInput = {
+  message: StepInputMessage
+  release: () => void
+}
+
+let sharedMemoryAvailable: boolean | undefined
+
+const hasSharedMemory = (): boolean => {
+  if (sharedMemoryAvailable === undefined) {
+    try {
+      fs.accessSync(SHARED_MEMORY_DIR, fs.constants.W_OK)
+      sharedMemoryAvailable = true
+    } catch {
+      sharedMemoryAvailable = false
+    }
+  }
+
+  return sharedMemoryAvailable
+}
+
+const inlineInput = (input: unknown): StepInput => ({ message: { args: input }, release: () => {} })
+
+/**
+ * Builds the message carrying the input of a step invocation.
+ *
+ * Inputs larger than MOTIA_INPUT_FILE_THRESHOLD bytes are written to a file in /dev/shm (memory backed)
+ * which the runner maps instead of receiving them through the channel, `release` removes that file.
+ * The input is serialized once, the channel only accepts objects so smaller inputs are sent as they are.
+ */
+export const createStepInput = (input: unknown): Promise<StepInput> => {
+  const json = JSON.stringify(input)
+
+  if (json === undefined || Buffer.byteLength(json) <= INPUT_FILE_THRESHOLD || !hasSharedMemory()) {
+    return Promise.resolve(inlineInput(input))
+  }
+
+  const argsFile = path.join(SHARED_MEMORY_DIR, `motia-input-${randomUUID()}.json`)
+  const release = () => fs.rm(argsFile, { force: true }, () => {})
+
+  return fs.promises.writeFile(argsFile, json, { mode: 0o600 }).then(
+    (): StepInput => ({ message: { argsFile }, release }),
+    () => {
+      release()
+      return inlineInput(input)
+    },
+  )
+}
@@ -0,0 +1,147 @@
+import { randomUUID } from 'crypto'
+import { globalLogger } from '../logger'
+import { ProcessManager } from './process-manager'
+import { RpcHandler, RpcHandlerRegistry } from './rpc-processor-interface'
+import { createStepInput } from './step-input'
+
+export interface StepWorkerOptions {
+  command: string
+  args: string[]
+}
+
+type PendingInvocation = {
+  // eslint-disable-next-line @typescript-eslint/no-explicit-any
+  handlers: Record<string, RpcHandler<any, any>>
+  resolve: () => void
+  reject: (reason: unknown) => void
+}
+
+/**
+ * Long-lived runner process that executes many step invocations.
+ *
+ * Each invocation is sent to the runner as an `invoke` message and every RPC request
+ * the runner makes on its behalf carries the invocation id, so handlers are registered
+ * per invocation instead of per process. The invocation completes when the runner
+ * sends its `close` request.
+ */
+export class StepWorker {
+  private spawning?: Promise<ProcessManager>
+  private active?: ProcessManager
+  private readonly invocations = new Map<string, PendingInvocation>()
+
+  constructor(private readonly options: StepWorkerOptions) {}
+
+  async invoke(filePath: string, args: unknown, register: (registry: RpcHandlerRegistry) => void): Promise<void> {
+    const processManager = await this.getProcess()
+    const id = randomUUID()
+    const input = await createStepInput(args)
+
+    const invocation = new Promise<void>((resolve, reject) => {
+      // eslint-disable-next-line @typescript-eslint/no-explicit-any
+      const handlers: Record<string, RpcHandler<any, any>> = {}
+
+      register({
+        handler: <TInput, TOutput>(method: string, handler: RpcHandler<TInput, TOutput>) => {
+          handlers[method] = handler
+        },
+      })
+
+      this.invocations.set(id, { handlers, resolve, reject })
+      processManager.send({ type: 'invoke', id, filePath, ...input.message })
+    })
+
+    return invocation.finally(input.release)
+  }
+
+  close(): void {
+    const spawning = this.spawning
+    this.spawning = undefined
+    this.active = undefined
+    spawning?.then((processManager) => processManager.kill()).catch(() => {})
+    this.rejectAll('Step worker closed')
+  }
+
+  private getProcess(): Promise<ProcessManager> {
+    if (!this.spawning) {
+      this.spawning = this.spawn().catch((error) => {
+        this.spawning = undefined
+        throw error
+      })
+    }
+
+    return this.spawning
+  }
+
+  private async spawn(): Promise<ProcessManager> {
+    const { command, args } = this.options
+    const processManager = new ProcessManager({ command, args, logger: globalLogger, context: 'StepWorker' })
+
+    await processManager.spawn()
+
+    processManager.onInvocation(async (invocationId, method, input) => {
+      const invocation = this.invocations.get(invocationId)
+      const handler = invocation?.handlers[method]
+
+      if (!invocation || !handler) {
+        throw new Error(`Handler for method ${method} not found`)
+      }
+
+      if (method !== 'close') {
+        return handler(input)
+      }
+
+      try {
+        return await handler(input)
+      } finally {
+        this.invocations.delete(invocationId)
+        invocation.resolve()
+      }
+    })
+
+    processManager.onProcessClose((code) => {
+      processManager.close()
+      this.release(processManager, `Process exited with code ${code}`)
+    })
+
+    processManager.onProcessError((error) => {
+      processManager.close()
+      this.release(processManager, error.code === 'ENOENT' ? `Executable ${command} not found` : error)
+    })
+
+    this.active = processManager
+
+    return processManager
+  }
+
+  private release(processManager: ProcessManager, reason: unknown) {
+    if (this.active === processManager) {
+      this.active = undefined
+      this.spawning = undefined
+      this.rejectAll(reason)
+    }
+  }
+
+  private rejectAll(reason: unknown) {
+    this.invocations.forEach((invocation) => invocation.reject(reason))
+    this.invocations.clear()
+  }
+}
+
+const workers = new Map<string, StepWorker>()
+
+export const getStepWorker = (options: StepWorkerOptions): StepWorker => {
+  const key = [options.command, ...options.args].join(' ')
+  let worker = workers.get(key)
+
+  if (!worker) {
+    worker = new StepWorker(options)
+    workers.set(key, worker)
+  }
+
+  return worker
+}
+
+export const closeStepWorkers = (): void => {
+  workers.forEach((worker) => worker.close())
+  workers.clear()
+}
@@ -0,0 +1,20 @@
+import os
+import subprocess
+import tarfile
+import tempfile
+
+PYTHON_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def checkout_python_dir(revision: str) -> str:
+    """Extract the Python runtime of a git revision to a temporary directory and return its path"""
+    root = subprocess.check_output(['git', 'rev-parse', '--show-toplevel'], cwd=PYTHON_DIR, text=True).strip()
+    prefix = os.path.relpath(PYTHON_DIR, root)
+    target = tempfile.mkdtemp(prefix='motia-baseline-')
+
+    archive = subprocess.Popen(['git', 'archive', revision, prefix], cwd=root, stdout=subprocess.PIPE)
+    with tarfile.open(fileobj=archive.stdout, mode='r|') as tar:
+        tar.extractall(target, filter='data')
+    if archive.wait() != 0:
+        raise SystemExit(f'Could not read {prefix} at {revision}')
+
+    return os.path.join(target, prefix)
@@ -0,0 +1,65 @@
+"""Compare the event loops of MOTIA_PYTHON_LOOP on a worker making state calls.
+
+    python benchmarks/event_loop.py [asyncio uvloop]
+
+Reports the median round trip of a context.state.get and the invocations per second of steps making
+20 gets and 5 sets, 10 at a time. The Node.js side is played by the test fake, its share is in the numbers.
+"""
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests'))
+from fakes import FakeNode
+
+STEPS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'steps')
+STATE_VALUE = {'value': 'x' * 64}
+
+def serve(node: FakeNode, invocations: int) -> List[Any]:
+    """Answer the requests of the worker until `invocations` are closed, returning their results"""
+    results = []
+    while invocations:
+        request = node.receive()
+        if request['method'] == 'close':
+            invocations -= 1
+            continue
+        if request['method'] == 'result':
+            results.append(request['args'])
+        if 'id' in request:
+            node.respond(request, STATE_VALUE if request['method'] == 'state.get' else None)
+    return results
+
+def invoke(node: FakeNode, invocation_id: str, step: str, data: Dict[str, Any]) -> None:
+    args = {'data': data, 'traceId': invocation_id, 'flows': ['benchmark']}
+    node.send({'type': 'invoke', 'id': invocation_id, 'filePath': os.path.join(STEPS_DIR, step), 'args': args})
+
+def round_trip(loop: str, runs: int = 5, count: int = 2000) -> float:
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_LOOP': loop})
+    times = []
+    for run in range(runs):
+        invoke(node, f'run-{run}', 'round_trip_step.py', {'count': count})
+        times.append(serve(node, 1)[0]['us'])
+    node.close()
+    return statistics.median(times)
+
+def throughput(loop: str, invocations: int = 400) -> float:
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_LOOP': loop, 'MOTIA_PYTHON_CONCURRENCY': '10'})
+    # The first invocation loads the step module
+    invoke(node, 'warm-up', 'state_heavy_step.py', {})
+    serve(node, 1)
+
+    start = time.perf_counter()
+    for i in range(invocations):
+        invoke(node, f'invocation-{i}', 'state_heavy_step.py', {})
+    serve(node, invocations)
+    elapsed = time.perf_counter() - start
+
+    node.close()
+    return invocations / elapsed
+
+if __name__ == '__main__':
+    for loop in sys.argv[1:] or ['asyncio', 'uvloop']:
+        per_second = statistics.median(throughput(loop) for _ in range(3))
+        print(f'{loop:8} state.get round trip {round_trip(loop):7.1f} us   state-heavy invocations/s {per_second:7.1f}')
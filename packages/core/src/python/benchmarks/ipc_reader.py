@@ -0,0 +1,71 @@
+"""Time reading messages from the Node.js channel, against the reader of a baseline revision.
+
+    python benchmarks/ipc_reader.py --baseline <revision> [--large]
+
+The 50 MB message only runs with --large, a reader scanning its whole buffer on every chunk takes minutes on it.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from baseline import PYTHON_DIR, checkout_python_dir
+
+CASES = [('1 KB', 1 << 10, 5000), ('1 MB', 1 << 20, 20)]
+LARGE_CASE = ('50 MB', 50 << 20, 1)
+
+def read_messages(size: int, count: int) -> float:
+    """Return the seconds IpcCommunication takes to receive `count` messages of `size` bytes"""
+    from motia_ipc_communication import IpcCommunication
+
+    node, channel = socket.socketpair()
+    os.environ['NODE_CHANNEL_FD'] = str(channel.fileno())
+    line = (json.dumps({'type': 'message', 'data': 'x' * size}) + '\n').encode('utf-8')
+    received = []
+
+    def write() -> None:
+        for _ in range(count):
+            node.sendall(line)
+        node.shutdown(socket.SHUT_WR)
+
+    async def main() -> float:
+        ipc = IpcCommunication()
+        ipc.message_handlers['message'] = received.append
+        start = time.perf_counter()
+        threading.Thread(target=write).start()
+        await ipc.init()
+        await ipc.wait_closed()
+        return time.perf_counter() - start
+
+    elapsed = asyncio.run(main())
+    assert len(received) == count
+    return elapsed
+
+def run(python_dir: str, size: int, count: int) -> float:
+    output = subprocess.check_output([sys.executable, __file__, '--read', python_dir, str(size), str(count)], text=True)
+    return float(output)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', required=True, help='git revision to compare with')
+    parser.add_argument('--large', action='store_true', help='also read a single 50 MB message')
+    args = parser.parse_args()
+
+    readers = [(args.baseline, checkout_python_dir(args.baseline)), ('current', PYTHON_DIR)]
+    for label, size, count in CASES + ([LARGE_CASE] if args.large else []):
+        for name, python_dir in readers:
+            elapsed = run(python_dir, size, count)
+            print(f'{label:6} x {count:<5} {name:12} {elapsed * 1000:10.1f} ms  {elapsed / count * 1000:8.3f} ms/msg', flush=True)
+
+if __name__ == '__main__':
+    if sys.argv[1:2] == ['--read']:
+        # Runs in a process of its own so the runtime of the revision is the one imported
+        sys.path.insert(0, sys.argv[2])
+        print(read_messages(int(sys.argv[3]), int(sys.argv[4])))
+    else:
+        main()
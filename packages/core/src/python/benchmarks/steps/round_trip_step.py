@@ -0,0 +1,9 @@
+import time
+
+config = {'type': 'event', 'name': 'RoundTrip', 'subscribes': ['round-trip'], 'emits': [], 'flows': ['benchmark']}
+
+async def handler(data, context):
+    start = time.perf_counter()
+    for i in range(data['count']):
+        await context.state.get(context.trace_id, f'key-{i}')
+    return {'us': (time.perf_counter() - start) / data['count'] * 1e6}
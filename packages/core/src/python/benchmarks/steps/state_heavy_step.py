@@ -0,0 +1,10 @@
+config = {'type': 'event', 'name': 'StateHeavy', 'subscribes': ['state-heavy'], 'emits': [], 'flows': ['benchmark']}
+
+async def handler(data, context):
+    total = 0
+    for i in range(20):
+        value = await context.state.get(context.trace_id, f'key-{i}')
+        total += len(value or {})
+    for i in range(5):
+        await context.state.set(context.trace_id, f'out-{i}', {'total': total, 'i': i})
+    return {'total': total}
@@ -3,6 +3,10 @@ import json
 import importlib.util
 import os
 import platform
+import glob
+from typing import Dict, List, Set
+
+roots: Set[str] = set()
 
 def sendMessage(text):
     'sends a Node IPC message to parent proccess'
@@ -19,42 +23,90 @@ def sendMessage(text):
         NODEIPCFD = int(os.environ["NODE_CHANNEL_FD"])
         os.write(NODEIPCFD, bytesMessage)
 
-async def run_python_module(file_path: str) -> None:
-    try:
-        module_dir = os.path.dirname(os.path.abspath(file_path))
+def load_config(file_path: str) -> dict:
+    module_dir = os.path.dirname(os.path.abspath(file_path))
+    
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+        
+    flows_dir = os.path.dirname(module_dir)
+    if flows_dir not in sys.path:
+        sys.path.insert(0, flows_dir)
+
+    roots.update((module_dir, flows_dir))
+
+    spec = importlib.util.spec_from_file_location("dynamic_module", file_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Could not load module from {file_path}")
         
-        if module_dir not in sys.path:
-            sys.path.insert(0, module_dir)
-            
-        flows_dir = os.path.dirname(module_dir)
-        if flows_dir not in sys.path:
-            sys.path.insert(0, flows_dir)
+    module = importlib.util.module_from_spec(spec)
+    module.__package__ = os.path.basename(module_dir)
+    spec.loader.exec_module(module)
 
-        spec = importlib.util.spec_from_file_location("dynamic_module", file_path)
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Could not load module from {file_path}")
-            
-        module = importlib.util.module_from_spec(spec)
-        module.__package__ = os.path.basename(module_dir)
-        spec.loader.exec_module(module)
+    if not hasattr(module, 'config'):
+        raise AttributeError(f"No 'config' found in module {file_path}")
 
-        if not hasattr(module, 'config'):
-            raise AttributeError(f"No 'config' found in module {file_path}")
+    if 'middleware' in module.config:
+        del module.config['middleware']
 
-        if 'middleware' in module.config:
-            del module.config['middleware']
+    return module.config
 
-        sendMessage(module.config)
+async def run_python_module(file_path: str) -> None:
+    try:
+        sendMessage(load_config(file_path))
 
     except Exception as error:
         print('Error running Python module:', str(error), file=sys.stderr)
         sys.exit(1)
 
+def expand_paths(patterns: List[str]) -> List[str]:
+    'expands glob patterns, keeping plain paths as they are'
+    file_paths: List[str] = []
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            file_paths.extend(sorted(glob.glob(pattern, recursive=True)))
+        else:
+            file_paths.append(pattern)
+    return file_paths
+
+def local_modules() -> Dict[str, str]:
+    'returns the name and file of every loaded module that lives next to the steps'
+    modules: Dict[str, str] = {}
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, '__file__', None)
+        if not module_file or 'site-packages' in module_file:
+            continue
+        if any(module_file.startswith(root + os.sep) for root in roots):
+            modules[name] = os.path.abspath(module_file)
+    return modules
+
+def run_batch(patterns: List[str]) -> None:
+    'loads every file in this interpreter, sending one message per file'
+    for file_path in expand_paths(patterns):
+        # evict local modules so the ones this file imports are executed again and reported as its deps
+        for name in local_modules():
+            sys.modules.pop(name, None)
+
+        try:
+            config = load_config(file_path)
+            deps = sorted(set(local_modules().values()) - {os.path.abspath(file_path)})
+            sendMessage({'filePath': file_path, 'config': config, 'deps': deps})
+        except KeyboardInterrupt:
+            raise
+        except BaseException as error:
+            # a module calling sys.exit() only fails its own file, the others are still loaded
+            message = str(error) if isinstance(error, Exception) else repr(error)
+            sendMessage({'filePath': file_path, 'error': message})
+
 if __name__ == "__main__":
     if len(sys.argv) < 2:
         sys.exit(1)
 
+    if sys.argv[1] == '--batch':
+        run_batch(sys.argv[2:])
+        sys.exit(0)
+
     file_path = sys.argv[1]
 
-    import asyncio
-    asyncio.run(run_python_module(file_path))
\ No newline at end of file
+    from motia_event_loop import run_event_loop
+    run_event_loop(run_python_module(file_path))
\ No newline at end of file
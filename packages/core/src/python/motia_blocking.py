@@ -0,0 +1,198 @@
+import asyncio
+import collections.abc
+import contextvars
+import functools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import FrameType
+from typing import Any, Awaitable, Callable, Coroutine, Generator, Optional, Set, Tuple
+
+# Threads running sync handlers and `context.run_blocking` calls
+BLOCKING_THREADS = int(os.environ.get("MOTIA_PYTHON_THREADS") or min(32, (os.cpu_count() or 1) + 4))
+
+# A callback keeping the event loop busy for longer than this is reported, 0 turns the detector off
+STALL_THRESHOLD = int(os.environ.get("MOTIA_PYTHON_STALL_WARNING_MS") or 1000) / 1000
+
+_executor: Optional[ThreadPoolExecutor] = None
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the thread pool, created on first use so a zygote never forks it"""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=BLOCKING_THREADS, thread_name_prefix="motia-blocking")
+    return _executor
+
+async def run_blocking(fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function in the thread pool so the event loop keeps serving the other invocations"""
+    call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(get_executor(), call)
+
+def in_loop_thread() -> bool:
+    """Whether the caller runs on an event loop rather than in a handler thread"""
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+def wait_in_thread(coro: Awaitable[Any], loop: asyncio.AbstractEventLoop) -> Any:
+    """Run a coroutine on the runner loop from a handler thread and wait for its result"""
+    return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+def loop_call(method: Callable[..., Coroutine[Any, Any, Any]]) -> Callable[..., Any]:
+    """Let sync handler threads call an async method of an object with a `_loop`, they get its result directly"""
+    @functools.wraps(method)
+    def wrapper(self, *args: Any, **kwargs: Any) -> Any:
+        coro = method(self, *args, **kwargs)
+        if not in_loop_thread():
+            return wait_in_thread(coro, self._loop)
+        return UnawaitedCallShim(coro, self._background) if hasattr(self, '_background') else coro
+    return wrapper
+
+class UnawaitedCallShim(collections.abc.Coroutine):
+    """Coroutine of a state or stream call that is still sent when the handler forgets to await it.
+
+    Calls that were not awaited used to be sent in the background, they are sent the same way with a warning
+    until the `_nowait` methods have replaced them. The shim goes away in a future release.
+    """
+
+    __slots__ = ('_coro', '_background', '_started')
+    _warned: Set[str] = set()
+
+    def __init__(self, coro: Coroutine[Any, Any, Any], background: "BackgroundCalls"):
+        self._coro = coro
+        self._background = background
+        self._started = False
+
+    def __await__(self) -> Generator[Any, None, Any]:
+        self._started = True
+        return self._coro.__await__()
+
+    def send(self, value: Any) -> Any:
+        self._started = True
+        return self._coro.send(value)
+
+    def throw(self, *args: Any) -> Any:
+        self._started = True
+        return self._coro.throw(*args)
+
+    def close(self) -> None:
+        self._started = True
+        self._coro.close()
+
+    def __del__(self) -> None:
+        if self._started:
+            return
+
+        name = self._coro.__qualname__
+        if name not in UnawaitedCallShim._warned:
+            UnawaitedCallShim._warned.add(name)
+            method = name.rsplit('.', 1)[-1]
+            print(
+                f"WARNING: {name}() was called without await, it is sent in the background for now. "
+                f"Await it or call {method}_nowait() instead, calls that are not awaited will be dropped "
+                "in a future release",
+                file=sys.stderr,
+            )
+
+        try:
+            self._background.start(lambda coro: coro, self._coro)
+        except RuntimeError:
+            # The loop is already closed
+            self._coro.close()
+
+class BackgroundCalls:
+    """Calls a handler started without waiting for them, they are waited for before the invocation is closed"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._tasks: Set[asyncio.Future] = set()
+
+    def start(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        """Call `fn` on the runner loop and keep track of the awaitable it returns"""
+        if in_loop_thread():
+            self._track(fn, *args)
+        else:
+            self._loop.call_soon_threadsafe(self._track, fn, *args)
+
+    def _track(self, fn: Callable[..., Awaitable[Any]], *args: Any) -> None:
+        task = asyncio.ensure_future(fn(*args))
+        self._tasks.add(task)
+        task.add_done_callback(self._done)
+
+    def _done(self, task: asyncio.Future) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            print(f"ERROR: Call made without waiting failed: {task.exception()}", file=sys.stderr)
+
+    async def drain(self) -> None:
+        """Wait for the started calls, including the ones started in the meantime"""
+        if asyncio.current_task() in self._tasks:
+            # Waiting for the other started calls could end up waiting for this one
+            await asyncio.sleep(0)
+            return
+
+        while self._tasks:
+            await asyncio.wait(set(self._tasks))
+
+class LoopStallMonitor:
+    """Reports the step that kept the event loop busy for longer than the threshold.
+
+    The loop updates a heartbeat, a watchdog thread notices when it is late and samples the stack
+    of the loop thread, the report is printed once the loop runs again and the length of the stall is known.
+    """
+
+    def __init__(self, threshold: float, locate_step: Callable[[FrameType], Optional[str]]):
+        self.threshold = threshold
+        self.interval = min(threshold / 4, 0.1)
+        self.locate_step = locate_step
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread = 0
+        self._last_beat = 0.0
+        self._stall: Optional[Tuple[str, str]] = None
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+        self._loop_thread = threading.get_ident()
+        self._last_beat = time.monotonic()
+        loop.call_soon(self._beat)
+        threading.Thread(target=self._watch, name="motia-loop-monitor", daemon=True).start()
+
+    def _beat(self) -> None:
+        now = time.monotonic()
+        stall, self._stall = self._stall, None
+
+        if stall is not None:
+            step, where = stall
+            blocked = int((now - self._last_beat - self.interval) * 1000)
+            print(
+                f"WARNING: {step} blocked the event loop for at least {blocked}ms at {where}, "
+                "use a plain `def handler` or `context.run_blocking` for blocking calls",
+                file=sys.stderr,
+            )
+
+        self._last_beat = now
+        self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self) -> None:
+        while True:
+            time.sleep(self.interval)
+
+            if self._stall is not None or time.monotonic() - self._last_beat < self.threshold + self.interval:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+
+            step = self.locate_step(frame)
+            where = frame
+            while step is not None and where.f_back is not None and where.f_code.co_filename != step:
+                where = where.f_back
+            if where.f_code.co_filename != step:
+                where = frame
+
+            self._stall = (step or "A step", f"{where.f_code.co_filename}:{where.f_lineno}")
@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+from typing import Any, Callable, Optional
+
+Default = Optional[Callable[[Any], Any]]
+
+class JsonCodec:
+    """Newline delimited JSON using the standard library"""
+
+    name = 'json'
+
+    def encode(self, obj: Any, default: Default = None) -> bytes:
+        return (json.dumps(obj, default=default) + '\n').encode('utf-8')
+
+    def decode(self, data: Any) -> Any:
+        return json.loads(bytes(data) if isinstance(data, memoryview) else data)
+
+class OrjsonCodec:
+    """Newline delimited JSON using orjson, the wire format Node.js reads is unchanged"""
+
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+        self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE
+        self._fallback = JsonCodec()
+
+    def encode(self, obj: Any, default: Default = None) -> bytes:
+        try:
+            return self._orjson.dumps(obj, default=default, option=self._options)
+        except TypeError:
+            # e.g. integers wider than 64 bits, which the json module still handles
+            return self._fallback.encode(obj, default)
+
+    def decode(self, data: Any) -> Any:
+        return self._orjson.loads(data)
+
+def create_codec(name: Optional[str] = None) -> Any:
+    """Create the codec named by MOTIA_PYTHON_CODEC: auto (default), orjson or json"""
+    name = (name or os.environ.get('MOTIA_PYTHON_CODEC') or 'auto').lower()
+
+    if name in ('auto', 'orjson'):
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            if name == 'orjson':
+                print("WARNING: orjson is not installed, falling back to json", file=sys.stderr)
+
+    return JsonCodec()
+
+codec = create_codec()
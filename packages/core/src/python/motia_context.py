@@ -1,5 +1,7 @@
-from typing import Any, List, Optional
+import asyncio
+from typing import Any, Callable, List, Optional
 from motia_type_definitions import HandlerResult
+from motia_blocking import in_loop_thread, run_blocking, wait_in_thread
 from motia_rpc import RpcSender
 from motia_rpc_state_manager import RpcStateManager
 from motia_logger import Logger
@@ -19,6 +21,13 @@ class Context:
         self.state = RpcStateManager(rpc)
         self.streams = streams
         self.logger = Logger(self.trace_id, self.flows, rpc)
+        self._loop = asyncio.get_event_loop()
 
-    async def emit(self, event: Any) -> Optional[HandlerResult]:
-        return await self.rpc.send('emit', event)
\ No newline at end of file
+    def emit(self, event: Any) -> Optional[HandlerResult]:
+        """Emit an event, awaitable in async handlers, sync handlers get the result directly"""
+        coro = self.rpc.send('emit', event)
+        return coro if in_loop_thread() else wait_in_thread(coro, self._loop)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking call, like a sync SDK client, in the thread pool instead of on the event loop"""
+        return await run_blocking(fn, *args, **kwargs)
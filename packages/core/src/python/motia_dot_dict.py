@@ -1,8 +1,13 @@
+from typing import Any
+
 class DotDict(dict):
+    """Dict with attribute access, use `to_dot_dict` to give the nested dicts of a value attribute access too"""
+
+    __slots__ = ()
+
     def __getattr__(self, key):
         try:
-            value = self[key]
-            return DotDict(value) if isinstance(value, dict) else value
+            return self[key]
         except KeyError:
             raise AttributeError(f"No such attribute: {key}")
 
@@ -13,4 +18,16 @@ class DotDict(dict):
         try:
             del self[key]
         except KeyError:
-            raise AttributeError(f"No such attribute: {key}")
\ No newline at end of file
+            raise AttributeError(f"No such attribute: {key}")
+
+def to_dot_dict(value: Any) -> Any:
+    """Convert every dict in a decoded JSON value to a DotDict.
+
+    The whole tree is converted before a handler sees it, a nested dict is never swapped for a copy later on,
+    so references the handler keeps to it stay the ones its parent holds.
+    """
+    if isinstance(value, dict):
+        return DotDict((key, to_dot_dict(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return [to_dot_dict(item) for item in value]
+    return value
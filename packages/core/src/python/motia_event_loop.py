@@ -0,0 +1,24 @@
+import asyncio
+import os
+import sys
+from typing import Any, Coroutine, Optional
+
+def new_event_loop(name: Optional[str] = None) -> asyncio.AbstractEventLoop:
+    """Create the event loop named by MOTIA_PYTHON_LOOP: asyncio (default), auto or uvloop"""
+    name = (name or os.environ.get('MOTIA_PYTHON_LOOP') or 'asyncio').lower()
+
+    if name in ('auto', 'uvloop'):
+        try:
+            import uvloop
+            return uvloop.new_event_loop()
+        except ImportError:
+            if name == 'uvloop':
+                print("WARNING: uvloop is not installed, falling back to asyncio", file=sys.stderr)
+
+    return asyncio.new_event_loop()
+
+def run_event_loop(coro: Coroutine[Any, Any, Any]) -> Any:
+    """Run a coroutine on a new event loop set as the current one, the loop is left to the process exit"""
+    loop = new_event_loop()
+    asyncio.set_event_loop(loop)
+    return loop.run_until_complete(coro)
@@ -0,0 +1,181 @@
+import asyncio
+import os
+import select
+import sys
+from typing import BinaryIO, List, Optional
+
+MAX_BUFFER_SIZE = int(os.environ.get("MOTIA_PYTHON_WRITE_BUFFER", 4 * 1024 * 1024))
+
+class BaseFrameWriter:
+    """Queues encoded frames and writes the ones queued during a loop iteration at once.
+
+    Frames are joined into a single write scheduled with `call_soon`, so a handler logging
+    in a loop costs one syscall per loop iteration instead of one per message. `drain()`
+    waits while more than `max_buffer_size` bytes are pending.
+    """
+
+    def __init__(self, max_buffer_size: int = MAX_BUFFER_SIZE):
+        self.max_buffer_size = max_buffer_size
+        self.frames: List[bytes] = []
+        self.pending = bytearray()
+        self.size = 0
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.flush_scheduled = False
+        self.drain_waiters: List[asyncio.Future] = []
+
+    def write(self, frame: bytes) -> None:
+        """Queue a frame, it is written on the next loop iteration"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is None and self.loop is not None and self.loop.is_running():
+            # Called from another thread, the loop owns the writer
+            self.loop.call_soon_threadsafe(self.write, frame)
+            return
+
+        self.frames.append(frame)
+        self.size += len(frame)
+
+        if loop is None:
+            self.flush_sync()
+            return
+
+        if self.loop is not loop:
+            self._attach(loop)
+
+        if not self.flush_scheduled:
+            self.flush_scheduled = True
+            loop.call_soon(self._flush)
+
+    async def drain(self) -> None:
+        """Wait until the pending bytes are back under the buffer limit"""
+        while self.size > self.max_buffer_size and self.loop is not None:
+            waiter = self.loop.create_future()
+            self.drain_waiters.append(waiter)
+            await waiter
+
+    def flush_sync(self, limit: int = 0) -> None:
+        """Write queued frames, blocking until at most `limit` bytes are left pending"""
+        self._collect()
+        self._write_blocking(limit)
+        self._wake_drain_waiters()
+
+    def _attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.flush_scheduled = False
+
+    def _collect(self) -> None:
+        if self.frames:
+            self.pending += b''.join(self.frames)
+            self.frames.clear()
+
+    def _flush(self) -> None:
+        self.flush_scheduled = False
+        self._collect()
+        self._write_pending()
+        self._wake_drain_waiters()
+
+    def _wake_drain_waiters(self) -> None:
+        if self.size > self.max_buffer_size:
+            return
+        waiters, self.drain_waiters = self.drain_waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _discard(self, error: Exception) -> None:
+        print(f"ERROR: Failed to write to Node.js: {error}", file=sys.stderr)
+        self.frames.clear()
+        self.pending.clear()
+        self.size = 0
+
+    def _write_pending(self) -> None:
+        raise NotImplementedError
+
+    def _write_blocking(self, limit: int = 0) -> None:
+        raise NotImplementedError
+
+class FrameWriter(BaseFrameWriter):
+    """Writes frames to a non-blocking file descriptor.
+
+    When the pipe is full the remainder is kept and written once the descriptor becomes
+    writable again, so the event loop never blocks on a slow reader.
+    """
+
+    def __init__(self, fd: int, max_buffer_size: int = MAX_BUFFER_SIZE):
+        super().__init__(max_buffer_size)
+        self.fd = fd
+        self.waiting_writable = False
+        os.set_blocking(fd, False)
+
+    def _attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        super()._attach(loop)
+        self.waiting_writable = False
+
+    def _write_pending(self) -> None:
+        while self.pending:
+            try:
+                written = os.write(self.fd, self.pending)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as e:
+                self._discard(e)
+                break
+            del self.pending[:written]
+            self.size -= written
+
+        if self.loop is None:
+            return
+        if self.pending and not self.waiting_writable:
+            self.loop.add_writer(self.fd, self._flush)
+            self.waiting_writable = True
+        elif not self.pending and self.waiting_writable:
+            self.loop.remove_writer(self.fd)
+            self.waiting_writable = False
+
+    def _write_blocking(self, limit: int = 0) -> None:
+        while self.size > limit and self.pending:
+            try:
+                written = os.write(self.fd, self.pending)
+            except (BlockingIOError, InterruptedError):
+                select.select([], [self.fd], [])
+                continue
+            except OSError as e:
+                self._discard(e)
+                break
+            del self.pending[:written]
+            self.size -= written
+
+        if not self.pending and self.waiting_writable and self.loop is not None and not self.loop.is_closed():
+            self.loop.remove_writer(self.fd)
+            self.waiting_writable = False
+
+class StreamFrameWriter(BaseFrameWriter):
+    """Writes frames to a binary stream such as stdout.
+
+    Pipes can't be polled for writing on every platform, so the coalesced write is a
+    regular blocking write.
+    """
+
+    def __init__(self, stream: BinaryIO, max_buffer_size: int = MAX_BUFFER_SIZE):
+        super().__init__(max_buffer_size)
+        self.stream = stream
+
+    def _write_pending(self) -> None:
+        self._write_blocking()
+
+    def _write_blocking(self, limit: int = 0) -> None:
+        if not self.pending:
+            return
+        try:
+            # Keep frames ordered with anything printed before them
+            sys.stdout.flush()
+            self.stream.write(self.pending)
+            self.stream.flush()
+        except (OSError, ValueError) as e:
+            self._discard(e)
+            return
+        self.size -= len(self.pending)
+        self.pending.clear()
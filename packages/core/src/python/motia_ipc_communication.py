@@ -1,22 +1,43 @@
 import uuid
 import asyncio
 import json
+from motia_codec import codec
+from motia_serializer import serialize_for_json
 import sys
 import os
-from typing import Any, Dict, Optional, Callable
-
-def serialize_for_json(obj: Any) -> Any:
-    """Convert Python objects to JSON-serializable types"""
-    if hasattr(obj, '__dict__'):
-        return obj.__dict__
-    elif hasattr(obj, '_asdict'):
-        return obj._asdict()
-    elif isinstance(obj, (list, tuple)):
-        return [serialize_for_json(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    else:
-        return obj
+from typing import Any, Dict, List, Optional, Callable
+from motia_frame_writer import FrameWriter
+
+READ_CHUNK_SIZE = 256 * 1024
+
+class LineBuffer:
+    """Accumulates bytes and splits them into complete newline-terminated lines.
+
+    Only the bytes received since the previous call are scanned for a newline, so a
+    message arriving in many chunks is scanned once rather than once per chunk.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.scanned = 0
+
+    def feed(self, data: bytes) -> List[bytes]:
+        """Append data and return the lines it completed, without their newline"""
+        buffer = self.buffer
+        buffer += data
+        lines: List[bytes] = []
+        start = 0
+
+        index = buffer.find(b'\n', self.scanned)
+        while index != -1:
+            lines.append(bytes(buffer[start:index]))
+            start = index + 1
+            index = buffer.find(b'\n', start)
+
+        if start:
+            del buffer[:start]
+        self.scanned = len(buffer)
+        return lines
 
 class IpcCommunication:
     """IPC communication using file descriptors"""
@@ -36,23 +57,30 @@ class IpcCommunication:
                 raise RuntimeError("Invalid NODE_CHANNEL_FD environment variable")
         else:
             raise RuntimeError("NODE_CHANNEL_FD environment variable not found")
+
+        self.writer = FrameWriter(self.ipc_fd)
         
-    def send_no_wait(self, method: str, args: Any) -> None:
+    def send_no_wait(self, method: str, args: Any, invocation_id: Optional[str] = None) -> None:
         """Send IPC request without waiting for response"""
         request = {
             'type': 'rpc_request',
             'method': method,
             'args': args
         }
+        if invocation_id is not None:
+            request['invocationId'] = invocation_id
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
-            message_bytes = (json_str + "\n").encode('utf-8')
-            os.write(self.ipc_fd, message_bytes)
+            self.writer.write(codec.encode(request, default=serialize_for_json))
         except Exception as e:
             print(f"ERROR: Failed to send IPC request: {e}", file=sys.stderr)
+            return
 
-    async def send(self, method: str, args: Any) -> Any:
+        if self.writer.size > self.writer.max_buffer_size:
+            # Fire-and-forget callers can't await the drain, wait for Node.js to catch up here instead
+            self.writer.flush_sync(self.writer.max_buffer_size)
+
+    async def send(self, method: str, args: Any, invocation_id: Optional[str] = None) -> Any:
         """Send IPC request and wait for response"""
         request_id = str(uuid.uuid4())
         future = asyncio.Future()
@@ -64,15 +92,16 @@ class IpcCommunication:
             'method': method,
             'args': args
         }
+        if invocation_id is not None:
+            request['invocationId'] = invocation_id
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
-            message_bytes = (json_str + "\n").encode('utf-8')
-            os.write(self.ipc_fd, message_bytes)
+            self.writer.write(codec.encode(request, default=serialize_for_json))
         except Exception as e:
             future.set_exception(e)
             return await future
 
+        await self.writer.drain()
         return await future
 
     def _handle_message(self, msg: Dict[str, Any]) -> None:
@@ -97,44 +126,55 @@ class IpcCommunication:
             except Exception as e:
                 print(f"ERROR: Handler for {msg_type} failed: {e}", file=sys.stderr)
 
-    async def _read_ipc(self) -> None:
-        """Read messages from IPC file descriptor in background"""
-        loop = asyncio.get_event_loop()
-        buffer = ""
-        
-        while self.executing:
+    def _on_readable(self, line_buffer: LineBuffer, closed: asyncio.Future) -> None:
+        try:
+            data = os.read(self.ipc_fd, READ_CHUNK_SIZE)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            # IPC channel closed
+            data = b''
+
+        if not data:
+            if not closed.done():
+                closed.set_result(None)
+            return
+
+        for line in line_buffer.feed(data):
+            if not line.strip():
+                continue
             try:
-                data = await loop.run_in_executor(None, os.read, self.ipc_fd, 4096)
-                if not data:
-                    break
-                
-                buffer += data.decode('utf-8')
-                lines = buffer.split('\n')
-                buffer = lines[-1]  # Keep incomplete line in buffer
-                
-                for line in lines[:-1]:
-                    if line.strip():
-                        try:
-                            msg = json.loads(line.strip())
-                            self._handle_message(msg)
-                        except json.JSONDecodeError as e:
-                            print(f"WARNING: Failed to parse JSON: {e}", file=sys.stderr)
-                        
-            except OSError:
-                # IPC channel closed
-                break
-            except Exception as e:
-                print(f"ERROR: Reading IPC failed: {e}", file=sys.stderr)
-                await asyncio.sleep(0.1)
+                msg = codec.decode(line)
+            except (json.JSONDecodeError, UnicodeDecodeError) as e:
+                print(f"WARNING: Failed to parse JSON: {e}", file=sys.stderr)
+                continue
+            self._handle_message(msg)
+
+    async def _read_ipc(self) -> None:
+        """Read messages from IPC file descriptor on the event loop until it closes"""
+        loop = asyncio.get_running_loop()
+        closed = loop.create_future()
+
+        loop.add_reader(self.ipc_fd, self._on_readable, LineBuffer(), closed)
+        try:
+            await closed
+        finally:
+            loop.remove_reader(self.ipc_fd)
 
     async def init(self) -> None:
         """Initialize IPC communication"""
         if not self.ipc_reader_task:
             self.ipc_reader_task = asyncio.create_task(self._read_ipc())
 
+    async def wait_closed(self) -> None:
+        """Wait until the channel to Node.js is closed"""
+        if self.ipc_reader_task:
+            await asyncio.wait([self.ipc_reader_task])
+
     def close(self) -> None:
         """Close IPC communication"""
         self.executing = False
+        self.writer.flush_sync()
         
         for future in self.pending_requests.values():
             if not future.done():
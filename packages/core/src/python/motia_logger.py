@@ -1,14 +1,41 @@
+import asyncio
+import os
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from motia_blocking import in_loop_thread
 from motia_rpc import RpcSender
 
+# Mirrors the levels the Node.js logger prints so filtered entries are never serialized
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'info')
+ENABLED_LEVELS = {
+    'debug': LOG_LEVEL == 'debug',
+    'info': LOG_LEVEL in ('info', 'debug'),
+    'warn': LOG_LEVEL in ('warn', 'info', 'debug', 'trace'),
+    'error': True,
+}
+
+LOG_BATCH_SIZE = 100
+LOG_BATCH_INTERVAL = 0.05
+
 class Logger:
     def __init__(self, trace_id: str, flows: list[str], rpc: RpcSender):
         self.trace_id = trace_id
         self.flows = flows
         self.rpc = rpc
+        self.sent = 0
+        self.dropped = 0
+        self._batch: List[Dict[str, Any]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        try:
+            self._loop: Optional[asyncio.AbstractEventLoop] = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
 
     def _log(self, level: str, message: str, args: Optional[Dict[str, Any]] = None) -> None:
+        if not ENABLED_LEVELS.get(level, True):
+            self.dropped += 1
+            return
+
         log_entry = {
             "level": level,
             "time": int(time.time() * 1000),
@@ -25,7 +52,41 @@ class Logger:
                 args = {"data": args}
             log_entry.update(args)
 
-        self.rpc.send_no_wait('log', log_entry)
+        self.sent += 1
+
+        if in_loop_thread():
+            self._add_to_batch(log_entry)
+        elif self._loop is not None and self._loop.is_running():
+            # Logged from a sync handler thread, the batch is only touched by the loop thread
+            self._loop.call_soon_threadsafe(self._add_to_batch, log_entry)
+        else:
+            # Outside of the event loop there is nothing to flush the batch later
+            self.rpc.send_no_wait('log', log_entry)
+
+    def _add_to_batch(self, log_entry: Dict[str, Any]) -> None:
+        self._batch.append(log_entry)
+
+        if len(self._batch) >= LOG_BATCH_SIZE:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(LOG_BATCH_INTERVAL, self.flush)
+
+    def flush(self, final: bool = False) -> None:
+        """Send buffered entries as a single log.batch frame, the final flush also reports the counts"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        if not self._batch and not (final and (self.sent or self.dropped)):
+            return
+
+        batch, self._batch = self._batch, []
+        frame: Dict[str, Any] = {"entries": batch}
+
+        if final:
+            frame["stats"] = {"sent": self.sent, "dropped": self.dropped}
+
+        self.rpc.send_no_wait('log.batch', frame)
 
     def info(self, message: str, args: Optional[Any] = None) -> None:
         self._log("info", message, args)
@@ -0,0 +1,126 @@
+import hashlib
+import importlib.util
+import os
+import sys
+from types import ModuleType
+from typing import Dict, Optional, Set, Tuple
+
+Fingerprint = Tuple[int, int]
+
+def _fingerprint(path: str) -> Optional[Fingerprint]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+def _content_hash(path: str) -> Optional[str]:
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+class _TrackedFile:
+    """A source file with the fingerprint and hash it had when it was executed"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.fingerprint = _fingerprint(path)
+        self.hash = _content_hash(path)
+
+    def is_fresh(self) -> bool:
+        fingerprint = _fingerprint(self.path)
+        if fingerprint == self.fingerprint:
+            return True
+        if fingerprint is None:
+            return False
+
+        # mtime changed, only invalidate if the content did too
+        content_hash = _content_hash(self.path)
+        if content_hash != self.hash:
+            return False
+
+        self.fingerprint = fingerprint
+        return True
+
+class ModuleCache:
+    """Cache of executed step modules keyed by absolute path.
+
+    A step module is re-executed only when its own file changes. When a local module
+    it imports (e.g. a sibling `services/pet_store.py`) changes, every local module is
+    evicted from `sys.modules` and every cached step is re-executed on next use.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._steps: Dict[str, Tuple[ModuleType, _TrackedFile]] = {}
+        self._local_modules: Dict[str, _TrackedFile] = {}
+        self._roots: Set[str] = set()
+
+    def load(self, file_path: str) -> ModuleType:
+        """Return the executed module for the step file, executing it if needed"""
+        path = os.path.abspath(file_path)
+
+        if not self._local_modules_fresh():
+            self.clear()
+
+        cached = self._steps.get(path)
+        if cached is not None and cached[1].is_fresh():
+            self.hits += 1
+            return cached[0]
+
+        self.misses += 1
+        loaded = set(sys.modules)
+        try:
+            module = self._execute(path)
+        finally:
+            self._track_local_modules(sys.modules.keys() - loaded)
+        self._steps[path] = (module, _TrackedFile(path))
+        return module
+
+    def clear(self) -> None:
+        """Drop every cached step and evict local modules from sys.modules"""
+        for name in self._local_modules:
+            sys.modules.pop(name, None)
+        self._local_modules.clear()
+        self._steps.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counts the runner prints on stderr with MOTIA_PYTHON_DEBUG"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._steps)}
+
+    def _execute(self, path: str) -> ModuleType:
+        module_dir = os.path.dirname(path)
+        flows_dir = os.path.dirname(module_dir)
+
+        for root in (module_dir, flows_dir):
+            if root not in self._roots:
+                self._roots.add(root)
+                if root not in sys.path:
+                    sys.path.insert(0, root)
+
+        spec = importlib.util.spec_from_file_location("dynamic_module", path)
+        if spec is None or spec.loader is None:
+            raise ImportError(f"Could not load module from {path}")
+
+        module = importlib.util.module_from_spec(spec)
+        module.__package__ = os.path.basename(module_dir)
+        spec.loader.exec_module(module)
+        return module
+
+    def _is_local(self, file_path: str) -> bool:
+        if 'site-packages' in file_path:
+            return False
+        return any(file_path.startswith(root + os.sep) for root in self._roots)
+
+    def _track_local_modules(self, names: Set[str]) -> None:
+        """Track the local modules among the ones a step execution imported"""
+        for name in names:
+            file_path = getattr(sys.modules.get(name), '__file__', None)
+            if name not in self._local_modules and file_path and self._is_local(file_path):
+                self._local_modules[name] = _TrackedFile(file_path)
+
+    def _local_modules_fresh(self) -> bool:
+        return all(tracked.is_fresh() for tracked in self._local_modules.values())
@@ -0,0 +1,134 @@
+import asyncio
+import inspect
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.connection import Connection
+from typing import Any, List, Optional, Tuple
+from motia_blocking import run_blocking, wait_in_thread
+from motia_context import Context
+from motia_dot_dict import DotDict
+from motia_event_loop import new_event_loop
+from motia_module_cache import ModuleCache
+from motia_rpc_stream_manager import RpcStreamManager
+
+# Processes running the handlers of steps configured with `"executor": "process"`
+PROCESS_WORKERS = int(os.environ.get("MOTIA_PYTHON_PROCESSES") or os.cpu_count() or 1)
+
+# How often the parent checks whether the handler finished while serving its calls
+_POLL_INTERVAL = 0.05
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Return the pool, started on first use and kept warm for the next invocations"""
+    global _pool
+    if _pool is None:
+        # The runner has threads of its own, forking it is not safe
+        _pool = ProcessPoolExecutor(max_workers=PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+class PipeRpcSender:
+    """RpcSender of a pool process, calls are proxied to the runner that owns the channel to Node.js"""
+
+    def __init__(self, conn: Connection):
+        self._conn = conn
+
+    async def send(self, method: str, args: Any) -> Any:
+        """Send request and wait for response"""
+        # The process runs a single handler, waiting here does not hold up other work
+        self._conn.send(("send", method, args))
+        error, result = self._conn.recv()
+        if error is not None:
+            raise Exception(error)
+        return result
+
+    def send_no_wait(self, method: str, args: Any) -> None:
+        """Send request without waiting for response"""
+        self._conn.send(("send_no_wait", method, args))
+
+# Step modules and the event loop stay around between the invocations a pool process runs
+_module_cache: Optional[ModuleCache] = None
+_loop: Optional[asyncio.AbstractEventLoop] = None
+
+async def _run_handler(file_path: str, handler_args: Tuple, rpc: PipeRpcSender, streams: List[str]) -> Any:
+    global _module_cache
+    if _module_cache is None:
+        _module_cache = ModuleCache()
+
+    module = _module_cache.load(file_path)
+    data, trace_id, flows, context_in_first_arg = handler_args
+
+    context = Context(trace_id, flows, rpc, DotDict({name: RpcStreamManager(name, rpc) for name in streams}))
+    args = (context,) if context_in_first_arg else (data, context)
+
+    try:
+        if inspect.iscoroutinefunction(module.handler):
+            return await module.handler(*args)
+        return await run_blocking(module.handler, *args)
+    finally:
+        await context.state.flush()
+        for stream in context.streams.values():
+            await stream.flush()
+        context.logger.flush(final=True)
+
+def run_in_pool_process(file_path: str, handler_args: Tuple, streams: List[str], conn: Connection) -> Any:
+    """Entry point of a pool process, runs the step handler with a context proxied through `conn`"""
+    global _loop
+    if _loop is None:
+        _loop = new_event_loop()
+        asyncio.set_event_loop(_loop)
+
+    try:
+        return _loop.run_until_complete(_run_handler(file_path, handler_args, PipeRpcSender(conn), streams))
+    finally:
+        conn.close()
+
+def _serve_calls(conn: Connection, future: Future, rpc: Any, loop: asyncio.AbstractEventLoop) -> None:
+    """Forward the calls of a pool process to Node.js until its handler finishes"""
+    while True:
+        if not conn.poll(_POLL_INTERVAL):
+            if future.done():
+                return
+            continue
+
+        try:
+            kind, method, args = conn.recv()
+        except EOFError:
+            return
+
+        if kind == "send_no_wait":
+            loop.call_soon_threadsafe(rpc.send_no_wait, method, args)
+            continue
+
+        try:
+            conn.send((None, wait_in_thread(rpc.send(method, args), loop)))
+        except Exception as error:
+            conn.send((str(error), None))
+
+async def run_in_process(
+    file_path: str,
+    rpc: Any,
+    data: Any,
+    trace_id: str,
+    flows: List[str],
+    context_in_first_arg: bool,
+    streams: List[str],
+) -> Any:
+    """Run the handler of a step in the process pool, its state, stream, emit and log calls go through `rpc`"""
+    conn, child_conn = multiprocessing.Pipe()
+    handler_args = (data, trace_id, flows, context_in_first_arg)
+
+    try:
+        future = get_process_pool().submit(run_in_pool_process, file_path, handler_args, streams, child_conn)
+        await run_blocking(_serve_calls, conn, future, rpc, asyncio.get_running_loop())
+        return await asyncio.wrap_future(future)
+    except BrokenProcessPool:
+        # A pool process died, the next invocation starts a new pool
+        global _pool
+        _pool = None
+        raise
+    finally:
+        conn.close()
+        child_conn.close()
@@ -1,39 +1,53 @@
-from typing import Any, Union
+from typing import Any, Callable, Dict, Optional, Union
 from motia_communication_factory import create_communication
 from motia_rpc_communication import RpcCommunication
 from motia_ipc_communication import IpcCommunication
 
-def serialize_for_json(obj: Any) -> Any:
-    """Convert Python objects to JSON-serializable types"""
-    if hasattr(obj, '__dict__'):
-        return obj.__dict__
-    elif hasattr(obj, '_asdict'):  # For namedtuples
-        return obj._asdict()
-    elif isinstance(obj, (list, tuple)):
-        return [serialize_for_json(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    else:
-        return obj
-
 class RpcSender:
     """Unified communication interface that delegates to appropriate implementation"""
     
     def __init__(self):
         self._communication: Union[RpcCommunication, IpcCommunication] = create_communication()
         
-    def send_no_wait(self, method: str, args: Any) -> None:
+    def send_no_wait(self, method: str, args: Any, invocation_id: Optional[str] = None) -> None:
         """Send request without waiting for response"""
-        return self._communication.send_no_wait(method, args)
+        return self._communication.send_no_wait(method, args, invocation_id)
 
-    async def send(self, method: str, args: Any) -> Any:
+    async def send(self, method: str, args: Any, invocation_id: Optional[str] = None) -> Any:
         """Send request and wait for response"""
-        return await self._communication.send(method, args)
+        return await self._communication.send(method, args, invocation_id)
+
+    def on_message(self, msg_type: str, handler: Callable[[Dict[str, Any]], None]) -> None:
+        """Register a handler for messages of the given type sent by Node.js"""
+        self._communication.message_handlers[msg_type] = handler
+
+    def for_invocation(self, invocation_id: str) -> "InvocationRpcSender":
+        """Create a sender that tags every request with the given invocation id"""
+        return InvocationRpcSender(self, invocation_id)
 
     async def init(self) -> None:
         """Initialize communication"""
         return await self._communication.init()
 
+    async def wait_closed(self) -> None:
+        """Wait until the channel to Node.js is closed"""
+        return await self._communication.wait_closed()
+
     def close(self) -> None:
         """Close communication"""
         return self._communication.close()
+
+class InvocationRpcSender:
+    """RpcSender scoped to a single invocation in a long-lived runner"""
+
+    def __init__(self, rpc: RpcSender, invocation_id: str):
+        self._rpc = rpc
+        self.invocation_id = invocation_id
+
+    def send_no_wait(self, method: str, args: Any) -> None:
+        """Send request without waiting for response"""
+        return self._rpc.send_no_wait(method, args, self.invocation_id)
+
+    async def send(self, method: str, args: Any) -> Any:
+        """Send request and wait for response"""
+        return await self._rpc.send(method, args, self.invocation_id)
@@ -1,21 +1,11 @@
 import uuid
 import asyncio
 import json
+from motia_codec import codec
+from motia_serializer import serialize_for_json
 import sys
 from typing import Any, Dict, Optional, Callable
-
-def serialize_for_json(obj: Any) -> Any:
-    """Convert Python objects to JSON-serializable types"""
-    if hasattr(obj, '__dict__'):
-        return obj.__dict__
-    elif hasattr(obj, '_asdict'):
-        return obj._asdict()
-    elif isinstance(obj, (list, tuple)):
-        return [serialize_for_json(item) for item in obj]
-    elif isinstance(obj, dict):
-        return {k: serialize_for_json(v) for k, v in obj.items()}
-    else:
-        return obj
+from motia_frame_writer import StreamFrameWriter
 
 class RpcCommunication:
     """RPC communication using stdin/stdout"""
@@ -25,22 +15,24 @@ class RpcCommunication:
         self.pending_requests: Dict[str, asyncio.Future] = {}
         self.stdin_reader_task: Optional[asyncio.Task] = None
         self.message_handlers: Dict[str, Callable] = {}
+        self.writer = StreamFrameWriter(sys.stdout.buffer)
         
-    def send_no_wait(self, method: str, args: Any) -> None:
+    def send_no_wait(self, method: str, args: Any, invocation_id: Optional[str] = None) -> None:
         """Send RPC request without waiting for response"""
         request = {
             'type': 'rpc_request',
             'method': method,
             'args': args
         }
+        if invocation_id is not None:
+            request['invocationId'] = invocation_id
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
-            print(json_str, flush=True)
+            self.writer.write(codec.encode(request, default=serialize_for_json))
         except Exception as e:
             print(f"ERROR: Failed to send RPC request: {e}", file=sys.stderr)
 
-    async def send(self, method: str, args: Any) -> Any:
+    async def send(self, method: str, args: Any, invocation_id: Optional[str] = None) -> Any:
         """Send RPC request and wait for response"""
         request_id = str(uuid.uuid4())
         future = asyncio.Future()
@@ -52,10 +44,11 @@ class RpcCommunication:
             'method': method,
             'args': args
         }
+        if invocation_id is not None:
+            request['invocationId'] = invocation_id
         
         try:
-            json_str = json.dumps(request, default=serialize_for_json)
-            print(json_str, flush=True)
+            self.writer.write(codec.encode(request, default=serialize_for_json))
         except Exception as e:
             future.set_exception(e)
             return await future
@@ -98,7 +91,7 @@ class RpcCommunication:
                 line = line.strip()
                 if line:
                     try:
-                        msg = json.loads(line)
+                        msg = codec.decode(line)
                         self._handle_message(msg)
                     except json.JSONDecodeError as e:
                         print(f"WARNING: Failed to parse JSON: {e}", file=sys.stderr)
@@ -112,9 +105,15 @@ class RpcCommunication:
         if not self.stdin_reader_task:
             self.stdin_reader_task = asyncio.create_task(self._read_stdin())
 
+    async def wait_closed(self) -> None:
+        """Wait until the channel to Node.js is closed"""
+        if self.stdin_reader_task:
+            await asyncio.wait([self.stdin_reader_task])
+
     def close(self) -> None:
         """Close RPC communication"""
         self.executing = False
+        self.writer.flush_sync()
         
         for future in self.pending_requests.values():
             if not future.done():
@@ -1,70 +1,195 @@
 import asyncio
-import functools
-import sys
-from typing import Any
+import os
+from typing import Any, Dict, List, Tuple
+from motia_blocking import BackgroundCalls, loop_call
 from motia_rpc import RpcSender
 
+# Enables the per-invocation state cache for every Python step, a step can also call `context.state.enable_cache()`
+STATE_CACHE_ENABLED = os.environ.get('MOTIA_PYTHON_STATE_CACHE', '').lower() in ('1', 'true')
+
+# Marks a buffered delete in the pending writes
+_DELETED = object()
+
+def _wrap_result(result: Any) -> Any:
+    if result is None:
+        return {'data': None}
+    elif isinstance(result, dict):
+        if 'data' not in result:
+            return {'data': result}
+
+    return result
+
 class RpcStateManager:
     def __init__(self, rpc: RpcSender):
         self.rpc = rpc
         self._loop = asyncio.get_event_loop()
+        self._background = BackgroundCalls(self._loop)
+        self._cache_enabled = STATE_CACHE_ENABLED
+        # Values known in this invocation, None when the key is known to be missing
+        self._cache: Dict[Tuple[str, str], Any] = {}
+        # Writes not sent to Node.js yet
+        self._pending: Dict[Tuple[str, str], Any] = {}
+
+    def enable_cache(self) -> None:
+        """Serve repeated reads locally and buffer writes until `flush()` for the rest of the invocation"""
+        self._cache_enabled = True
+
+    @loop_call
+    async def flush(self) -> None:
+        """Send buffered writes and wait for the ones made without waiting, the runner flushes before closing"""
+        await self._background.drain()
 
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, {}
+        by_trace: Dict[str, Tuple[Dict[str, Any], List[str]]] = {}
+
+        for (trace_id, key), value in pending.items():
+            values, deleted = by_trace.setdefault(trace_id, ({}, []))
+            if value is _DELETED:
+                deleted.append(key)
+            else:
+                values[key] = value
+
+        for trace_id, (values, deleted) in by_trace.items():
+            if values:
+                await self.rpc.send('state.setMany', {'traceId': trace_id, 'values': values})
+            if deleted:
+                await self.rpc.send('state.deleteMany', {'traceId': trace_id, 'keys': deleted})
+
+    @loop_call
     async def get(self, trace_id: str, key: str) -> asyncio.Future[Any]:
+        if self._cache_enabled and (trace_id, key) in self._cache:
+            return _wrap_result(self._cache[(trace_id, key)])
+
         result = await self.rpc.send('state.get', {'traceId': trace_id, 'key': key})
-        
-        if result is None:
-            return {'data': None}
-        elif isinstance(result, dict):
-            if 'data' not in result:
-                return {'data': result}
-        
-        return result
-    
+
+        if self._cache_enabled:
+            self._cache[(trace_id, key)] = result
+
+        return _wrap_result(result)
+
+    @loop_call
     async def get_group(self, group_id: str) -> asyncio.Future[Any]:
+        # The group has to include the buffered writes
+        await self.flush()
         result = await self.rpc.send('state.getGroup', {'groupId': group_id})
-        
+
         if result is None:
             return {'data': None}
         elif isinstance(result, dict):
             if 'data' not in result:
                 return {'data': result}
-        
+
         return result
-    
+
+    @loop_call
     async def getGroup(self, trace_id: str, key: str) -> asyncio.Future[Any]:
         return await self.get_group(trace_id, key)
 
+    @loop_call
     async def set(self, trace_id: str, key: str, value: Any) -> asyncio.Future[None]:
+        if self._cache_enabled:
+            self._cache[(trace_id, key)] = value
+            self._pending[(trace_id, key)] = value
+            return value
+
         future = await self.rpc.send('state.set', {'traceId': trace_id, 'key': key, 'value': value})
         return future
 
+    @loop_call
     async def delete(self, trace_id: str, key: str) -> asyncio.Future[None]:
-        return await self.rpc.send('state.delete', {'traceId': trace_id, 'key': key})
+        if self._cache_enabled and (trace_id, key) in self._cache:
+            # The deleted value is known, the delete itself can wait for the flush
+            value = self._cache[(trace_id, key)]
+            self._cache[(trace_id, key)] = None
+            self._pending[(trace_id, key)] = _DELETED
+            return value
+
+        result = await self.rpc.send('state.delete', {'traceId': trace_id, 'key': key})
+
+        if self._cache_enabled:
+            self._cache[(trace_id, key)] = None
+
+        return result
+
+    @loop_call
+    async def get_many(self, trace_id: str, keys: List[str]) -> List[Any]:
+        """Get several keys in one round trip, values are returned in the order of `keys`, None when missing"""
+        missing = [key for key in keys if not self._cache_enabled or (trace_id, key) not in self._cache]
+        values: Dict[str, Any] = {}
+
+        if missing:
+            result = await self.rpc.send('state.getMany', {'traceId': trace_id, 'keys': missing}) or [None] * len(missing)
+            values = dict(zip(missing, result))
+
+        if self._cache_enabled:
+            for key, value in values.items():
+                self._cache[(trace_id, key)] = value
+            return [self._cache[(trace_id, key)] for key in keys]
+
+        return [values[key] for key in keys]
+
+    @loop_call
+    async def set_many(self, trace_id: str, values: Dict[str, Any]) -> None:
+        """Set several keys in one round trip"""
+        if self._cache_enabled:
+            for key, value in values.items():
+                self._cache[(trace_id, key)] = value
+                self._pending[(trace_id, key)] = value
+            return
 
+        await self.rpc.send('state.setMany', {'traceId': trace_id, 'values': values})
+
+    @loop_call
+    async def delete_many(self, trace_id: str, keys: List[str]) -> List[Any]:
+        """Delete several keys in one round trip, returning the deleted values in the order of `keys`"""
+        if not self._cache_enabled:
+            return await self.rpc.send('state.deleteMany', {'traceId': trace_id, 'keys': keys}) or [None] * len(keys)
+
+        known = {key: (trace_id, key) in self._cache for key in keys}
+        missing = [key for key in keys if not known[key]]
+        values: Dict[str, Any] = {}
+
+        if missing:
+            result = await self.rpc.send('state.deleteMany', {'traceId': trace_id, 'keys': missing}) or [None] * len(missing)
+            values = dict(zip(missing, result))
+
+        for key in keys:
+            if known[key]:
+                values[key] = await self.delete(trace_id, key)
+            else:
+                self._cache[(trace_id, key)] = None
+
+        return [values[key] for key in keys]
+
+    @loop_call
     async def clear(self, trace_id: str) -> asyncio.Future[None]:
+        if self._cache_enabled:
+            # Buffered writes of the trace would be cleared anyway
+            for entries in (self._cache, self._pending):
+                for cache_key in [cache_key for cache_key in entries if cache_key[0] == trace_id]:
+                    del entries[cache_key]
+
         return await self.rpc.send('state.clear', {'traceId': trace_id})
 
-    # Add wrappers to handle non-awaited coroutines
-    def __getattribute__(self, name):
-        attr = super().__getattribute__(name)
-        if name in ('get', 'set', 'delete', 'clear') and asyncio.iscoroutinefunction(attr):
-            @functools.wraps(attr)
-            def wrapper(*args, **kwargs):
-                coro = attr(*args, **kwargs)
-                # Check if this is being awaited
-                frame = sys._getframe(1)
-                if frame.f_code.co_name != '__await__':
-                    # Not being awaited, schedule in background
-                    # But we need to make sure this task completes before the handler returns
-                    # So we'll return the task for the caller to await if needed
-                    task = asyncio.create_task(coro)
-                    # Add error handling for the background task
-                    def handle_exception(t):
-                        if t.done() and not t.cancelled() and t.exception():
-                            print(f"Unhandled exception in background task: {t.exception()}", file=sys.stderr)
-                    task.add_done_callback(handle_exception)
-                    return task
-                # Being awaited, return coroutine as normal
-                return coro
-            return wrapper
-        return attr
+    def set_nowait(self, trace_id: str, key: str, value: Any) -> None:
+        """Set a key without waiting for Node.js, the write lands before the invocation is closed"""
+        self._background.start(self.set, trace_id, key, value)
+
+    def delete_nowait(self, trace_id: str, key: str) -> None:
+        """Delete a key without waiting for Node.js, the delete lands before the invocation is closed"""
+        self._background.start(self.delete, trace_id, key)
+
+    def set_many_nowait(self, trace_id: str, values: Dict[str, Any]) -> None:
+        """Set several keys without waiting for Node.js, the writes land before the invocation is closed"""
+        self._background.start(self.set_many, trace_id, values)
+
+    def delete_many_nowait(self, trace_id: str, keys: List[str]) -> None:
+        """Delete several keys without waiting for Node.js, the deletes land before the invocation is closed"""
+        self._background.start(self.delete_many, trace_id, keys)
+
+    def clear_nowait(self, trace_id: str) -> None:
+        """Clear the state of a trace without waiting for Node.js, it lands before the invocation is closed"""
+        self._background.start(self.clear, trace_id)
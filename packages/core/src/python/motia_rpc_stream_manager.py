@@ -1,56 +1,207 @@
 import asyncio
-import functools
 import sys
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
+from motia_blocking import BackgroundCalls, loop_call
 from motia_rpc import RpcSender
 
+# Mirrors appendToField and applyMergePatch of src/streams/stream-patch.ts, both are tested against the same cases
+def _append_to_field(item: Any, field: str, value: Any) -> Dict[str, Any]:
+    """Append to a string or list field the same way the Node.js stream does, a missing field is set to the value"""
+    current = item.get(field) if isinstance(item, dict) else None
+
+    if isinstance(current, str):
+        value = current + str(value)
+    elif isinstance(current, list):
+        value = current + (value if isinstance(value, list) else [value])
+
+    return {**(item if isinstance(item, dict) else {}), field: value}
+
+def _apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a JSON merge patch (RFC 7386), None removes a field"""
+    if not isinstance(patch, dict):
+        return patch
+
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = _apply_merge_patch(result.get(key), value)
+
+    return result
+
 class RpcStreamManager:
     def __init__(self, stream_name: str,rpc: RpcSender):
         self.rpc = rpc
         self.stream_name = stream_name
         self._loop = asyncio.get_event_loop()
+        self._background = BackgroundCalls(self._loop)
+        # Coalescing window in seconds, None sends every update right away
+        self._window: Optional[float] = None
+        # Updates of each item made during the window as (operation, args), merged together whenever possible
+        self._pending: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flushing: Optional[asyncio.Future] = None
+
+    def coalesce(self, window: Optional[float] = 0.05) -> None:
+        """Collapse updates of the same item made within `window` seconds, None turns it off"""
+        self._window = window or None
+
+    @loop_call
+    async def flush(self) -> None:
+        """Send the pending updates and the ones made without waiting, the runner flushes every stream before closing"""
+        await self._background.drain()
+        await self._send_pending()
+
+    async def _send_pending(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        flushing = self._flushing
+        if not self._pending and (flushing is None or flushing.done()):
+            return
+
+        await asyncio.shield(self._start_flush())
+
+    def _start_flush(self) -> asyncio.Future:
+        """Send the pending updates once the flush started before is sent, the updates of an item stay in order"""
+        previous = self._flushing
+        pending, self._pending = self._pending, {}
+        self._flushing = asyncio.ensure_future(self._send_after(previous, pending))
+        return self._flushing
+
+    async def _send_after(
+        self,
+        previous: Optional[asyncio.Future],
+        pending: Dict[Tuple[str, str], List[Tuple[str, Dict[str, Any]]]],
+    ) -> None:
+        if previous is not None and not previous.done():
+            # A failed flush is reported by whoever started it
+            await asyncio.wait([previous])
+
+        await asyncio.gather(*(self._send_updates(updates) for updates in pending.values()))
+
+    async def _send_updates(self, updates: List[Tuple[str, Dict[str, Any]]]) -> None:
+        for operation, args in updates:
+            await self.rpc.send(f'streams.{self.stream_name}.{operation}', args)
+
+    def _flush_later(self) -> None:
+        self._flush_handle = None
+        flushing = self._start_flush()
+
+        def handle_exception(t):
+            if not t.cancelled() and t.exception():
+                print(f"Failed to flush stream {self.stream_name}: {t.exception()}", file=sys.stderr)
+        flushing.add_done_callback(handle_exception)
 
+    def _buffer(self, group_id: str, id: str, operation: str, args: Dict[str, Any]) -> None:
+        updates = self._pending.setdefault((group_id, id), [])
+        last_operation, last_args = updates[-1] if updates else (None, {})
+
+        if operation == 'set':
+            # The item is replaced, the earlier updates don't matter anymore
+            updates[:] = [(operation, args)]
+        elif last_operation == 'set':
+            data = last_args['data']
+            if operation == 'append':
+                data = _append_to_field(data, args['field'], args['value'])
+            else:
+                data = _apply_merge_patch(data, args['patch'])
+            updates[-1] = ('set', {**last_args, 'data': data})
+        elif (
+            operation == 'append' and last_operation == 'append' and last_args['field'] == args['field']
+            and isinstance(last_args['value'], str) and isinstance(args['value'], str)
+        ):
+            updates[-1] = ('append', {**last_args, 'value': last_args['value'] + args['value']})
+        else:
+            updates.append((operation, args))
+
+        if self._flush_handle is None:
+            self._flush_handle = self._loop.call_later(self._window, self._flush_later)
+
+    async def _flush_item(self, group_id: str, id: str) -> None:
+        await self._background.drain()
+        if (group_id, id) in self._pending:
+            await self._send_pending()
+
+    @loop_call
     async def get(self, group_id: str, id: str) -> asyncio.Future[Any]:
+        await self._flush_item(group_id, id)
         result = await self.rpc.send(f'streams.{self.stream_name}.get', {'groupId': group_id, 'id': id})
         return result
 
+    @loop_call
     async def set(self, group_id: str, id: str, data: Any) -> asyncio.Future[None]:
-        future = await self.rpc.send(f'streams.{self.stream_name}.set', {'groupId': group_id, 'id': id, 'data': data})
+        args = {'groupId': group_id, 'id': id, 'data': data}
+
+        if self._window is not None:
+            self._buffer(group_id, id, 'set', args)
+            return {**data, 'id': id} if isinstance(data, dict) else data
+
+        future = await self.rpc.send(f'streams.{self.stream_name}.set', args)
         return future
 
+    @loop_call
+    async def append(self, group_id: str, id: str, field: str, value: Any) -> Any:
+        """Append to a string or list field of the item, only the appended value is sent to Node.js and the clients.
+        Returns the updated item, None when the update is coalesced"""
+        args = {'groupId': group_id, 'id': id, 'field': field, 'value': value}
+
+        if self._window is not None:
+            self._buffer(group_id, id, 'append', args)
+            return None
+
+        return await self.rpc.send(f'streams.{self.stream_name}.append', args)
+
+    @loop_call
+    async def patch(self, group_id: str, id: str, patch: Dict[str, Any]) -> Any:
+        """Apply a JSON merge patch to the item, only the patch is sent to Node.js and the clients.
+        Returns the updated item, None when the update is coalesced"""
+        args = {'groupId': group_id, 'id': id, 'patch': patch}
+
+        if self._window is not None:
+            self._buffer(group_id, id, 'patch', args)
+            return None
+
+        return await self.rpc.send(f'streams.{self.stream_name}.patch', args)
+
+    @loop_call
     async def delete(self, group_id: str, id: str) -> asyncio.Future[None]:
+        await self._flush_item(group_id, id)
         return await self.rpc.send(f'streams.{self.stream_name}.delete', {'groupId': group_id, 'id': id})
 
+    @loop_call
     async def getGroup(self, group_id: str) -> asyncio.Future[None]:
+        await self.flush()
         return await self.rpc.send(f'streams.{self.stream_name}.getGroup', {'groupId': group_id})
 
+    @loop_call
     async def get_group(self, group_id: str) -> asyncio.Future[None]:
         return await self.getGroup(group_id)
     
+    @loop_call
     async def send(self, channel: Dict, event: Dict) -> asyncio.Future[None]:
+        # Clients receive the items before the events sent after them
+        await self.flush()
         return await self.rpc.send(f'streams.{self.stream_name}.send', {'channel': channel, 'event': event})
 
-    # Add wrappers to handle non-awaited coroutines
-    def __getattribute__(self, name):
-        attr = super().__getattribute__(name)
-        if name in ('get', 'set', 'delete', 'getGroup') and asyncio.iscoroutinefunction(attr):
-            @functools.wraps(attr)
-            def wrapper(*args, **kwargs):
-                coro = attr(*args, **kwargs)
-                # Check if this is being awaited
-                frame = sys._getframe(1)
-                if frame.f_code.co_name != '__await__':
-                    # Not being awaited, schedule in background
-                    # But we need to make sure this task completes before the handler returns
-                    # So we'll return the task for the caller to await if needed
-                    task = asyncio.create_task(coro)
-                    # Add error handling for the background task
-                    def handle_exception(t):
-                        if t.done() and not t.cancelled() and t.exception():
-                            print(f"Unhandled exception in background task: {t.exception()}", file=sys.stderr)
-                    task.add_done_callback(handle_exception)
-                    return task
-                # Being awaited, return coroutine as normal
-                return coro
-            return wrapper
-        return attr
+    def set_nowait(self, group_id: str, id: str, data: Any) -> None:
+        """Set an item without waiting for Node.js, the update lands before the invocation is closed"""
+        self._background.start(self.set, group_id, id, data)
+
+    def append_nowait(self, group_id: str, id: str, field: str, value: Any) -> None:
+        """Append to a field of an item without waiting for Node.js, the update lands before the invocation is closed"""
+        self._background.start(self.append, group_id, id, field, value)
+
+    def patch_nowait(self, group_id: str, id: str, patch: Dict[str, Any]) -> None:
+        """Patch an item without waiting for Node.js, the update lands before the invocation is closed"""
+        self._background.start(self.patch, group_id, id, patch)
+
+    def delete_nowait(self, group_id: str, id: str) -> None:
+        """Delete an item without waiting for Node.js, the delete lands before the invocation is closed"""
+        self._background.start(self.delete, group_id, id)
+
+    def send_nowait(self, channel: Dict, event: Dict) -> None:
+        """Send an event without waiting for Node.js, it lands before the invocation is closed"""
+        self._background.start(self.send, channel, event)
@@ -0,0 +1,58 @@
+import base64
+import dataclasses
+import datetime
+import decimal
+import enum
+import operator
+import uuid
+from typing import Any, Callable, Dict
+
+Encoder = Callable[[Any], Any]
+
+# Resolved once per type, the codec calls `serialize_for_json` for every value JSON has no type for
+_encoders: Dict[type, Encoder] = {}
+
+def _encode_bytes(obj: Any) -> str:
+    return base64.b64encode(obj).decode('ascii')
+
+def _unsupported(obj: Any) -> Any:
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _dataclass_encoder(cls: type) -> Encoder:
+    # Only the top level is converted, nested values come back through the codec, unlike dataclasses.asdict
+    names = tuple(field.name for field in dataclasses.fields(cls))
+    return lambda obj: {name: getattr(obj, name) for name in names}
+
+def _resolve_encoder(cls: type) -> Encoder:
+    if callable(getattr(cls, 'model_dump', None)):
+        # pydantic v2
+        return lambda obj: obj.model_dump(mode='json')
+    if callable(getattr(cls, 'dict', None)) and hasattr(cls, '__fields__'):
+        # pydantic v1
+        return lambda obj: obj.dict()
+    if dataclasses.is_dataclass(cls):
+        return _dataclass_encoder(cls)
+    if issubclass(cls, enum.Enum):
+        return lambda obj: obj.value
+    if issubclass(cls, (datetime.date, datetime.time)):
+        return lambda obj: obj.isoformat()
+    if issubclass(cls, datetime.timedelta):
+        return lambda obj: obj.total_seconds()
+    if issubclass(cls, (decimal.Decimal, uuid.UUID)):
+        # Decimal is kept exact, as pydantic does in JSON mode
+        return str
+    if issubclass(cls, (bytes, bytearray, memoryview)):
+        return _encode_bytes
+    if issubclass(cls, (set, frozenset)):
+        return list
+    if cls.__dictoffset__:
+        return operator.attrgetter('__dict__')
+    return _unsupported
+
+def serialize_for_json(obj: Any) -> Any:
+    """Convert Python objects to JSON-serializable types, used as the `default` of the codec"""
+    cls = type(obj)
+    encoder = _encoders.get(cls)
+    if encoder is None:
+        encoder = _encoders[cls] = _resolve_encoder(cls)
+    return encoder(obj)
@@ -0,0 +1,302 @@
+import gc
+import importlib
+import json
+import os
+import selectors
+import signal
+import socket
+import sys
+import traceback
+from typing import Any, Callable, Dict, List, Optional
+from motia_codec import codec
+from motia_ipc_communication import READ_CHUNK_SIZE, LineBuffer
+
+InvocationRunner = Callable[[Dict[str, Any]], None]
+
+def preload_modules(names: List[str]) -> None:
+    """Import modules once so forked children share them copy-on-write"""
+    for name in names:
+        try:
+            importlib.import_module(name)
+        except Exception as e:
+            print(f"WARNING: Could not preload module {name}: {e}", file=sys.stderr)
+
+# Output queued for Node.js past which the zygote stops reading from the children until Node.js catches up
+NODE_HIGH_WATER = 4 * 1024 * 1024
+
+# Seconds between two checks of children that closed their socket but have not exited yet
+REAP_INTERVAL = 0.05
+
+def _is_close_request(line: bytes) -> bool:
+    if b'"close"' not in line:
+        return False
+    try:
+        return codec.decode(line).get('method') == 'close'
+    except json.JSONDecodeError:
+        return False
+
+def _exit_code(pid: int, options: int) -> Optional[int]:
+    """Reap a child, None when it is still running"""
+    try:
+        reaped, status = os.waitpid(pid, options)
+    except ChildProcessError:
+        return -1
+    return os.waitstatus_to_exitcode(status) if reaped else None
+
+class _Child:
+    def __init__(self, pid: int, sock: socket.socket, invocation_id: str):
+        self.pid = pid
+        self.sock = sock
+        self.invocation_id = invocation_id
+        self.lines = LineBuffer()
+        # Responses of Node.js the child has not read yet
+        self.output = bytearray()
+        self.closed = False
+        self.connected = True
+
+class Zygote:
+    """Forks a child per invocation and relays its messages to and from Node.js.
+
+    The zygote is the only reader and writer of the Node.js channel: children talk to
+    it over a private socket pair, requests are forwarded as complete lines and
+    responses are routed back by invocation id. Every descriptor is non-blocking and
+    has its own output buffer, so a slow reader never stops the relay of the others.
+    """
+
+    def __init__(self, node_fd: int, run_invocation: InvocationRunner):
+        self.node_fd = node_fd
+        self.run_invocation = run_invocation
+        self.selector = selectors.DefaultSelector()
+        self.children: Dict[str, _Child] = {}
+        self.lines = LineBuffer()
+        self.node_output = bytearray()
+        self.paused = False
+        # Children that closed their socket, they are reaped once they exit
+        self.exiting: List[_Child] = []
+
+    def serve(self) -> None:
+        """Relay messages until the Node.js channel closes"""
+        # Keep preloaded objects out of the collector so children don't touch their pages
+        gc.freeze()
+        os.set_blocking(self.node_fd, False)
+        self.selector.register(self.node_fd, selectors.EVENT_READ, None)
+
+        while True:
+            for key, events in self.selector.select(REAP_INTERVAL if self.exiting else None):
+                if key.data is None:
+                    if events & selectors.EVENT_WRITE and not self._flush_node():
+                        self._shutdown()
+                        return
+                    if events & selectors.EVENT_READ and not self._read_node():
+                        self._shutdown()
+                        return
+                else:
+                    child = key.data
+                    if events & selectors.EVENT_WRITE:
+                        self._flush_child(child)
+                    if events & selectors.EVENT_READ and child.connected:
+                        self._read_child(child)
+
+            if self.exiting:
+                self._reap_exited()
+
+    def _read_node(self) -> bool:
+        try:
+            data = os.read(self.node_fd, READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+        if not data:
+            return False
+
+        for line in self.lines.feed(data):
+            if not line.strip():
+                continue
+            try:
+                msg = codec.decode(line)
+            except json.JSONDecodeError as e:
+                print(f"WARNING: Failed to parse JSON: {e}", file=sys.stderr)
+                continue
+
+            msg_type = msg.get('type')
+            if msg_type == 'invoke':
+                self._fork(msg)
+            elif msg_type == 'rpc_response':
+                child = self.children.get(msg.get('invocationId'))
+                if child is not None:
+                    self._send_child(child, line + b'\n')
+
+        return True
+
+    def _send_node(self, data: bytes) -> None:
+        if not self.node_output:
+            try:
+                written = os.write(self.node_fd, data)
+            except BlockingIOError:
+                written = 0
+            except OSError:
+                # Node.js is gone, reading its channel reports it
+                return
+            if written == len(data):
+                return
+            self.selector.modify(self.node_fd, selectors.EVENT_READ | selectors.EVENT_WRITE, None)
+            data = data[written:]
+
+        self.node_output += data
+        if len(self.node_output) > NODE_HIGH_WATER and not self.paused:
+            self._pause_children(True)
+
+    def _flush_node(self) -> bool:
+        try:
+            written = os.write(self.node_fd, self.node_output)
+        except BlockingIOError:
+            return True
+        except OSError:
+            return False
+
+        del self.node_output[:written]
+        if not self.node_output:
+            self.selector.modify(self.node_fd, selectors.EVENT_READ, None)
+        if self.paused and len(self.node_output) <= NODE_HIGH_WATER // 2:
+            self._pause_children(False)
+        return True
+
+    def _pause_children(self, paused: bool) -> None:
+        """Stop or resume reading the requests of the children while Node.js is behind"""
+        self.paused = paused
+        for child in self.children.values():
+            self._update_events(child)
+
+    def _update_events(self, child: _Child) -> None:
+        events = (0 if self.paused else selectors.EVENT_READ) | (selectors.EVENT_WRITE if child.output else 0)
+        registered = child.sock in self.selector.get_map()
+
+        if events and registered:
+            self.selector.modify(child.sock, events, child)
+        elif events:
+            self.selector.register(child.sock, events, child)
+        elif registered:
+            self.selector.unregister(child.sock)
+
+    def _send_child(self, child: _Child, data: bytes) -> None:
+        if not child.output:
+            try:
+                sent = child.sock.send(data)
+            except BlockingIOError:
+                sent = 0
+            except OSError:
+                # The child exited, it will be reaped once its socket reports EOF
+                return
+            if sent == len(data):
+                return
+            data = data[sent:]
+
+        child.output += data
+        self._update_events(child)
+
+    def _flush_child(self, child: _Child) -> None:
+        try:
+            sent = child.sock.send(child.output)
+        except BlockingIOError:
+            return
+        except OSError:
+            sent = len(child.output)
+
+        del child.output[:sent]
+        if not child.output:
+            self._update_events(child)
+
+    def _read_child(self, child: _Child) -> None:
+        try:
+            data = child.sock.recv(READ_CHUNK_SIZE)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+
+        if not data:
+            self._disconnect(child)
+            return
+
+        lines = child.lines.feed(data)
+
+        if lines:
+            child.closed = child.closed or any(_is_close_request(line) for line in lines)
+            self._send_node(b'\n'.join(lines) + b'\n')
+
+    def _disconnect(self, child: _Child) -> None:
+        child.connected = False
+        if child.sock in self.selector.get_map():
+            self.selector.unregister(child.sock)
+        child.sock.close()
+        child.output.clear()
+        self.children.pop(child.invocation_id, None)
+        self.exiting.append(child)
+        self._reap_exited()
+
+    def _reap_exited(self) -> None:
+        """Reap the children that exited without waiting for the ones still running"""
+        running = []
+        for child in self.exiting:
+            code = _exit_code(child.pid, os.WNOHANG)
+            if code is None:
+                running.append(child)
+            elif not child.closed:
+                # The child died before reporting back, close the invocation on its behalf
+                request = {
+                    'type': 'rpc_request',
+                    'method': 'close',
+                    'invocationId': child.invocation_id,
+                    'args': {'message': f'Process exited with code {code}', 'code': code},
+                }
+                self._send_node(codec.encode(request))
+        self.exiting = running
+
+    def _fork(self, msg: Dict[str, Any]) -> None:
+        parent_sock, child_sock = socket.socketpair()
+        pid = os.fork()
+
+        if pid == 0:
+            code = 0
+            try:
+                parent_sock.close()
+                self.selector.close()
+                os.close(self.node_fd)
+                for child in self.children.values():
+                    child.sock.close()
+
+                os.environ['NODE_CHANNEL_FD'] = str(child_sock.detach())
+                self.run_invocation(msg)
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                os._exit(code)
+
+        child_sock.close()
+        parent_sock.setblocking(False)
+        child = _Child(pid, parent_sock, msg['id'])
+        self.children[child.invocation_id] = child
+        self._update_events(child)
+
+    def _shutdown(self) -> None:
+        children = [*self.children.values(), *self.exiting]
+        for child in children:
+            try:
+                os.kill(child.pid, signal.SIGKILL)
+            except OSError:
+                pass
+            if child.connected:
+                child.sock.close()
+        for child in children:
+            _exit_code(child.pid, 0)
+        self.children.clear()
+        self.exiting.clear()
+
+def run_zygote(run_invocation: InvocationRunner, preload: Optional[List[str]] = None) -> None:
+    """Preload modules and fork a child running `run_invocation` for each invoke message"""
+    preload_modules(['motia_context', 'motia_rpc', *(preload or [])])
+    Zygote(int(os.environ["NODE_CHANNEL_FD"]), run_invocation).serve()
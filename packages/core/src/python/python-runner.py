@@ -1,15 +1,57 @@
 import sys
-import json
-import importlib.util
 import os
+import json
 import asyncio
+import concurrent.futures
+import inspect
+import mmap
 import traceback
-from typing import Callable, List, Dict
-from motia_rpc import RpcSender
+from types import FrameType
+from typing import Any, Callable, List, Dict, Optional, Set, Union
+from motia_blocking import STALL_THRESHOLD, LoopStallMonitor, run_blocking
+from motia_codec import codec
+from motia_event_loop import run_event_loop
+from motia_rpc import RpcSender, InvocationRpcSender
 from motia_context import Context
 from motia_middleware import compose_middleware
 from motia_rpc_stream_manager import RpcStreamManager
-from motia_dot_dict import DotDict
+from motia_dot_dict import DotDict, to_dot_dict
+from motia_module_cache import ModuleCache
+from motia_process_executor import run_in_process
+from motia_zygote import run_zygote
+
+# Step modules stay loaded between invocations of a long-lived runner
+module_cache = ModuleCache()
+
+# Prints runner diagnostics, such as the module cache counts, on stderr
+DEBUG = os.environ.get("MOTIA_PYTHON_DEBUG", "").lower() in ("1", "true")
+
+# Invocations a worker runs at the same time on its event loop, 1 runs them back to back
+WORKER_CONCURRENCY = max(1, int(os.environ.get("MOTIA_PYTHON_CONCURRENCY") or 1))
+
+# Frames of the runner and of the import, asyncio and thread pool machinery running the steps
+RUNNER_DIRS = tuple(os.path.dirname(os.path.abspath(path)) + os.sep for path in (__file__, asyncio.__file__, concurrent.futures.__file__))
+
+def is_runner_frame(frame: traceback.FrameSummary) -> bool:
+    return frame.filename.startswith('<frozen importlib') or os.path.abspath(frame.filename).startswith(RUNNER_DIRS)
+
+def format_step_stack(error: BaseException) -> List[str]:
+    """Format the stack of an error raised by a step, leaving out the frames of the runner"""
+    frames = traceback.extract_tb(error.__traceback__)
+    return traceback.format_list([frame for frame in frames if not is_runner_frame(frame)])
+
+def locate_step(frame: FrameType) -> Optional[str]:
+    """Return the step file an invocation running in the given stack executes"""
+    while frame is not None:
+        if frame.f_code is run_python_module.__code__:
+            return frame.f_locals.get("file_path")
+        frame = frame.f_back
+    return None
+
+def monitor_loop() -> None:
+    """Report steps blocking the running event loop"""
+    if STALL_THRESHOLD > 0:
+        LoopStallMonitor(STALL_THRESHOLD, locate_step).start(asyncio.get_running_loop())
 
 def parse_args(arg: str) -> Dict:
     """Parse command line arguments into HandlerArgs"""
@@ -19,23 +61,42 @@ def parse_args(arg: str) -> Dict:
         print('Error parsing args:', arg)
         return arg
 
-async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
-    """Execute a Python module with the given arguments"""
+def load_args(msg: Dict[str, Any]) -> Dict:
+    """Return the invocation args of a message, mapping them from the file Node.js wrote when they were large"""
+    args_file = msg.get("argsFile")
+    if args_file is None:
+        return msg.get("args") or {}
+
+    with open(args_file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            return codec.decode(view)
+        finally:
+            view.release()
+
+async def receive_input(rpc: RpcSender) -> Optional[Dict]:
+    """Wait for the input message Node.js sends once the runner is spawned"""
+    received: asyncio.Future = asyncio.get_running_loop().create_future()
+    rpc.on_message("input", lambda msg: received.done() or received.set_result(msg))
+
+    closed = asyncio.ensure_future(rpc.wait_closed())
+    await asyncio.wait([received, closed], return_when=asyncio.FIRST_COMPLETED)
+    closed.cancel()
+
+    return load_args(received.result()) if received.done() else None
+
+async def run_python_module(
+    file_path: str,
+    rpc: Union[RpcSender, InvocationRpcSender],
+    args: Dict,
+    process_pool: bool = False,
+) -> None:
+    """Execute a Python module with the given arguments, `process_pool` allows steps to use the process executor"""
+    context: Optional[Context] = None
     try:
-        module_dir = os.path.dirname(os.path.abspath(file_path))
-        flows_dir = os.path.dirname(module_dir)
-        
-        for path in [module_dir, flows_dir]:
-            if path not in sys.path:
-                sys.path.insert(0, path)
-
-        spec = importlib.util.spec_from_file_location("dynamic_module", file_path)
-        if spec is None or spec.loader is None:
-            raise ImportError(f"Could not load module from {file_path}")
-            
-        module = importlib.util.module_from_spec(spec)
-        module.__package__ = os.path.basename(module_dir)
-        spec.loader.exec_module(module)
+        module = module_cache.load(file_path)
+        if DEBUG:
+            print(f"DEBUG: Step module cache {module_cache.stats()}", file=sys.stderr)
 
         if not hasattr(module, "handler"):
             raise AttributeError(f"Function 'handler' not found in module {file_path}")
@@ -45,6 +106,9 @@ async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
         trace_id = args.get("traceId")
         flows = args.get("flows") or []
         data = args.get("data")
+        if isinstance(data, dict):
+            # Gives handlers attribute access such as `req.body.name`, converted once so nested dicts are never swapped
+            data = to_dot_dict(data)
         context_in_first_arg = args.get("contextInFirstArg")
         streams_config = args.get("streams") or []
 
@@ -58,51 +122,126 @@ async def run_python_module(file_path: str, rpc: RpcSender, args: Dict) -> None:
         middlewares: List[Callable] = config.get("middleware", [])
         composed_middleware = compose_middleware(*middlewares)
         
+        handler_args = (context,) if context_in_first_arg else (data, context)
+
         async def handler_fn():
-            if context_in_first_arg:
-                return await module.handler(context)
-            else:
-                return await module.handler(data, context)
+            if process_pool and config.get("executor") == "process":
+                # CPU bound handlers run in a pool process, their context calls are sent through this invocation
+                stream_names = [item.get("name") for item in streams_config]
+                return await run_in_process(file_path, rpc, data, trace_id, flows, context_in_first_arg, stream_names)
+            if inspect.iscoroutinefunction(module.handler):
+                return await module.handler(*handler_args)
+            # A plain `def handler` runs in the thread pool so it can't block the other invocations and the IPC reader
+            return await run_blocking(module.handler, *handler_args)
 
         result = await composed_middleware(data, context, handler_fn)
 
+        # Buffered state writes and coalesced stream updates must reach Node.js before the invocation is closed
+        await context.state.flush()
+        for stream in streams.values():
+            await stream.flush()
+
         if result:
             await rpc.send('result', result)
 
+        context.logger.flush(final=True)
         rpc.send_no_wait("close", None)
-        rpc.close()
         
     except Exception as error:
-        stack_list = traceback.format_exception(type(error), error, error.__traceback__)
-
-        # We're removing the first two and last item
-        # 0: Traceback (most recent call last):
-        # 1: File "python-runner.py", line 82, in run_python_module
-        # 2: File "python-runner.py", line 69, in run_python_module
-        # -1: Exception: message
-        stack_list = stack_list[3:-1]
+        stack_list = format_step_stack(error)
+
+        if context is not None:
+            # Writes made before the failure were applied right away before the cache existed, keep doing so
+            try:
+                await context.state.flush()
+                for stream in context.streams.values():
+                    await stream.flush()
+            except Exception as flush_error:
+                print(f"ERROR: Failed to flush state: {flush_error}", file=sys.stderr)
+            context.logger.flush(final=True)
 
         rpc.send_no_wait("close", {
             "message": str(error),
             "stack": "\n".join(stack_list)
         })
-        rpc.close()
+
+async def run_worker(rpc: RpcSender, concurrency: int = WORKER_CONCURRENCY) -> None:
+    """Execute invoke messages sent by Node.js, up to `concurrency` at a time, until the channel closes"""
+    invocations: asyncio.Queue = asyncio.Queue()
+    rpc.on_message("invoke", invocations.put_nowait)
+
+    monitor_loop()
+    await rpc.init()
+    closed = asyncio.ensure_future(rpc.wait_closed())
+    slots = asyncio.Semaphore(concurrency)
+    running: Set[asyncio.Task] = set()
+
+    def on_done(task: asyncio.Task) -> None:
+        running.discard(task)
+        slots.release()
+
+    async def until_closed(awaitable) -> Optional[asyncio.Future]:
+        """Wait for `awaitable` unless the channel closes first"""
+        future = asyncio.ensure_future(awaitable)
+        await asyncio.wait([future, closed], return_when=asyncio.FIRST_COMPLETED)
+
+        if not future.done():
+            future.cancel()
+            return None
+        return future
+
+    while await until_closed(slots.acquire()) is not None:
+        next_invocation = await until_closed(invocations.get())
+        if next_invocation is None:
+            break
+
+        msg: Dict[str, Any] = next_invocation.result()
+
+        # Every invocation has its own context and sender, responses are routed by request id
+        invocation_rpc = rpc.for_invocation(msg["id"])
+        task = asyncio.ensure_future(run_python_module(msg["filePath"], invocation_rpc, load_args(msg), process_pool=True))
+        running.add(task)
+        task.add_done_callback(on_done)
+
+    # Node.js is gone, nothing would receive the results of the invocations still running
+    for task in running:
+        task.cancel()
+    await asyncio.gather(*running, return_exceptions=True)
+
+    rpc.close()
+
+async def run_once(file_path: str, rpc: RpcSender, args: Optional[Dict], invocation_id: Optional[str] = None) -> None:
+    """Execute a single invocation and close the channel, args are received from Node.js when not given"""
+    monitor_loop()
+    await rpc.init()
+    if args is None:
+        args = await receive_input(rpc)
+
+    if args is not None:
+        await run_python_module(file_path, rpc.for_invocation(invocation_id) if invocation_id else rpc, args)
+    rpc.close()
+
+def run_forked_invocation(msg: Dict[str, Any]) -> None:
+    """Entry point of a child forked by the zygote"""
+    run_event_loop(run_once(msg["filePath"], RpcSender(), load_args(msg), msg["id"]))
 
 if __name__ == "__main__":
     if len(sys.argv) < 2:
-        print("Usage: python pythonRunner.py <file-path> <arg>", file=sys.stderr)
+        print("Usage: python pythonRunner.py <file-path> [<arg>] | --worker | --zygote", file=sys.stderr)
         sys.exit(1)
 
-    file_path = sys.argv[1]
-    arg = sys.argv[2] if len(sys.argv) > 2 else None
+    mode = sys.argv[1]
+    if mode == "--zygote" and hasattr(os, "fork") and "NODE_CHANNEL_FD" in os.environ:
+        preload = [name.strip() for name in os.environ.get("MOTIA_PYTHON_PRELOAD", "").split(",") if name.strip()]
+        run_zygote(run_forked_invocation, preload)
+        sys.exit(0)
 
     rpc = RpcSender()
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
-
-    args = parse_args(arg) if arg else None
-    tasks = asyncio.gather(rpc.init(), run_python_module(file_path, rpc, args))
-    loop.run_until_complete(tasks)
+
+    if mode in ("--worker", "--zygote"):
+        run_event_loop(run_worker(rpc))
+    else:
+        file_path = sys.argv[1]
+        arg = sys.argv[2] if len(sys.argv) > 2 else None
+        args = parse_args(arg) if arg else None
+        run_event_loop(run_once(file_path, rpc, args))
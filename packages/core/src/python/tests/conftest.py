@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The runner modules import each other by name, like python-runner.py does from this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
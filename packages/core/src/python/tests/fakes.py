@@ -0,0 +1,66 @@
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+class FakeRpc:
+    """RpcSender recording the requests of an invocation, `on_send` can delay or fail them"""
+
+    def __init__(self, on_send: Optional[Callable[[str, Any], Awaitable[Any]]] = None):
+        self.requests: List[Tuple[str, Any]] = []
+        self.on_send = on_send
+
+    def send_no_wait(self, method: str, args: Any) -> None:
+        self.requests.append((method, args))
+
+    async def send(self, method: str, args: Any) -> Any:
+        self.requests.append((method, args))
+        if self.on_send is not None:
+            return await self.on_send(method, args)
+        await asyncio.sleep(0)
+        return None
+
+    def methods(self) -> List[str]:
+        return [method for method, _ in self.requests]
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python-runner.py')
+
+class FakeNode:
+    """Node.js end of the channel of a python-runner.py process, the test answers its requests"""
+
+    def __init__(self, *args: str, env: Optional[Dict[str, str]] = None, stderr: Optional[int] = None):
+        self.sock, channel = socket.socketpair()
+        self.process = subprocess.Popen(
+            [sys.executable, RUNNER_PATH, *args],
+            env={**os.environ, **(env or {}), 'NODE_CHANNEL_FD': str(channel.fileno())},
+            pass_fds=[channel.fileno()],
+            stderr=stderr,
+        )
+        channel.close()
+        self.sock.settimeout(10)
+        self.file = self.sock.makefile('rb')
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self.sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+    def receive(self) -> Dict[str, Any]:
+        """Return the next request of the runner, logs are skipped"""
+        while True:
+            line = self.file.readline()
+            if not line:
+                raise EOFError('The runner closed the channel')
+            message = json.loads(line)
+            if message.get('method') != 'log.batch':
+                return message
+
+    def respond(self, request: Dict[str, Any], result: Any = None) -> None:
+        self.send({'type': 'rpc_response', 'id': request['id'], 'invocationId': request.get('invocationId'), 'result': result})
+
+    def close(self) -> int:
+        """Close the channel like Node.js does when it stops, and return the exit code of the runner"""
+        self.file.close()
+        self.sock.close()
+        return self.process.wait(10)
@@ -0,0 +1,54 @@
+import asyncio
+import subprocess
+import threading
+
+import pytest
+
+import motia_blocking
+from fakes import FakeNode, FakeRpc
+from motia_blocking import run_blocking
+from motia_rpc_state_manager import RpcStateManager
+
+@pytest.fixture
+def executor(monkeypatch):
+    """A thread pool of the test, shut down so the tests forking the process don't inherit its threads"""
+    monkeypatch.setattr(motia_blocking, '_executor', None)
+    yield
+    motia_blocking.get_executor().shutdown()
+
+def test_sync_code_runs_off_the_loop_and_gets_call_results_directly(executor):
+    def handler(state: RpcStateManager) -> str:
+        # A blocking call here would not hold up the loop serving the request
+        assert threading.current_thread().name.startswith('motia-blocking')
+        return state.get('trace', 'a')
+
+    async def main():
+        async def on_send(method, args):
+            return 'value'
+
+        state = RpcStateManager(FakeRpc(on_send))
+        assert await run_blocking(handler, state) == 'value'
+
+    asyncio.run(main())
+
+def test_reports_the_step_blocking_the_event_loop(tmp_path):
+    step = tmp_path / 'steps' / 'blocking_step.py'
+    step.parent.mkdir()
+    step.write_text(
+        "import time\n\n"
+        "config = {'name': 'Blocking'}\n\n"
+        "async def handler(data, context):\n"
+        "    time.sleep(0.3)\n"
+        "    return {'status': 200}\n"
+    )
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_STALL_WARNING_MS': '100'}, stderr=subprocess.PIPE)
+
+    node.send({'type': 'invoke', 'id': 'a', 'filePath': str(step), 'args': {}})
+    result = node.receive()
+    node.respond(result)
+    assert node.receive()['method'] == 'close'
+    assert node.close() == 0
+
+    err = node.process.stderr.read().decode('utf-8')
+    assert f'WARNING: {step} blocked the event loop for at least' in err
+    assert f'at {step}:6' in err
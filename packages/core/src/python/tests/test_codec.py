@@ -0,0 +1,33 @@
+import sys
+
+import pytest
+
+from motia_codec import JsonCodec, OrjsonCodec, create_codec
+from motia_serializer import serialize_for_json
+
+def test_encodes_one_line_per_message():
+    codec = JsonCodec()
+
+    assert codec.encode({'type': 'log'}) == b'{"type": "log"}\n'
+    assert codec.decode(memoryview(b'{"type": "log"}')) == {'type': 'log'}
+
+def test_orjson_falls_back_to_json_for_values_it_does_not_encode():
+    pytest.importorskip('orjson')
+    codec = OrjsonCodec()
+    message = {'id': 2 ** 70, 'tags': {'a'}}
+
+    assert codec.encode({'type': 'log'}) == b'{"type":"log"}\n'
+    assert codec.encode(message, default=serialize_for_json) == JsonCodec().encode(message, default=serialize_for_json)
+    assert codec.decode(codec.encode(message, default=serialize_for_json)) == {'id': 2 ** 70, 'tags': ['a']}
+
+def test_uses_json_when_orjson_is_not_installed(monkeypatch, capsys):
+    monkeypatch.setitem(sys.modules, 'orjson', None)
+
+    assert isinstance(create_codec('auto'), JsonCodec)
+    assert capsys.readouterr().err == ''
+
+    assert isinstance(create_codec('orjson'), JsonCodec)
+    assert 'WARNING: orjson is not installed, falling back to json' in capsys.readouterr().err
+
+def test_uses_the_codec_it_is_asked_for():
+    assert create_codec('json').name == 'json'
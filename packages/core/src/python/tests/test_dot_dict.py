@@ -0,0 +1,48 @@
+import json
+import pickle
+
+import pytest
+
+from motia_dot_dict import DotDict, to_dot_dict
+
+def test_writes_to_nested_dicts_reach_the_parent():
+    data = to_dot_dict({'body': {'pet': {'name': 'Rex'}}})
+
+    data.body.pet.name = 'Max'
+    data.body.owner = 'Ann'
+
+    assert data == {'body': {'pet': {'name': 'Max'}, 'owner': 'Ann'}}
+    assert data.body is data['body']
+
+def test_references_taken_before_attribute_access_see_the_writes():
+    data = to_dot_dict({'a': {'b': 1}})
+    inner = data['a']
+
+    data.a.b = 2
+    inner['c'] = 3
+
+    assert inner is data.a
+    assert data == {'a': {'b': 2, 'c': 3}}
+
+def test_converts_the_dicts_in_lists():
+    data = to_dot_dict({'pets': [{'name': 'a'}, [{'name': 'b'}], 1]})
+
+    assert data.pets[0].name == 'a'
+    assert data.pets[1][0].name == 'b'
+
+def test_stays_a_dict_for_serialization():
+    data = to_dot_dict({'body': {'tags': [{'a': 1}]}})
+
+    assert isinstance(data.body, dict)
+    assert json.loads(json.dumps(data)) == {'body': {'tags': [{'a': 1}]}}
+    assert pickle.loads(pickle.dumps(data)).body.tags[0].a == 1
+
+def test_missing_keys_raise_attribute_errors():
+    data = DotDict({'a': 1})
+
+    assert getattr(data, 'b', None) is None
+    with pytest.raises(AttributeError, match='No such attribute: b'):
+        del data.b
+
+    del data.a
+    assert data == {}
@@ -0,0 +1,35 @@
+import asyncio
+import sys
+
+import pytest
+
+from motia_event_loop import new_event_loop
+
+def test_uses_asyncio_by_default(monkeypatch):
+    monkeypatch.delenv('MOTIA_PYTHON_LOOP', raising=False)
+    loop = new_event_loop()
+    try:
+        assert type(loop) is type(asyncio.new_event_loop())
+    finally:
+        loop.close()
+
+def test_uses_uvloop_when_asked(monkeypatch):
+    uvloop = pytest.importorskip('uvloop')
+    monkeypatch.setenv('MOTIA_PYTHON_LOOP', 'uvloop')
+    loop = new_event_loop()
+    try:
+        assert isinstance(loop, uvloop.Loop)
+    finally:
+        loop.close()
+
+@pytest.mark.parametrize('name, warned', [('uvloop', True), ('auto', False)])
+def test_falls_back_to_asyncio_without_uvloop(monkeypatch, capsys, name, warned):
+    monkeypatch.setitem(sys.modules, 'uvloop', None)
+    loop = new_event_loop(name)
+    try:
+        assert isinstance(loop, asyncio.AbstractEventLoop)
+        assert loop.__class__.__module__.startswith('asyncio')
+    finally:
+        loop.close()
+
+    assert ('WARNING: uvloop is not installed' in capsys.readouterr().err) is warned
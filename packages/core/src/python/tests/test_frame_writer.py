@@ -0,0 +1,146 @@
+import asyncio
+import fcntl
+import os
+import select
+import threading
+from typing import List, Tuple
+
+import pytest
+
+import motia_frame_writer
+from motia_frame_writer import FrameWriter
+
+PIPE_SIZE = 4096
+
+@pytest.fixture
+def pipe():
+    if not hasattr(fcntl, 'F_SETPIPE_SZ'):
+        pytest.skip('the size of a pipe can only be set on Linux')
+    read_fd, write_fd = os.pipe()
+    # A small pipe fills up after a few frames
+    fcntl.fcntl(write_fd, fcntl.F_SETPIPE_SZ, PIPE_SIZE)
+    os.set_blocking(read_fd, False)
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+def _read_available(read_fd: int) -> bytes:
+    data = bytearray()
+    while True:
+        try:
+            chunk = os.read(read_fd, 65536)
+        except BlockingIOError:
+            return bytes(data)
+        if not chunk:
+            return bytes(data)
+        data += chunk
+
+def _read_blocking(read_fd: int, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        select.select([read_fd], [], [], 1)
+        data += _read_available(read_fd)
+    return bytes(data)
+
+def _frames(count: int, size: int) -> List[bytes]:
+    return [f'{index:08d}'.encode('ascii') + b'x' * (size - 9) + b'\n' for index in range(count)]
+
+def test_writes_the_frames_of_a_loop_iteration_at_once(pipe, monkeypatch):
+    read_fd, write_fd = pipe
+    writes: List[int] = []
+    write = os.write
+
+    def counting_write(fd: int, data) -> int:
+        writes.append(len(data))
+        return write(fd, data)
+
+    monkeypatch.setattr(motia_frame_writer.os, 'write', counting_write)
+
+    async def main():
+        writer = FrameWriter(write_fd)
+        for frame in _frames(10, 32):
+            writer.write(frame)
+
+        assert _read_available(read_fd) == b''
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+    assert writes == [320]
+    assert _read_available(read_fd) == b''.join(_frames(10, 32))
+
+def test_keeps_the_rest_of_a_partial_write_until_the_pipe_is_writable(pipe):
+    read_fd, write_fd = pipe
+    frames = _frames(64, 1024)
+
+    async def main() -> Tuple[bytes, bool]:
+        writer = FrameWriter(write_fd)
+        for frame in frames:
+            writer.write(frame)
+        await asyncio.sleep(0)
+
+        # The pipe took what it could, the rest waits for it to be writable
+        assert 0 < writer.size < len(frames) * 1024
+        assert writer.waiting_writable
+
+        received = bytearray()
+        while len(received) < len(frames) * 1024:
+            received += _read_available(read_fd)
+            await asyncio.sleep(0.001)
+        return bytes(received), writer.waiting_writable
+
+    received, waiting_writable = asyncio.run(main())
+
+    assert received == b''.join(frames)
+    assert not waiting_writable
+
+def test_drain_waits_until_the_pending_bytes_are_under_the_limit(pipe):
+    read_fd, write_fd = pipe
+
+    async def main():
+        writer = FrameWriter(write_fd, max_buffer_size=8192)
+        for frame in _frames(32, 1024):
+            writer.write(frame)
+        drained = asyncio.ensure_future(writer.drain())
+
+        for _ in range(10):
+            await asyncio.sleep(0)
+        assert not drained.done()
+
+        while not drained.done():
+            _read_available(read_fd)
+            await asyncio.sleep(0.001)
+        assert writer.size <= 8192
+
+    asyncio.run(main())
+
+def test_flush_sync_blocks_until_everything_is_written(pipe):
+    read_fd, write_fd = pipe
+    frames = _frames(16, 1024)
+    received = bytearray()
+    reading = threading.Thread(target=lambda: received.extend(_read_blocking(read_fd, len(frames) * 1024)))
+    reading.start()
+
+    writer = FrameWriter(write_fd)
+    # Without a running loop the frames are written right away
+    for frame in frames:
+        writer.write(frame)
+    reading.join(10)
+
+    assert writer.size == 0
+    assert bytes(received) == b''.join(frames)
+
+def test_writes_from_other_threads_go_through_the_loop(pipe):
+    read_fd, write_fd = pipe
+
+    async def main():
+        writer = FrameWriter(write_fd)
+        writer.write(b'first\n')
+        await asyncio.to_thread(writer.write, b'second\n')
+        writer.write(b'third\n')
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(main())
+
+    assert _read_available(read_fd) == b'first\nsecond\nthird\n'
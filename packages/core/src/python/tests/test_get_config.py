@@ -0,0 +1,34 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+GET_CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'get-config.py')
+
+def _run_batch(*files: str) -> List[Dict[str, Any]]:
+    node, channel = socket.socketpair()
+    process = subprocess.run(
+        [sys.executable, GET_CONFIG_PATH, '--batch', *files],
+        env={**os.environ, 'NODE_CHANNEL_FD': str(channel.fileno())},
+        pass_fds=[channel.fileno()],
+        timeout=10,
+    )
+    channel.close()
+    assert process.returncode == 0
+
+    with node, node.makefile('rb') as reader:
+        return [json.loads(line) for line in reader]
+
+def test_a_module_exiting_at_import_only_fails_its_own_file(tmp_path):
+    steps = tmp_path / 'steps'
+    steps.mkdir()
+    (steps / 'first_step.py').write_text("config = {'name': 'First'}\n")
+    (steps / 'exiting_step.py').write_text("import sys\nsys.exit(3)\n")
+    (steps / 'last_step.py').write_text("config = {'name': 'Last'}\n")
+
+    messages = _run_batch(str(steps / 'first_step.py'), str(steps / 'exiting_step.py'), str(steps / 'last_step.py'))
+
+    assert [message.get('config') for message in messages] == [{'name': 'First'}, None, {'name': 'Last'}]
+    assert messages[1] == {'filePath': str(steps / 'exiting_step.py'), 'error': 'SystemExit(3)'}
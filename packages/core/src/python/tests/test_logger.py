@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import motia_logger
+from fakes import FakeRpc
+from motia_logger import Logger
+
+def _entries(rpc: FakeRpc):
+    return [entry for method, frame in rpc.requests if method == 'log.batch' for entry in frame['entries']]
+
+def test_drops_the_levels_node_would_not_print(monkeypatch):
+    monkeypatch.setitem(motia_logger.ENABLED_LEVELS, 'debug', False)
+
+    async def main():
+        rpc = FakeRpc()
+        logger = Logger('trace', [], rpc)
+
+        logger.debug('hidden', {'a': 1})
+        logger.info('shown')
+        logger.flush(final=True)
+
+        assert [entry['msg'] for entry in _entries(rpc)] == ['shown']
+        assert rpc.requests[-1][1]['stats'] == {'sent': 1, 'dropped': 1}
+
+    asyncio.run(main())
+
+def test_sends_the_entries_in_batches(monkeypatch):
+    monkeypatch.setattr(motia_logger, 'LOG_BATCH_SIZE', 3)
+
+    async def main():
+        rpc = FakeRpc()
+        logger = Logger('trace', ['flow'], rpc)
+
+        for i in range(4):
+            logger.info('entry', {'i': i})
+        assert [len(frame['entries']) for _, frame in rpc.requests] == [3]
+
+        # The rest goes out once the batch interval is over
+        await asyncio.sleep(motia_logger.LOG_BATCH_INTERVAL * 2)
+        assert [len(frame['entries']) for _, frame in rpc.requests] == [3, 1]
+
+        entry = _entries(rpc)[3]
+        assert entry.pop('time') > 0
+        assert entry == {'level': 'info', 'traceId': 'trace', 'flows': ['flow'], 'msg': 'entry', 'i': 3}
+
+    asyncio.run(main())
+
+def test_batches_the_entries_logged_from_handler_threads():
+    async def main():
+        rpc = FakeRpc()
+        logger = Logger('trace', [], rpc)
+
+        thread = threading.Thread(target=logger.info, args=('from a thread',))
+        thread.start()
+        thread.join()
+        await asyncio.sleep(0)
+        logger.flush(final=True)
+
+        assert rpc.methods() == ['log.batch']
+        assert [entry['msg'] for entry in _entries(rpc)] == ['from a thread']
+
+    asyncio.run(main())
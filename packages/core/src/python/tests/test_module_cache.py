@@ -0,0 +1,52 @@
+import os
+import sys
+import time
+
+import pytest
+
+from motia_module_cache import ModuleCache
+
+def _write(path, content: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    # Make sure the change is seen even on file systems with a coarse mtime
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, time.time_ns() + 1_000_000_000))
+
+def test_reuses_a_step_until_a_local_module_it_imports_changes(tmp_path):
+    _write(tmp_path / 'steps' / 'cache_pricing.py', 'PRICE = 1\n')
+    _write(tmp_path / 'steps' / 'cache_step.py', 'import json\nfrom cache_pricing import PRICE\n')
+    step = str(tmp_path / 'steps' / 'cache_step.py')
+    cache = ModuleCache()
+
+    try:
+        assert cache.load(step).PRICE == 1
+        assert cache.load(step) is cache.load(step)
+        assert cache.stats() == {'hits': 2, 'misses': 1, 'size': 1}
+
+        _write(tmp_path / 'steps' / 'cache_pricing.py', 'PRICE = 2\n')
+
+        assert cache.load(step).PRICE == 2
+        assert cache.stats() == {'hits': 2, 'misses': 2, 'size': 1}
+    finally:
+        cache.clear()
+
+def test_tracks_the_local_modules_of_a_step_that_fails(tmp_path):
+    _write(tmp_path / 'steps' / 'failing_pricing.py', 'PRICE = 1\n')
+    _write(tmp_path / 'steps' / 'failing_step.py', 'from failing_pricing import PRICE\nraise ValueError(PRICE)\n')
+    step = str(tmp_path / 'steps' / 'failing_step.py')
+    cache = ModuleCache()
+
+    try:
+        with pytest.raises(ValueError, match='1'):
+            cache.load(step)
+
+        # The module imported before the failure is reloaded once it changes
+        _write(tmp_path / 'steps' / 'failing_pricing.py', 'PRICE = 2\n')
+        with pytest.raises(ValueError, match='2'):
+            cache.load(step)
+
+        cache.clear()
+        assert 'failing_pricing' not in sys.modules
+    finally:
+        cache.clear()
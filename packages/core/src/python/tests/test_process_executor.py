@@ -0,0 +1,70 @@
+import os
+
+from fakes import FakeNode
+
+STEP = '''
+import os
+
+config = {'name': 'Crunch', 'executor': 'process'}
+
+def handler(data, context):
+    value = context.state.get(context.trace_id, data['key'])
+    context.emit({'topic': 'crunched', 'data': {'pid': os.getpid()}})
+    if data['fail']:
+        raise ValueError('no')
+    return {'status': 200, 'body': {'value': value, 'pid': os.getpid()}}
+'''
+
+def _invoke(node: FakeNode, invocation_id: str, file_path: str, fail: bool = False) -> None:
+    args = {'data': {'key': invocation_id, 'fail': fail}, 'traceId': 'trace', 'flows': []}
+    node.send({'type': 'invoke', 'id': invocation_id, 'filePath': file_path, 'args': args})
+
+def _step(tmp_path) -> str:
+    step = tmp_path / 'steps' / 'crunch_step.py'
+    step.parent.mkdir()
+    step.write_text(STEP)
+    return str(step)
+
+def test_runs_the_handler_in_a_pool_process_with_its_context_calls_sent_by_the_runner(tmp_path):
+    step = _step(tmp_path)
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_PROCESSES': '1'})
+
+    pids = set()
+    for invocation_id in ['a', 'b']:
+        _invoke(node, invocation_id, step)
+
+        request = node.receive()
+        assert (request['method'], request['invocationId']) == ('state.get', invocation_id)
+        assert request['args'] == {'traceId': 'trace', 'key': invocation_id}
+        node.respond(request, invocation_id)
+
+        emit = node.receive()
+        assert (emit['method'], emit['invocationId']) == ('emit', invocation_id)
+        node.respond(emit)
+
+        result = node.receive()
+        assert (result['method'], result['invocationId']) == ('result', invocation_id)
+        assert result['args']['body']['value'] == invocation_id
+        assert result['args']['body']['pid'] == emit['args']['data']['pid']
+        pids.add(result['args']['body']['pid'])
+        node.respond(result)
+
+        assert node.receive()['method'] == 'close'
+
+    # The pool process is kept warm for the next invocation
+    assert len(pids) == 1
+    assert pids.isdisjoint({os.getpid(), node.process.pid})
+    assert node.close() == 0
+
+def test_closes_the_invocation_with_the_error_of_a_pool_process(tmp_path):
+    step = _step(tmp_path)
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_PROCESSES': '1'})
+
+    _invoke(node, 'a', step, fail=True)
+    node.respond(node.receive(), 'a')
+    node.respond(node.receive())
+
+    close = node.receive()
+    assert (close['method'], close['invocationId']) == ('close', 'a')
+    assert close['args']['message'] == 'no'
+    assert node.close() == 0
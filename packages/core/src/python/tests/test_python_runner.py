@@ -0,0 +1,44 @@
+import asyncio
+import importlib.util
+import os
+
+import pytest
+
+RUNNER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python-runner.py')
+
+@pytest.fixture(scope='module')
+def runner():
+    spec = importlib.util.spec_from_file_location('python_runner', RUNNER_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    yield module
+    module.module_cache.clear()
+
+def _raised(fn) -> BaseException:
+    try:
+        fn()
+    except Exception as error:
+        return error
+    raise AssertionError('nothing was raised')
+
+def test_leaves_the_runner_frames_out_of_the_stack_of_a_handler_error(runner, tmp_path):
+    step = tmp_path / 'steps' / 'handler_error_step.py'
+    step.parent.mkdir()
+    step.write_text('async def handler(data, context):\n    raise ValueError("no")\n')
+    module = runner.module_cache.load(str(step))
+
+    stack = runner.format_step_stack(_raised(lambda: asyncio.run(module.handler({}, None))))
+
+    assert len(stack) == 1
+    assert str(step) in stack[0]
+    assert 'raise ValueError("no")' in stack[0]
+
+def test_leaves_the_import_frames_out_of_the_stack_of_a_step_that_fails_to_load(runner, tmp_path):
+    step = tmp_path / 'steps' / 'load_error_step.py'
+    step.parent.mkdir()
+    step.write_text('raise ImportError("no")\n')
+
+    stack = runner.format_step_stack(_raised(lambda: runner.module_cache.load(str(step))))
+
+    assert len(stack) == 1
+    assert str(step) in stack[0]
@@ -0,0 +1,123 @@
+import asyncio
+from typing import Any, Dict, List
+
+from fakes import FakeNode, FakeRpc
+from motia_rpc_state_manager import RpcStateManager
+
+def _cached_state(rpc: FakeRpc) -> RpcStateManager:
+    state = RpcStateManager(rpc)
+    state.enable_cache()
+    return state
+
+def test_serves_repeated_reads_and_buffers_writes_until_the_flush():
+    async def main():
+        rpc = FakeRpc()
+        state = _cached_state(rpc)
+
+        await state.get('trace', 'a')
+        await state.get('trace', 'a')
+        await state.set('trace', 'a', 1)
+        await state.set('trace', 'a', 2)
+        await state.delete('trace', 'a')
+        await state.set('trace', 'b', 3)
+        assert await state.get('trace', 'b') == 3
+        assert rpc.methods() == ['state.get']
+
+        await state.flush()
+
+        assert rpc.requests[1:] == [
+            ('state.setMany', {'traceId': 'trace', 'values': {'b': 3}}),
+            ('state.deleteMany', {'traceId': 'trace', 'keys': ['a']}),
+        ]
+
+    asyncio.run(main())
+
+def test_sends_the_buffered_writes_before_reading_a_group():
+    async def main():
+        rpc = FakeRpc()
+        state = _cached_state(rpc)
+
+        await state.set('trace', 'a', 1)
+        await state.get_group('group')
+
+        assert rpc.methods() == ['state.setMany', 'state.getGroup']
+
+    asyncio.run(main())
+
+def test_flush_waits_for_the_writes_made_without_waiting():
+    async def main():
+        order: List[str] = []
+
+        async def on_send(method: str, args: Any) -> Any:
+            await asyncio.sleep(0.01)
+            order.append(method)
+
+        rpc = FakeRpc(on_send)
+        state = RpcStateManager(rpc)
+
+        state.set_nowait('trace', 'a', 1)
+        state.delete_nowait('trace', 'b')
+        await state.flush()
+        order.append('flushed')
+
+        assert order == ['state.set', 'state.delete', 'flushed']
+
+    asyncio.run(main())
+
+def test_clear_drops_the_buffered_writes_of_the_trace():
+    async def main():
+        rpc = FakeRpc()
+        state = _cached_state(rpc)
+
+        await state.set('trace', 'a', 1)
+        await state.set('other', 'a', 1)
+        await state.clear('trace')
+        await state.flush()
+
+        assert rpc.requests == [
+            ('state.clear', {'traceId': 'trace'}),
+            ('state.setMany', {'traceId': 'other', 'values': {'a': 1}}),
+        ]
+
+    asyncio.run(main())
+
+STEP = '''
+config = {'name': 'Cached'}
+
+async def handler(data, context):
+    await context.state.set(context.trace_id, 'a', 1)
+    await context.state.get(context.trace_id, 'b')
+    await context.state.delete(context.trace_id, 'b')
+    if data['fail']:
+        raise ValueError('no')
+    return {'status': 200}
+'''
+
+def _run_cached_step(tmp_path, fail: bool) -> List[Dict[str, Any]]:
+    """Run the step in a worker and return the requests of the invocation until it is closed"""
+    step = tmp_path / 'steps' / 'cached_step.py'
+    step.parent.mkdir()
+    step.write_text(STEP)
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_STATE_CACHE': '1'})
+    node.send({'type': 'invoke', 'id': 'a', 'filePath': str(step), 'args': {'traceId': 'trace', 'data': {'fail': fail}}})
+
+    requests = []
+    while not requests or requests[-1]['method'] != 'close':
+        requests.append(node.receive())
+        if 'id' in requests[-1]:
+            node.respond(requests[-1], 'b' if requests[-1]['method'] == 'state.get' else None)
+
+    assert node.close() == 0
+    return requests
+
+def test_flushes_the_state_cache_before_the_result_of_the_step(tmp_path):
+    requests = _run_cached_step(tmp_path, fail=False)
+
+    assert [request['method'] for request in requests] == ['state.get', 'state.setMany', 'state.deleteMany', 'result', 'close']
+    assert requests[1]['args'] == {'traceId': 'trace', 'values': {'a': 1}}
+
+def test_flushes_the_state_cache_before_closing_a_failed_step(tmp_path):
+    requests = _run_cached_step(tmp_path, fail=True)
+
+    assert [request['method'] for request in requests] == ['state.get', 'state.setMany', 'state.deleteMany', 'close']
+    assert requests[-1]['args']['message'] == 'no'
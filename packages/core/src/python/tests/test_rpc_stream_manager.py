@@ -0,0 +1,128 @@
+import asyncio
+import json
+import os
+from typing import Any, Dict, List
+
+import pytest
+
+from fakes import FakeRpc
+from motia_rpc_stream_manager import RpcStreamManager, _append_to_field, _apply_merge_patch
+
+def test_sends_each_update_right_away_without_a_window():
+    async def main():
+        rpc = FakeRpc()
+        stream = RpcStreamManager('messages', rpc)
+
+        await stream.set('group', 'a', {'text': ''})
+        await stream.append('group', 'a', 'text', 'hello')
+
+        assert rpc.methods() == ['streams.messages.set', 'streams.messages.append']
+
+    asyncio.run(main())
+
+def test_coalesces_the_updates_of_an_item_made_within_the_window():
+    async def main():
+        rpc = FakeRpc()
+        stream = RpcStreamManager('messages', rpc)
+        stream.coalesce(0.01)
+
+        await stream.set('group', 'a', {'text': ''})
+        for token in ['hel', 'lo']:
+            await stream.append('group', 'a', 'text', token)
+        await stream.patch('group', 'a', {'done': True})
+        await stream.flush()
+
+        assert rpc.requests == [
+            ('streams.messages.set', {'groupId': 'group', 'id': 'a', 'data': {'text': 'hello', 'done': True}}),
+        ]
+
+    asyncio.run(main())
+
+def test_timed_flushes_wait_for_the_flush_before_them():
+    async def main():
+        first_sent = asyncio.Event()
+        order: List[str] = []
+
+        async def on_send(method: str, args: Any) -> None:
+            if method.endswith('.set'):
+                # The first flush is still waiting for Node.js when the second one starts
+                await first_sent.wait()
+            order.append(method)
+
+        rpc = FakeRpc(on_send)
+        stream = RpcStreamManager('messages', rpc)
+        stream.coalesce(0.01)
+
+        await stream.set('group', 'a', {'text': ''})
+        await asyncio.sleep(0.03)
+        await stream.append('group', 'a', 'text', 'hello')
+        await asyncio.sleep(0.03)
+
+        assert rpc.methods() == ['streams.messages.set']
+
+        first_sent.set()
+        await stream.flush()
+
+        assert order == ['streams.messages.set', 'streams.messages.append']
+
+    asyncio.run(main())
+
+def test_flush_waits_for_a_timed_flush_being_sent():
+    async def main():
+        release = asyncio.Event()
+
+        async def on_send(method: str, args: Any) -> None:
+            await release.wait()
+
+        rpc = FakeRpc(on_send)
+        stream = RpcStreamManager('messages', rpc)
+        stream.coalesce(0.01)
+
+        await stream.set('group', 'a', {'text': ''})
+        await asyncio.sleep(0.03)
+
+        flush = asyncio.ensure_future(stream.flush())
+        await asyncio.sleep(0.01)
+        assert not flush.done()
+
+        release.set()
+        await flush
+
+    asyncio.run(main())
+
+def test_a_failed_flush_does_not_fail_the_next_one(capsys):
+    async def main():
+        async def on_send(method: str, args: Any) -> None:
+            if args['id'] == 'a':
+                raise RuntimeError('Node.js went away')
+
+        rpc = FakeRpc(on_send)
+        stream = RpcStreamManager('messages', rpc)
+        stream.coalesce(0.01)
+
+        await stream.set('group', 'a', {})
+        await asyncio.sleep(0.03)
+        await stream.set('group', 'b', {})
+        await stream.flush()
+
+        assert rpc.methods() == ['streams.messages.set', 'streams.messages.set']
+
+    asyncio.run(main())
+    assert 'Failed to flush stream messages: Node.js went away' in capsys.readouterr().err
+
+# The cases the TypeScript helpers of the server and of @motiadev/stream-client are tested against
+STREAM_PATCH_CASES = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), '..', '..', '__tests__', 'fixtures', 'stream-patch-cases.json',
+)
+
+def _stream_patch_cases(kind: str) -> List[Dict[str, Any]]:
+    with open(STREAM_PATCH_CASES) as f:
+        return json.load(f)[kind]
+
+@pytest.mark.parametrize('case', _stream_patch_cases('mergePatch'))
+def test_applies_merge_patches_like_the_stream_client(case):
+    assert _apply_merge_patch(case['target'], case['patch']) == case['expected']
+
+@pytest.mark.parametrize('case', _stream_patch_cases('append'))
+def test_appends_like_the_stream_client(case):
+    assert _append_to_field(case['item'], case['field'], case['value']) == case['expected']
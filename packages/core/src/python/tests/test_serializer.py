@@ -0,0 +1,85 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import List
+
+import pytest
+
+from motia_codec import JsonCodec
+from motia_serializer import serialize_for_json
+
+class Color(enum.Enum):
+    RED = 'red'
+
+@dataclasses.dataclass
+class Item:
+    name: str
+    color: Color
+    tags: List[str]
+
+class Plain:
+    def __init__(self):
+        self.value = 1
+
+class Slotted:
+    __slots__ = ('value',)
+
+def _encode(obj):
+    return json.loads(JsonCodec().encode(obj, default=serialize_for_json))
+
+@pytest.mark.parametrize('value, expected', [
+    (Color.RED, 'red'),
+    (datetime.datetime(2024, 1, 2, 3, 4, 5), '2024-01-02T03:04:05'),
+    (datetime.date(2024, 1, 2), '2024-01-02'),
+    (datetime.time(3, 4), '03:04:00'),
+    (datetime.timedelta(minutes=1, milliseconds=500), 60.5),
+    (decimal.Decimal('0.1'), '0.1'),
+    (uuid.UUID(int=1), '00000000-0000-0000-0000-000000000001'),
+    (b'\x00\xff', 'AP8='),
+    (bytearray(b'\x00\xff'), 'AP8='),
+    (frozenset(['a']), ['a']),
+    (Plain(), {'value': 1}),
+])
+def test_converts_the_values_json_has_no_type_for(value, expected):
+    assert _encode({'value': value}) == {'value': expected}
+
+def test_converts_sets():
+    assert sorted(_encode({1, 2, 3})) == [1, 2, 3]
+
+def test_converts_the_fields_of_a_dataclass_through_the_codec():
+    item = Item('pen', Color.RED, ['office'])
+
+    assert serialize_for_json(item) == {'name': 'pen', 'color': Color.RED, 'tags': ['office']}
+    assert _encode([item]) == [{'name': 'pen', 'color': 'red', 'tags': ['office']}]
+
+def test_dumps_pydantic_v2_models_in_json_mode():
+    pydantic = pytest.importorskip('pydantic')
+
+    class Order(pydantic.BaseModel):
+        id: uuid.UUID
+        total: decimal.Decimal
+        created_at: datetime.datetime
+
+    order = Order(id=uuid.UUID(int=1), total=decimal.Decimal('9.99'), created_at=datetime.datetime(2024, 1, 2))
+
+    assert _encode({'order': order}) == {
+        'order': {'id': '00000000-0000-0000-0000-000000000001', 'total': '9.99', 'created_at': '2024-01-02T00:00:00'},
+    }
+
+def test_dumps_pydantic_v1_models_through_the_codec():
+    pydantic_v1 = pytest.importorskip('pydantic.v1')
+
+    class Order(pydantic_v1.BaseModel):
+        color: Color
+        created_at: datetime.datetime
+
+    order = Order(color=Color.RED, created_at=datetime.datetime(2024, 1, 2))
+
+    assert _encode(order) == {'color': 'red', 'created_at': '2024-01-02T00:00:00'}
+
+def test_rejects_objects_without_a_json_form():
+    with pytest.raises(TypeError, match='Object of type Slotted is not JSON serializable'):
+        _encode(Slotted())
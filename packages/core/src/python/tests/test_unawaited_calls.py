@@ -0,0 +1,60 @@
+import asyncio
+
+from fakes import FakeRpc
+from motia_blocking import UnawaitedCallShim
+from motia_rpc_state_manager import RpcStateManager
+from motia_rpc_stream_manager import RpcStreamManager
+
+def test_unawaited_state_writes_are_sent_in_the_background(capsys):
+    UnawaitedCallShim._warned.clear()
+
+    async def main():
+        rpc = FakeRpc()
+        state = RpcStateManager(rpc)
+
+        state.set('trace', 'a', 1)
+        state.set('trace', 'b', 2)
+        await state.flush()
+
+        assert rpc.requests == [
+            ('state.set', {'traceId': 'trace', 'key': 'a', 'value': 1}),
+            ('state.set', {'traceId': 'trace', 'key': 'b', 'value': 2}),
+        ]
+
+    asyncio.run(main())
+
+    err = capsys.readouterr().err
+    assert err.count('RpcStateManager.set() was called without await') == 1
+    assert 'call set_nowait() instead' in err
+
+def test_unawaited_stream_writes_are_sent_in_the_background(capsys):
+    UnawaitedCallShim._warned.clear()
+
+    async def main():
+        rpc = FakeRpc()
+        stream = RpcStreamManager('messages', rpc)
+
+        stream.set('group', 'a', {'text': 'hello'})
+        await stream.flush()
+
+        assert rpc.methods() == ['streams.messages.set']
+
+    asyncio.run(main())
+    assert 'RpcStreamManager.set() was called without await' in capsys.readouterr().err
+
+def test_awaited_calls_and_tasks_are_not_reported(capsys):
+    UnawaitedCallShim._warned.clear()
+
+    async def main():
+        rpc = FakeRpc()
+        state = RpcStateManager(rpc)
+
+        await state.set('trace', 'a', 1)
+        await asyncio.gather(state.set('trace', 'b', 2), state.delete('trace', 'c'))
+        await asyncio.create_task(state.set('trace', 'd', 4))
+        await state.flush()
+
+        assert rpc.methods() == ['state.set', 'state.set', 'state.delete', 'state.set']
+
+    asyncio.run(main())
+    assert 'without await' not in capsys.readouterr().err
@@ -0,0 +1,83 @@
+from fakes import FakeNode
+
+STEP = '''
+config = {'name': 'Read'}
+
+async def handler(data, context):
+    value = await context.state.get(context.trace_id, data['key'])
+    return {'status': 200, 'body': value}
+'''
+
+def _invoke(node: FakeNode, invocation_id: str, file_path: str, key: str) -> None:
+    args = {'data': {'key': key}, 'traceId': f'trace-{invocation_id}', 'flows': []}
+    node.send({'type': 'invoke', 'id': invocation_id, 'filePath': file_path, 'args': args})
+
+def test_runs_the_invocations_it_receives_and_tags_their_requests(tmp_path):
+    step = tmp_path / 'steps' / 'read_step.py'
+    step.parent.mkdir()
+    step.write_text(STEP)
+    node = FakeNode('--worker')
+
+    _invoke(node, 'a', str(step), 'first')
+    _invoke(node, 'b', str(step), 'second')
+
+    for invocation_id, key in [('a', 'first'), ('b', 'second')]:
+        request = node.receive()
+        assert (request['method'], request['invocationId']) == ('state.get', invocation_id)
+        assert request['args'] == {'traceId': f'trace-{invocation_id}', 'key': key}
+        node.respond(request, {'value': key})
+
+        result = node.receive()
+        assert (result['method'], result['invocationId']) == ('result', invocation_id)
+        assert result['args'] == {'status': 200, 'body': {'data': {'value': key}}}
+        node.respond(result)
+
+        close = node.receive()
+        assert (close['method'], close['invocationId'], close['args']) == ('close', invocation_id, None)
+
+    assert node.close() == 0
+
+def test_closes_a_failing_invocation_and_keeps_serving(tmp_path):
+    failing = tmp_path / 'steps' / 'failing_step.py'
+    failing.parent.mkdir()
+    failing.write_text("config = {'name': 'Fail'}\n\nasync def handler(data, context):\n    raise ValueError('no')\n")
+    step = tmp_path / 'steps' / 'read_step.py'
+    step.write_text(STEP)
+    node = FakeNode('--worker')
+
+    _invoke(node, 'a', str(failing), 'first')
+    close = node.receive()
+    assert (close['method'], close['invocationId']) == ('close', 'a')
+    assert close['args']['message'] == 'no'
+    assert 'failing_step.py' in close['args']['stack']
+
+    _invoke(node, 'b', str(step), 'second')
+    request = node.receive()
+    assert request['invocationId'] == 'b'
+
+    # Node.js going away stops the worker even with an invocation waiting for a response
+    assert node.close() == 0
+
+def test_runs_up_to_the_configured_number_of_invocations_at_a_time(tmp_path):
+    step = tmp_path / 'steps' / 'read_step.py'
+    step.parent.mkdir()
+    step.write_text(STEP)
+    node = FakeNode('--worker', env={'MOTIA_PYTHON_CONCURRENCY': '2'})
+
+    for invocation_id in ['a', 'b', 'c']:
+        _invoke(node, invocation_id, str(step), invocation_id)
+
+    # The second invocation starts while the first one waits, the third one waits for a free slot
+    requests = {request['invocationId']: request for request in (node.receive(), node.receive())}
+    assert sorted(requests) == ['a', 'b']
+
+    node.respond(requests['b'], 'b')
+    result = node.receive()
+    assert (result['method'], result['invocationId']) == ('result', 'b')
+    node.respond(result)
+    assert node.receive()['method'] == 'close'
+
+    request = node.receive()
+    assert (request['method'], request['invocationId']) == ('state.get', 'c')
+
+    assert node.close() == 0
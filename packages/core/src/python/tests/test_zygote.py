@@ -0,0 +1,172 @@
+import json
+import os
+import socket
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+import motia_zygote
+from fakes import FakeNode
+from motia_zygote import Zygote
+
+def _channel() -> socket.socket:
+    return socket.socket(fileno=int(os.environ['NODE_CHANNEL_FD']))
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    sock.sendall((json.dumps(message) + '\n').encode('utf-8'))
+
+def _start(run_invocation: Callable[[Dict[str, Any]], None]) -> Tuple[socket.socket, int]:
+    """Fork a zygote serving the returned socket the way Node.js talks to it"""
+    node, zygote = socket.socketpair()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            node.close()
+            Zygote(zygote.detach(), run_invocation).serve()
+        finally:
+            os._exit(0)
+
+    zygote.close()
+    node.settimeout(10)
+    return node, pid
+
+def _stop(node: socket.socket, pid: int) -> None:
+    node.close()
+    _, status = os.waitpid(pid, 0)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+class _Reader:
+    def __init__(self, sock: socket.socket):
+        self.file = sock.makefile('rb')
+
+    def next(self) -> Dict[str, Any]:
+        return json.loads(self.file.readline())
+
+    def until_closed(self, invocation_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        closed: Dict[str, Dict[str, Any]] = {}
+        while len(closed) < len(invocation_ids):
+            message = self.next()
+            if message.get('method') == 'close':
+                closed[message['invocationId']] = message
+        return closed
+
+def test_relays_the_requests_and_responses_of_a_forked_invocation():
+    def run_invocation(msg: Dict[str, Any]) -> None:
+        sock = _channel()
+        _send(sock, {'type': 'rpc_request', 'id': '1', 'method': 'state.get', 'invocationId': msg['id'], 'args': {}})
+        response = json.loads(sock.makefile('rb').readline())
+        _send(sock, {'type': 'rpc_request', 'method': 'close', 'invocationId': msg['id'], 'args': response['result']})
+
+    node, pid = _start(run_invocation)
+    reader = _Reader(node)
+
+    _send(node, {'type': 'invoke', 'id': 'a'})
+    request = reader.next()
+    assert request['method'] == 'state.get'
+    assert request['invocationId'] == 'a'
+
+    _send(node, {'type': 'rpc_response', 'id': '1', 'invocationId': 'a', 'result': {'value': 2}})
+    assert reader.next() == {'type': 'rpc_request', 'method': 'close', 'invocationId': 'a', 'args': {'value': 2}}
+
+    # The socket stays open as long as a file reads from it
+    reader.file.close()
+    _stop(node, pid)
+
+def test_closes_the_invocation_of_a_child_that_exits_without_reporting_back():
+    def run_invocation(msg: Dict[str, Any]) -> None:
+        os._exit(3)
+
+    node, pid = _start(run_invocation)
+
+    _send(node, {'type': 'invoke', 'id': 'a'})
+    assert _Reader(node).next()['args'] == {'message': 'Process exited with code 3', 'code': 3}
+
+    _stop(node, pid)
+
+def test_keeps_relaying_while_node_does_not_read(tmp_path):
+    marker = tmp_path / 'marker'
+
+    def run_invocation(msg: Dict[str, Any]) -> None:
+        sock = _channel()
+        if msg['id'] == 'flood':
+            line = json.dumps({'type': 'log', 'message': 'x' * 1024}).encode('utf-8') + b'\n'
+            sock.sendall(line * 16 * 1024)
+            _send(sock, {'type': 'rpc_request', 'method': 'close', 'invocationId': 'flood', 'args': {}})
+        else:
+            marker.write_bytes(sock.makefile('rb').readline())
+
+    node, pid = _start(run_invocation)
+
+    _send(node, {'type': 'invoke', 'id': 'flood'})
+    time.sleep(0.2)
+    # The zygote can't write to Node.js anymore, it must still fork and answer the other children
+    _send(node, {'type': 'invoke', 'id': 'b'})
+    _send(node, {'type': 'rpc_response', 'id': '1', 'invocationId': 'b', 'result': 'ok'})
+
+    deadline = time.monotonic() + 10
+    while not marker.exists() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert json.loads(marker.read_bytes())['result'] == 'ok'
+
+    closed = _Reader(node).until_closed(['flood', 'b'])
+    assert closed['flood']['args'] == {}
+    assert closed['b']['args']['code'] == 0
+
+    _stop(node, pid)
+
+def test_reaps_the_children_it_kills_when_node_goes_away(monkeypatch):
+    pids: List[int] = []
+    fork = os.fork
+
+    def recording_fork() -> int:
+        pid = fork()
+        if pid:
+            pids.append(pid)
+        return pid
+
+    def run_invocation(msg: Dict[str, Any]) -> None:
+        time.sleep(60)
+
+    monkeypatch.setattr(motia_zygote.os, 'fork', recording_fork)
+    node, zygote = socket.socketpair()
+    _send(node, {'type': 'invoke', 'id': 'a'})
+    node.shutdown(socket.SHUT_WR)
+
+    try:
+        Zygote(zygote.fileno(), run_invocation).serve()
+    finally:
+        node.close()
+        zygote.close()
+
+    assert len(pids) == 1
+    try:
+        os.waitpid(pids[0], os.WNOHANG)
+        assert False, 'the child was not reaped'
+    except ChildProcessError:
+        pass
+
+def test_runs_forked_invocations_of_the_runner(tmp_path):
+    step = tmp_path / 'steps' / 'read_step.py'
+    step.parent.mkdir()
+    step.write_text(
+        "config = {'name': 'Read'}\n\n"
+        "async def handler(data, context):\n"
+        "    return {'status': 200, 'body': await context.state.get('trace', data['key'])}\n"
+    )
+    node = FakeNode('--zygote')
+
+    for invocation_id in ['a', 'b']:
+        node.send({'type': 'invoke', 'id': invocation_id, 'filePath': str(step), 'args': {'data': {'key': invocation_id}}})
+
+    requests = {request['invocationId']: request for request in (node.receive(), node.receive())}
+    assert {request['method'] for request in requests.values()} == {'state.get'}
+
+    # Each child waits for its own response, whatever the order they come in
+    for invocation_id in ['b', 'a']:
+        node.respond(requests[invocation_id], invocation_id)
+        result = node.receive()
+        assert (result['method'], result['invocationId']) == ('result', invocation_id)
+        assert result['args']['body'] == invocation_id
+        node.respond(result)
+        assert node.receive()['method'] == 'close'
+
+    assert node.close() == 0
@@ -15,20 +15,16 @@ import { LockedData } from './locked-data'
 import { BaseLoggerFactory } from './logger-factory'
 import { Motia } from './motia'
 import { createTracerFactory } from './observability/tracer'
-import { createSocketServer } from './socket-server'
+import { closeStepWorkers } from './process-communication/step-worker'
+import { createSocketServer, StreamEvent } from './socket-server'
+import { StateManager, withBulkOperations } from './state/state-adapter'
 import { createStepHandlers, MotiaEventManager } from './step-handlers'
 import { systemSteps } from './steps'
 import { apiEndpoints } from './streams/api-endpoints'
 import { Log, LogsStream } from './streams/logs-stream'
-import {
-  ApiRequest,
-  ApiResponse,
-  ApiRouteConfig,
-  ApiRouteMethod,
-  EventManager,
-  InternalStateManager,
-  Step,
-} from './types'
+import { StreamAdapter } from './streams/adapters/stream-adapter'
+import { StreamPatch } from './streams/stream-patch'
+import { ApiRequest, ApiResponse, ApiRouteConfig, ApiRouteMethod, EventManager, Step } from './types'
 import { BaseStreamItem, MotiaStream, StateStreamEvent, StateStreamEventChannel } from './types-stream'
 import { globalLogger } from './logger'
 import { Printer } from './printer'
@@ -53,7 +49,7 @@ type MotiaServerConfig = {
 export const createServer = (
   lockedData: LockedData,
   eventManager: EventManager,
-  state: InternalStateManager,
+  stateAdapter: StateManager,
   config: MotiaServerConfig,
 ): MotiaServer => {
   const printer = config.printer ?? new Printer(process.cwd())
@@ -142,6 +138,58 @@ export const createServer = (
         return wrapObject(groupId, id, result)
       }
 
+      // Adapters that don't implement them, like the ones written before they existed, get the get then set default
+      const mainAppend = main.append ?? StreamAdapter.prototype.append
+      const mainPatch = main.patch ?? StreamAdapter.prototype.patch
+
+      /**
+       * Appends and patches run the adapter's own operations, so adapters that update an item atomically can override
+       * them. The adapter sees its unwrapped get and set, so clients already holding the item only receive the change,
+       * and it reads the item the wrapper just read instead of reading it again.
+       *
+       * The default operations of StreamAdapter read then write the item: concurrent updates of the same item can
+       * overwrite each other there, and when the item is created or deleted meanwhile clients may get the wrong event.
+       */
+      const updateItem = async (
+        groupId: string,
+        id: string,
+        delta: Extract<StreamEvent<BaseStreamItem>, { type: 'append' | 'patch' }>,
+        update: (adapter: MotiaStream<BaseStreamItem>) => Promise<BaseStreamItem | null>,
+      ) => {
+        const current = await mainGet.apply(main, [groupId, id])
+        const adapter: MotiaStream<BaseStreamItem> = Object.create(main, {
+          get: {
+            value: (itemGroupId: string, itemId: string) =>
+              itemGroupId === groupId && itemId === id
+                ? Promise.resolve(current)
+                : mainGet.apply(main, [itemGroupId, itemId]),
+          },
+          set: {
+            value: async (itemGroupId: string, itemId: string, data: BaseStreamItem) =>
+              (await mainSet.apply(main, [itemGroupId, itemId, data])) ?? data,
+          },
+        })
+        const result = await update(adapter)
+
+        if (current) {
+          pushEvent({ streamName, groupId, id, event: delta })
+        } else {
+          pushEvent({ streamName, groupId, id, event: { type: 'create', data: result } })
+        }
+
+        return wrapObject(groupId, id, result)
+      }
+
+      main.append = async (groupId: string, id: string, field: string, value: unknown) => {
+        const delta = { type: 'append', data: { id, field, value } } as const
+        return updateItem(groupId, id, delta, (adapter) => mainAppend.apply(adapter, [groupId, id, field, value]))
+      }
+
+      main.patch = async (groupId: string, id: string, patch: StreamPatch) => {
+        const delta = { type: 'patch', data: { id, patch } } as const
+        return updateItem(groupId, id, delta, (adapter) => mainPatch.apply(adapter, [groupId, id, patch]))
+      }
+
       return main
     }
   })
@@ -159,6 +207,7 @@ export const createServer = (
   const allSteps = [...systemSteps, ...lockedData.activeSteps]
   const loggerFactory = new BaseLoggerFactory(config.isVerbose, logStream)
   const tracerFactory = createTracerFactory(lockedData)
+  const state = withBulkOperations(stateAdapter)
   const motia: Motia = { loggerFactory, eventManager, state, lockedData, printer, tracerFactory }
 
   const cronManager = setupCronHandlers(motia)
@@ -271,6 +320,7 @@ export const createServer = (
   const close = async (): Promise<void> => {
     cronManager.close()
     socketServer.close()
+    closeStepWorkers()
   }
 
   return { app, server, socketServer, close, removeRoute, addRoute, cronManager, motiaEventManager }
@@ -3,11 +3,13 @@ import http from 'http'
 
 type BaseMessage = { streamName: string; groupId: string; id?: string }
 type JoinMessage = BaseMessage & { subscriptionId: string }
-type StreamEvent<TData> =
+export type StreamEvent<TData> =
   | { type: 'sync'; data: TData }
   | { type: 'create'; data: TData }
   | { type: 'update'; data: TData }
   | { type: 'delete'; data: TData }
+  | { type: 'append'; data: { id: string; field: string; value: unknown } }
+  | { type: 'patch'; data: { id: string; patch: Record<string, unknown> } }
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
   | { type: 'event'; event: { type: string; data: any } }
 type EventMessage<TData> = BaseMessage & { timestamp: number; event: StreamEvent<TData> }
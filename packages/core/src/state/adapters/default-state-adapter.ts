@@ -70,6 +70,48 @@ export class FileStateAdapter implements StateAdapter {
     return value
   }
 
+  async getMany<T>(traceId: string, keys: string[]): Promise<(T | null)[]> {
+    const data = this._readFile()
+
+    return keys.map((key) => {
+      const value = data[this._makeKey(traceId, key)]
+      return value ? (JSON.parse(value) as T) : null
+    })
+  }
+
+  async setMany<T>(traceId: string, values: Record<string, T>) {
+    const data = this._readFile()
+
+    for (const [key, value] of Object.entries(values)) {
+      data[this._makeKey(traceId, key)] = JSON.stringify(value)
+    }
+
+    this._writeFile(data)
+  }
+
+  async deleteMany<T>(traceId: string, keys: string[]): Promise<(T | null)[]> {
+    const data = this._readFile()
+    let changed = false
+
+    const values = keys.map((key) => {
+      const fullKey = this._makeKey(traceId, key)
+      const value = data[fullKey] ? (JSON.parse(data[fullKey]) as T) : null
+
+      if (value) {
+        delete data[fullKey]
+        changed = true
+      }
+
+      return value
+    })
+
+    if (changed) {
+      this._writeFile(data)
+    }
+
+    return values
+  }
+
   async clear(traceId: string) {
     const data = this._readFile()
     const pattern = this._makeKey(traceId, '')
@@ -39,6 +39,20 @@ export class MemoryStateAdapter implements StateAdapter {
     return value
   }
 
+  async getMany<T>(traceId: string, keys: string[]): Promise<(T | null)[]> {
+    return Promise.all(keys.map((key) => this.get<T>(traceId, key)))
+  }
+
+  async setMany<T>(traceId: string, values: Record<string, T>) {
+    for (const [key, value] of Object.entries(values)) {
+      this.state[this._makeKey(traceId, key)] = value
+    }
+  }
+
+  async deleteMany<T>(traceId: string, keys: string[]): Promise<(T | null)[]> {
+    return Promise.all(keys.map((key) => this.delete<T>(traceId, key)))
+  }
+
   async clear(traceId: string) {
     const pattern = this._makeKey(traceId, '')
 
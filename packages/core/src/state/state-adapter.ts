@@ -30,10 +30,18 @@ export interface StateItemsInput {
   filter?: StateFilter[]
 }
 
+type BulkStateOperation = 'getMany' | 'setMany' | 'deleteMany'
+
+/**
+ * State manager whose bulk operations are optional, adapters written before them keep working
+ */
+export type StateManager = Omit<InternalStateManager, BulkStateOperation> &
+  Partial<Pick<InternalStateManager, BulkStateOperation>>
+
 /**
  * Interface for state management adapters
  */
-export interface StateAdapter extends InternalStateManager {
+export interface StateAdapter extends StateManager {
   clear(traceId: string): Promise<void>
   cleanup(): Promise<void>
 
@@ -42,3 +50,48 @@ export interface StateAdapter extends InternalStateManager {
 
   items(input: StateItemsInput): Promise<StateItem[]>
 }
+
+/**
+ * Fills in the bulk operations a state manager doesn't implement, they read, write or delete one key at a time
+ */
+export const withBulkOperations = (state: StateManager): InternalStateManager => {
+  if (state.getMany && state.setMany && state.deleteMany) {
+    return state as InternalStateManager
+  }
+
+  return {
+    get: (groupId, key) => state.get(groupId, key),
+    set: (groupId, key, value) => state.set(groupId, key, value),
+    delete: (groupId, key) => state.delete(groupId, key),
+    getGroup: (groupId) => state.getGroup(groupId),
+    clear: (groupId) => state.clear(groupId),
+
+    getMany: async <T>(groupId: string, keys: string[]) => {
+      if (state.getMany) {
+        return state.getMany<T>(groupId, keys)
+      }
+      return Promise.all(keys.map((key) => state.get<T>(groupId, key)))
+    },
+
+    setMany: async <T>(groupId: string, values: Record<string, T>) => {
+      if (state.setMany) {
+        return state.setMany<T>(groupId, values)
+      }
+      // one write at a time, adapters like the file adapter rewrite everything they hold on each write
+      for (const [key, value] of Object.entries(values)) {
+        await state.set<T>(groupId, key, value)
+      }
+    },
+
+    deleteMany: async <T>(groupId: string, keys: string[]) => {
+      if (state.deleteMany) {
+        return state.deleteMany<T>(groupId, keys)
+      }
+      const deleted: (T | null)[] = []
+      for (const key of keys) {
+        deleted.push(await state.delete<T>(groupId, key))
+      }
+      return deleted
+    },
+  }
+}
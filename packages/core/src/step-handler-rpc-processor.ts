@@ -1,9 +1,15 @@
 import { ChildProcess } from 'child_process'
-import { RpcProcessorInterface, RpcHandler, MessageCallback } from './process-communication/rpc-processor-interface'
+import {
+  RpcProcessorInterface,
+  RpcHandler,
+  MessageCallback,
+  InvocationRouter,
+} from './process-communication/rpc-processor-interface'
 
 export type RpcMessage = {
   type: 'rpc_request'
   id: string | undefined
+  invocationId?: string
   method: string
   args: unknown
 }
@@ -13,6 +19,7 @@ export class RpcProcessor implements RpcProcessorInterface {
   private handlers: Record<string, RpcHandler<any, any>> = {}
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
   private messageCallback?: MessageCallback<any>
+  private invocationRouter?: InvocationRouter
   private isClosed = false
 
   constructor(private child: ChildProcess) {}
@@ -25,7 +32,15 @@ export class RpcProcessor implements RpcProcessorInterface {
     this.messageCallback = callback
   }
 
-  async handle(method: string, input: unknown) {
+  onInvocation(router: InvocationRouter): void {
+    this.invocationRouter = router
+  }
+
+  async handle(method: string, input: unknown, invocationId?: string) {
+    if (invocationId && this.invocationRouter) {
+      return this.invocationRouter(invocationId, method, input)
+    }
+
     const handler = this.handlers[method]
     if (!handler) {
       throw new Error(`Handler for method ${method} not found`)
@@ -33,11 +48,12 @@ export class RpcProcessor implements RpcProcessorInterface {
     return handler(input)
   }
 
-  private response(id: string | undefined, result: unknown, error: unknown) {
+  private response(id: string | undefined, invocationId: string | undefined, result: unknown, error: unknown) {
     if (id && !this.isClosed && this.child.send && this.child.connected) {
       const responseMessage = {
         type: 'rpc_response',
         id,
+        invocationId,
         result: error ? undefined : result,
         error: error ? String(error) : undefined,
       }
@@ -45,6 +61,12 @@ export class RpcProcessor implements RpcProcessorInterface {
     }
   }
 
+  send(message: unknown) {
+    if (!this.isClosed && this.child.send && this.child.connected) {
+      this.child.send(message as object)
+    }
+  }
+
   async init() {
     // eslint-disable-next-line @typescript-eslint/no-explicit-any
     this.child.on('message', (msg: any) => {
@@ -55,10 +77,10 @@ export class RpcProcessor implements RpcProcessorInterface {
 
       // Handle RPC requests specifically
       if (msg && msg.type === 'rpc_request') {
-        const { id, method, args } = msg as RpcMessage
-        this.handle(method, args)
-          .then((result) => this.response(id, result, null))
-          .catch((error) => this.response(id, null, error))
+        const { id, invocationId, method, args } = msg as RpcMessage
+        this.handle(method, args, invocationId)
+          .then((result) => this.response(id, invocationId, result, null))
+          .catch((error) => this.response(id, invocationId, null, error))
       }
     })
 
@@ -1,10 +1,16 @@
 import { ChildProcess } from 'child_process'
 import readline from 'readline'
-import { RpcProcessorInterface, RpcHandler, MessageCallback } from './process-communication/rpc-processor-interface'
+import {
+  RpcProcessorInterface,
+  RpcHandler,
+  MessageCallback,
+  InvocationRouter,
+} from './process-communication/rpc-processor-interface'
 
 export type RpcMessage = {
   type: 'rpc_request'
   id: string | undefined
+  invocationId?: string
   method: string
   args: unknown
 }
@@ -14,6 +20,7 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
   private handlers: Record<string, RpcHandler<any, any>> = {}
   // eslint-disable-next-line @typescript-eslint/no-explicit-any
   private messageCallback?: MessageCallback<any>
+  private invocationRouter?: InvocationRouter
   private isClosed = false
   private rl?: readline.Interface
 
@@ -27,7 +34,15 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
     this.messageCallback = callback
   }
 
-  async handle(method: string, input: unknown) {
+  onInvocation(router: InvocationRouter): void {
+    this.invocationRouter = router
+  }
+
+  async handle(method: string, input: unknown, invocationId?: string) {
+    if (invocationId && this.invocationRouter) {
+      return this.invocationRouter(invocationId, method, input)
+    }
+
     const handler = this.handlers[method]
     if (!handler) {
       throw new Error(`Handler for method ${method} not found`)
@@ -35,11 +50,12 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
     return handler(input)
   }
 
-  private response(id: string | undefined, result: unknown, error: unknown) {
+  private response(id: string | undefined, invocationId: string | undefined, result: unknown, error: unknown) {
     if (id && !this.isClosed && this.child.stdin && !this.child.killed) {
       const responseMessage = {
         type: 'rpc_response',
         id,
+        invocationId,
         result: error ? undefined : result,
         error: error ? String(error) : undefined,
       }
@@ -48,6 +64,12 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
     }
   }
 
+  send(message: unknown) {
+    if (!this.isClosed && this.child.stdin && !this.child.killed) {
+      this.child.stdin.write(JSON.stringify(message) + '\n')
+    }
+  }
+
   async init() {
     if (this.child.stdout) {
       this.rl = readline.createInterface({
@@ -66,10 +88,10 @@ export class RpcStdinProcessor implements RpcProcessorInterface {
 
           // Handle RPC requests specifically
           if (msg && msg.type === 'rpc_request') {
-            const { id, method, args } = msg as RpcMessage
-            this.handle(method, args)
-              .then((result) => this.response(id, result, null))
-              .catch((error) => this.response(id, null, error))
+            const { id, invocationId, method, args } = msg as RpcMessage
+            this.handle(method, args, invocationId)
+              .then((result) => this.response(id, invocationId, result, null))
+              .catch((error) => this.response(id, invocationId, null, error))
           }
         } catch (error) {
           console.error('Failed to parse RPC message:', error, 'Raw line:', line)
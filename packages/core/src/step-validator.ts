@@ -70,6 +70,7 @@ const eventSchema = z
     input: z.union([jsonSchema, z.object({}), z.null()]).optional(),
     flows: z.array(z.string()).optional(),
     includeFiles: z.array(z.string()).optional(),
+    executor: z.literal('process').optional(),
   })
   .strict()
 
@@ -85,6 +86,7 @@ const apiSchema = z
     virtualSubscribes: z.array(z.string()).optional(),
     flows: z.array(z.string()).optional(),
     includeFiles: z.array(z.string()).optional(),
+    executor: z.literal('process').optional(),
     middleware: z.array(z.any()).optional(),
     queryParams: z.array(z.object({ name: z.string(), description: z.string().optional() })).optional(),
     bodySchema: z.union([jsonSchema, z.object({}), z.null()]).optional(),
@@ -102,6 +104,7 @@ const cronSchema = z
     emits: emits,
     flows: z.array(z.string()).optional(),
     includeFiles: z.array(z.string()).optional(),
+    executor: z.literal('process').optional(),
   })
   .strict()
 
@@ -151,3 +154,23 @@ export const validateStep = (step: Step): ValidationResult => {
     }
   }
 }
+
+/**
+ * Returns why the `executor` of a step can't be honoured, only the worker mode of the Python runner has a process pool
+ */
+export const getIgnoredExecutorReason = (
+  step: Step,
+  pythonRunnerMode = process.env.MOTIA_PYTHON_RUNNER_MODE ?? 'process',
+): string | undefined => {
+  if (!('executor' in step.config) || step.config.executor !== 'process') {
+    return
+  }
+
+  if (!step.filePath.endsWith('.py')) {
+    return 'only Python steps can run in the process pool'
+  }
+
+  if (pythonRunnerMode !== 'worker') {
+    return `the ${pythonRunnerMode} mode of the Python runner has no process pool, set MOTIA_PYTHON_RUNNER_MODE=worker to use it`
+  }
+}
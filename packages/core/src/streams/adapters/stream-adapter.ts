@@ -1,4 +1,5 @@
 import { BaseStreamItem, MotiaStream, StateStreamEvent, StateStreamEventChannel } from '../../types-stream'
+import { appendToField, applyMergePatch, StreamPatch } from '../stream-patch'
 
 /**
  * Interface for stream management adapters
@@ -9,6 +10,20 @@ export abstract class StreamAdapter<TData> implements MotiaStream<TData> {
   abstract delete(groupId: string, id: string): Promise<BaseStreamItem<TData> | null>
   abstract getGroup(groupId: string): Promise<BaseStreamItem<TData>[]>
 
+  /**
+   * Reads the item then writes it back, so concurrent updates of the same item can overwrite each other.
+   * Adapters backed by a store with atomic updates should override append and patch.
+   */
+  async append(groupId: string, id: string, field: string, value: unknown): Promise<BaseStreamItem<TData>> {
+    const current = await this.get(groupId, id)
+    return this.set(groupId, id, appendToField((current ?? {}) as TData, field, value))
+  }
+
+  async patch(groupId: string, id: string, patch: StreamPatch): Promise<BaseStreamItem<TData>> {
+    const current = await this.get(groupId, id)
+    return this.set(groupId, id, applyMergePatch((current ?? {}) as TData, patch))
+  }
+
   // eslint-disable-next-line @typescript-eslint/no-unused-vars
   async send<T>(channel: StateStreamEventChannel, event: StateStreamEvent<T>): Promise<void> {}
 }
@@ -0,0 +1,44 @@
+export type StreamPatch = Record<string, unknown>
+
+// @motiadev/stream-client and the Python runner keep their own copies of these helpers for the events they apply,
+// every copy is tested against the cases in src/__tests__/fixtures/stream-patch-cases.json
+const isObject = (value: unknown): value is Record<string, unknown> =>
+  typeof value === 'object' && value !== null && !Array.isArray(value)
+
+/**
+ * Applies a JSON merge patch (RFC 7386): objects are merged recursively, null removes a field
+ * and any other value replaces it.
+ */
+export const applyMergePatch = <T>(target: T, patch: unknown): T => {
+  if (!isObject(patch)) {
+    return patch as T
+  }
+
+  const result: Record<string, unknown> = isObject(target) ? { ...target } : {}
+
+  for (const [key, value] of Object.entries(patch)) {
+    if (value === null) {
+      delete result[key]
+    } else {
+      result[key] = applyMergePatch(result[key], value)
+    }
+  }
+
+  return result as T
+}
+
+/**
+ * Appends a value to a string or array field of an item, a missing field is set to the value.
+ */
+export const appendToField = <T>(item: T, field: string, value: unknown): T => {
+  const current = isObject(item) ? item[field] : undefined
+  let appended = value
+
+  if (typeof current === 'string') {
+    appended = current + String(value)
+  } else if (Array.isArray(current)) {
+    appended = current.concat(value)
+  }
+
+  return { ...item, [field]: appended }
+}
@@ -1,5 +1,6 @@
 import { ZodObject } from 'zod'
 import { StreamFactory } from './streams/stream-factory'
+import { StreamPatch } from './streams/stream-patch'
 
 export interface StreamConfig {
   name: string
@@ -28,5 +29,15 @@ export interface MotiaStream<TData> {
   delete(groupId: string, id: string): Promise<BaseStreamItem<TData> | null>
   getGroup(groupId: string): Promise<BaseStreamItem<TData>[]>
 
+  /**
+   * Appends a value to a string or array field of the item, clients only receive the appended value
+   */
+  append(groupId: string, id: string, field: string, value: unknown): Promise<BaseStreamItem<TData>>
+
+  /**
+   * Applies a JSON merge patch to the item, clients only receive the patch
+   */
+  patch(groupId: string, id: string, patch: StreamPatch): Promise<BaseStreamItem<TData>>
+
   send<T>(channel: StateStreamEventChannel, event: StateStreamEvent<T>): Promise<void>
 }
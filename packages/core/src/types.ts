@@ -8,6 +8,9 @@ export type InternalStateManager = {
   delete<T>(groupId: string, key: string): Promise<T | null>
   getGroup<T>(groupId: string): Promise<T[]>
   clear(groupId: string): Promise<void>
+  getMany<T>(groupId: string, keys: string[]): Promise<(T | null)[]>
+  setMany<T>(groupId: string, values: Record<string, T>): Promise<void>
+  deleteMany<T>(groupId: string, keys: string[]): Promise<(T | null)[]>
 }
 
 export type EmitData = { topic: ''; data: unknown }
@@ -42,6 +45,10 @@ export type EventConfig = {
    * Needs to be relative to the step file.
    */
   includeFiles?: string[]
+  /**
+   * Python steps only, runs the handler in a pool of processes, for CPU bound handlers.
+   */
+  executor?: 'process'
 }
 
 export type NoopConfig = {
@@ -85,6 +92,10 @@ export type ApiRouteConfig = {
    * Needs to be relative to the step file.
    */
   includeFiles?: string[]
+  /**
+   * Python steps only, runs the handler in a pool of processes, for CPU bound handlers.
+   */
+  executor?: 'process'
 }
 
 export interface ApiRequest<TBody = unknown> {
@@ -119,6 +130,10 @@ export type CronConfig = {
    * Needs to be relative to the step file.
    */
   includeFiles?: string[]
+  /**
+   * Python steps only, runs the handler in a pool of processes, for CPU bound handlers.
+   */
+  executor?: 'process'
 }
 
 export type CronHandler<TEmitData = never> = (ctx: FlowContext<TEmitData>) => Promise<void>
@@ -0,0 +1,8 @@
+module.exports = {
+  roots: ['<rootDir>/src'],
+  transform: {
+    '^.+\\.ts$': 'ts-jest',
+  },
+  testRegex: '(/__tests__/.*\\.test\\.ts$)',
+  moduleFileExtensions: ['ts', 'js', 'json', 'node'],
+}
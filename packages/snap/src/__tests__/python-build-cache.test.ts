@@ -0,0 +1,254 @@
+import { execFileSync } from 'child_process'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { PythonBuildCache, SitePackages } from '../cloud/build/builders/python/build-cache'
+
+const LIST_ZIP = `
+import json, sys, zipfile
+with zipfile.ZipFile(sys.argv[1]) as zip_file:
+    print(json.dumps(sorted(zip_file.namelist())))
+`
+
+const listZip = (zipPath: string): string[] => {
+  return JSON.parse(execFileSync('python', ['-c', LIST_ZIP, zipPath], { encoding: 'utf-8' }))
+}
+
+// Installs a distribution the way pip does, its RECORD lists every file with its hash
+const install = (sitePackages: string, distInfo: string, files: Record<string, string>) => {
+  const record = Object.entries(files).map(([file, content]) => {
+    fs.mkdirSync(path.dirname(path.join(sitePackages, file)), { recursive: true })
+    fs.writeFileSync(path.join(sitePackages, file), content)
+    return `${file},sha256=${Buffer.from(content).toString('base64url')},${content.length}`
+  })
+
+  fs.mkdirSync(path.join(sitePackages, distInfo), { recursive: true })
+  fs.writeFileSync(
+    path.join(sitePackages, distInfo, 'RECORD'),
+    [...record, `${distInfo}/RECORD,,`, `__pycache__/ignored.cpython-313.pyc,,`].join('\n'),
+  )
+}
+
+describe('SitePackages', () => {
+  let sitePackages: string
+
+  beforeEach(() => {
+    sitePackages = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-site-packages-'))
+    install(sitePackages, 'requests-2.32.0.dist-info', {
+      'requests/__init__.py': 'from .api import get',
+      'requests/api.py': 'def get(url): ...',
+    })
+    install(sitePackages, 'six-1.16.0.dist-info', { 'six.py': 'PY3 = True' })
+    install(sitePackages, 'protobuf-5.0.0.dist-info', { 'google/protobuf/__init__.py': '' })
+    install(sitePackages, 'googleapis_common_protos-1.0.0.dist-info', { 'google/api/__init__.py': '' })
+  })
+
+  afterEach(() => {
+    fs.rmSync(sitePackages, { recursive: true, force: true })
+  })
+
+  it('should hash the packages and modules listed by the RECORD files', () => {
+    const packages = new SitePackages(sitePackages)
+
+    expect(packages.packageHash('requests')).toMatch(/^[0-9a-f]{40}$/)
+    expect(packages.packageHash('six')).toMatch(/^[0-9a-f]{40}$/)
+    expect(packages.packageHash('google')).toMatch(/^[0-9a-f]{40}$/)
+    expect(packages.packageHash('__pycache__')).toBeUndefined()
+    expect(packages.packageHash('requests-2.32.0.dist-info')).toBeUndefined()
+    expect(packages.packageHash('missing')).toBeUndefined()
+  })
+
+  it('should return the same hashes however often they are read', () => {
+    const packages = new SitePackages(sitePackages)
+    const google = packages.packageHash('google')
+
+    expect(packages.packageHash('google')).toBe(google)
+    expect(new SitePackages(sitePackages).packageHash('google')).toBe(google)
+    expect(packages.fingerprint()).toBe(new SitePackages(sitePackages).fingerprint())
+  })
+
+  it('should change the hash of a package when its RECORD changes', () => {
+    const before = new SitePackages(sitePackages)
+    const requests = before.packageHash('requests')
+    const six = before.packageHash('six')
+    const fingerprint = before.fingerprint()
+
+    install(sitePackages, 'requests-2.32.0.dist-info', {
+      'requests/__init__.py': 'from .api import get, post',
+      'requests/api.py': 'def get(url): ...',
+    })
+    const after = new SitePackages(sitePackages)
+
+    expect(after.packageHash('requests')).not.toBe(requests)
+    expect(after.packageHash('six')).toBe(six)
+    expect(after.fingerprint()).not.toBe(fingerprint)
+  })
+
+  it('should change the hash of a namespace package when any of its distributions changes', () => {
+    const google = new SitePackages(sitePackages).packageHash('google')
+
+    install(sitePackages, 'googleapis_common_protos-1.0.0.dist-info', { 'google/api/__init__.py': 'VERSION = 2' })
+
+    expect(new SitePackages(sitePackages).packageHash('google')).not.toBe(google)
+  })
+
+  it('should ignore files that are not listed by a RECORD', () => {
+    const fingerprint = new SitePackages(sitePackages).fingerprint()
+
+    fs.writeFileSync(path.join(sitePackages, 'requests', 'notes.txt'), 'not installed by pip')
+
+    expect(new SitePackages(sitePackages).fingerprint()).toBe(fingerprint)
+  })
+
+  it('should have an empty fingerprint when the directory does not exist', () => {
+    const missing = new SitePackages(path.join(sitePackages, 'missing'))
+
+    expect(missing.fingerprint()).toBe(new SitePackages(path.join(sitePackages, 'other')).fingerprint())
+    expect(missing.packageHash('requests')).toBeUndefined()
+  })
+})
+
+describe('PythonBuildCache', () => {
+  let projectDir: string
+  let sitePackages: string
+  let lambdaSitePackages: string
+  let tracerPath: string
+  let stepFile: string
+
+  const createCache = () => new PythonBuildCache(projectDir, sitePackages, lambdaSitePackages, tracerPath)
+  const chunksDir = () => path.join(projectDir, '.motia', 'build-cache', 'python', 'chunks')
+
+  beforeEach(() => {
+    projectDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-python-build-cache-'))
+    sitePackages = path.join(projectDir, 'python_modules', 'site-packages')
+    lambdaSitePackages = `${sitePackages}-lambda`
+    tracerPath = path.join(projectDir, 'python-builder.py')
+    stepFile = path.join(projectDir, 'steps', 'api.step.py')
+
+    for (const dir of [sitePackages, lambdaSitePackages]) {
+      install(dir, 'requests-2.32.0.dist-info', {
+        'requests/__init__.py': 'from .api import get',
+        'requests/api.py': 'def get(url): ...',
+      })
+      install(dir, 'requests_toolbelt-1.0.0.dist-info', { 'requests_toolbelt/__init__.py': '' })
+    }
+
+    fs.mkdirSync(path.dirname(stepFile))
+    fs.writeFileSync(stepFile, 'import requests')
+    fs.writeFileSync(tracerPath, 'print("trace")')
+  })
+
+  afterEach(() => {
+    fs.rmSync(projectDir, { recursive: true, force: true })
+  })
+
+  describe('packages', () => {
+    it('should return the packages saved by another instance', () => {
+      const cache = createCache()
+
+      expect(cache.getPackages(stepFile)).toBeUndefined()
+
+      cache.setPackages(stepFile, ['requests'])
+      cache.save()
+
+      expect(fs.existsSync(path.join(projectDir, '.motia', 'build-cache', 'python', 'packages.json'))).toBe(true)
+      expect(createCache().getPackages(stepFile)).toEqual(['requests'])
+    })
+
+    it('should miss when the step file changes', () => {
+      const cache = createCache()
+      cache.setPackages(stepFile, ['requests'])
+      cache.save()
+
+      fs.writeFileSync(stepFile, 'import requests, yaml')
+
+      expect(createCache().getPackages(stepFile)).toBeUndefined()
+    })
+
+    it('should miss when a RECORD of the environment changes', () => {
+      const cache = createCache()
+      cache.setPackages(stepFile, ['requests'])
+      cache.save()
+
+      install(sitePackages, 'pyyaml-6.0.0.dist-info', { 'yaml/__init__.py': '' })
+
+      expect(createCache().getPackages(stepFile)).toBeUndefined()
+    })
+
+    it('should miss when python-builder.py changes', () => {
+      const cache = createCache()
+      cache.setPackages(stepFile, ['requests'])
+      cache.save()
+
+      fs.writeFileSync(tracerPath, 'print("trace again")')
+
+      expect(createCache().getPackages(stepFile)).toBeUndefined()
+    })
+
+    it('should start over when the cache file is not valid', () => {
+      fs.mkdirSync(path.join(projectDir, '.motia', 'build-cache', 'python'), { recursive: true })
+      fs.writeFileSync(path.join(projectDir, '.motia', 'build-cache', 'python', 'packages.json'), '{')
+
+      const cache = createCache()
+      expect(cache.getPackages(stepFile)).toBeUndefined()
+
+      cache.setPackages(stepFile, [])
+      cache.save()
+      expect(createCache().getPackages(stepFile)).toEqual([])
+    })
+  })
+
+  describe('chunks', () => {
+    it('should zip the files of a package of the lambda site-packages', async () => {
+      const cache = createCache()
+      const chunk = await cache.getPackageChunk('requests')
+
+      expect(chunk).toMatch(/requests-[0-9a-f]{40}\.zip$/)
+      expect(path.dirname(chunk as string)).toBe(chunksDir())
+      expect(listZip(chunk as string)).toEqual(['requests/__init__.py', 'requests/api.py'])
+      expect(cache.getPackageChunk('requests')).toBe(cache.getPackageChunk('requests'))
+    })
+
+    it('should reuse the chunk of a package that did not change', async () => {
+      const chunk = await createCache().getPackageChunk('requests')
+      const { mtimeMs } = fs.statSync(chunk as string)
+
+      expect(await createCache().getPackageChunk('requests')).toBe(chunk)
+      expect(fs.statSync(chunk as string).mtimeMs).toBe(mtimeMs)
+    })
+
+    it('should replace the chunk of a package when its RECORD changes', async () => {
+      const before = await createCache().getPackageChunk('requests')
+      const toolbelt = await createCache().getPackageChunk('requests_toolbelt')
+
+      install(lambdaSitePackages, 'requests-2.32.0.dist-info', {
+        'requests/__init__.py': 'from .api import get, post',
+        'requests/api.py': 'def get(url): ...',
+      })
+      const after = await createCache().getPackageChunk('requests')
+
+      expect(after).not.toBe(before)
+      expect(fs.existsSync(after as string)).toBe(true)
+      expect(fs.existsSync(before as string)).toBe(false)
+      // Only the versions of the same package are removed
+      expect(fs.existsSync(toolbelt as string)).toBe(true)
+    })
+
+    it('should leave files that are not chunks in place', async () => {
+      fs.mkdirSync(chunksDir(), { recursive: true })
+      fs.writeFileSync(path.join(chunksDir(), 'requests-notes.zip'), '')
+      fs.writeFileSync(path.join(chunksDir(), `requests-${'a'.repeat(40)}.zip.bak`), '')
+
+      await createCache().getPackageChunk('requests')
+
+      expect(fs.readdirSync(chunksDir())).toContain('requests-notes.zip')
+      expect(fs.readdirSync(chunksDir())).toContain(`requests-${'a'.repeat(40)}.zip.bak`)
+    })
+
+    it('should return undefined for packages no RECORD lists', async () => {
+      fs.writeFileSync(path.join(lambdaSitePackages, 'vendored.py'), '')
+
+      expect(await createCache().getPackageChunk('vendored')).toBeUndefined()
+    })
+  })
+})
@@ -0,0 +1,228 @@
+import { execFileSync } from 'child_process'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import { getBundleOptions, PythonBundleOptions, PythonBundler } from '../cloud/build/builders/python/bundler'
+
+// The bytecode can only be compiled for the interpreter running python-bundler.py in the project directories
+const PYTHON_VERSION = execFileSync(
+  'python',
+  ['-c', 'import sys; print(f"{sys.version_info[0]}.{sys.version_info[1]}")'],
+  { cwd: os.tmpdir(), encoding: 'utf-8' },
+).trim()
+const CACHE_TAG = `cpython-${PYTHON_VERSION.replace('.', '')}`
+
+const listFiles = (dir: string): string[] => {
+  return fs
+    .readdirSync(dir, { recursive: true, withFileTypes: true })
+    .filter((entry) => entry.isFile())
+    .map((entry) => path.relative(dir, path.join(entry.parentPath, entry.name)))
+    .sort()
+}
+
+const treeSize = (dir: string) => {
+  return listFiles(dir).reduce((size, file) => size + fs.statSync(path.join(dir, file)).size, 0)
+}
+
+describe('getBundleOptions', () => {
+  const env = { ...process.env }
+
+  afterEach(() => {
+    process.env = { ...env }
+  })
+
+  beforeEach(() => {
+    delete process.env.MOTIA_PYTHON_BYTECODE
+    delete process.env.MOTIA_PYTHON_BYTECODE_OPTIMIZE
+    delete process.env.MOTIA_PYTHON_STRIP
+    delete process.env.MOTIA_PYTHON_BUNDLE_REPORT
+  })
+
+  it('should return undefined when the packages are shipped as they are installed', () => {
+    expect(getBundleOptions()).toBeUndefined()
+
+    process.env.MOTIA_PYTHON_BYTECODE_OPTIMIZE = '2'
+    expect(getBundleOptions()).toBeUndefined()
+  })
+
+  it('should read the options from the environment', () => {
+    process.env.MOTIA_PYTHON_BYTECODE = '3.13'
+    process.env.MOTIA_PYTHON_BYTECODE_OPTIMIZE = '2'
+    process.env.MOTIA_PYTHON_STRIP = 'true'
+    process.env.MOTIA_PYTHON_BUNDLE_REPORT = 'true'
+
+    expect(getBundleOptions()).toEqual({ target: '3.13', optimize: 2, strip: true, report: true })
+  })
+
+  it('should return the options when only stripping or reporting is enabled', () => {
+    process.env.MOTIA_PYTHON_STRIP = 'true'
+    expect(getBundleOptions()).toEqual({ target: undefined, optimize: 0, strip: true, report: false })
+
+    process.env.MOTIA_PYTHON_STRIP = 'false'
+    process.env.MOTIA_PYTHON_BUNDLE_REPORT = 'true'
+    expect(getBundleOptions()).toEqual({ target: undefined, optimize: 0, strip: false, report: true })
+  })
+
+  it('should reject targets that are not a Python version', () => {
+    for (const target of ['3', '313', 'python3.13', '3.13.1']) {
+      process.env.MOTIA_PYTHON_BYTECODE = target
+      expect(() => getBundleOptions()).toThrow(
+        `MOTIA_PYTHON_BYTECODE must be a Python version like 3.13, got ${target}`,
+      )
+    }
+  })
+
+  it('should reject unknown optimization levels', () => {
+    process.env.MOTIA_PYTHON_BYTECODE = '3.13'
+
+    for (const optimize of ['3', '-1', 'yes']) {
+      process.env.MOTIA_PYTHON_BYTECODE_OPTIMIZE = optimize
+      expect(() => getBundleOptions()).toThrow('MOTIA_PYTHON_BYTECODE_OPTIMIZE must be 0, 1 or 2')
+    }
+  })
+})
+
+describe('PythonBundler', () => {
+  let projectDir: string
+  let sitePackages: string
+  let outDir: string
+
+  const options: PythonBundleOptions = { target: PYTHON_VERSION, optimize: 0, strip: true, report: true }
+  const createBundler = (overrides: Partial<PythonBundleOptions> = {}) =>
+    new PythonBundler({ ...options, ...overrides }, projectDir, sitePackages)
+
+  const writeFiles = (dir: string, files: Record<string, string>) => {
+    for (const [file, content] of Object.entries(files)) {
+      fs.mkdirSync(path.dirname(path.join(dir, file)), { recursive: true })
+      fs.writeFileSync(path.join(dir, file), content)
+    }
+  }
+
+  beforeEach(() => {
+    projectDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-python-bundler-'))
+    sitePackages = path.join(projectDir, 'python_modules', 'site-packages')
+    outDir = path.join(projectDir, 'staged')
+
+    writeFiles(sitePackages, {
+      'fakepkg/__init__.py': '"""Fake package."""\nfrom .sub.mod import VALUE\n',
+      'fakepkg/__init__.pyi': 'VALUE: int\n',
+      'fakepkg/sub/mod.py': 'VALUE = 1\nassert VALUE\n',
+      'fakepkg/py2.py': "print 'only Python 2 compiles this'\n",
+      'fakepkg/data.json': '{}',
+      'fakepkg/tests/test_mod.py': 'def test_value(): ...\n',
+      'fakepkg/docs/index.md': '# Fake package\n',
+      'fakepkg/examples/example.py': 'import fakepkg\n',
+      'fakepkg/__pycache__/__init__.cpython-38.pyc': 'stale',
+      'single.py': 'VALUE = 2\n',
+    })
+  })
+
+  afterEach(() => {
+    fs.rmSync(projectDir, { recursive: true, force: true })
+  })
+
+  it('should name the bytecode of a file after the target interpreter', () => {
+    expect(createBundler({ target: '3.13' }).bytecodePath('steps/api_step.py')).toBe(
+      path.join('steps', '__pycache__', 'api_step.cpython-313.pyc'),
+    )
+    expect(createBundler({ target: undefined }).bytecodePath('steps/api_step.py')).toBeUndefined()
+  })
+
+  it('should stage a package stripped and compiled for the target', async () => {
+    const report = await createBundler().stagePackage('fakepkg', outDir)
+
+    expect(listFiles(outDir)).toEqual(
+      [
+        'fakepkg/__init__.py',
+        `fakepkg/__pycache__/__init__.${CACHE_TAG}.pyc`,
+        'fakepkg/data.json',
+        // Files that don't compile are shipped without bytecode
+        'fakepkg/py2.py',
+        `fakepkg/sub/__pycache__/mod.${CACHE_TAG}.pyc`,
+        'fakepkg/sub/mod.py',
+      ]
+        .map((file) => path.join(...file.split('/')))
+        .sort(),
+    )
+    expect(report).toEqual({
+      sourceSize: treeSize(path.join(sitePackages, 'fakepkg')),
+      size: treeSize(outDir),
+      files: 6,
+      compiled: 2,
+      importTime: expect.any(Number),
+    })
+  })
+
+  it('should write bytecode that is loaded without checking the source', async () => {
+    await createBundler().stagePackage('fakepkg', outDir)
+
+    const bytecode = fs.readFileSync(path.join(outDir, 'fakepkg', 'sub', '__pycache__', `mod.${CACHE_TAG}.pyc`))
+
+    // PEP 552 flags, the bytecode is hash based and check_source is off
+    expect(bytecode.readUInt32LE(4)).toBe(0b01)
+  })
+
+  it('should keep the tests, docs and stubs when not stripping', async () => {
+    const report = await createBundler({ strip: false, report: false }).stagePackage('fakepkg', outDir)
+
+    expect(listFiles(outDir)).toContain(path.join('fakepkg', '__init__.pyi'))
+    expect(listFiles(outDir)).toContain(path.join('fakepkg', 'tests', 'test_mod.py'))
+    expect(listFiles(outDir)).toContain(path.join('fakepkg', 'docs', 'index.md'))
+    expect(listFiles(outDir)).not.toContain(path.join('fakepkg', '__pycache__', '__init__.cpython-38.pyc'))
+    expect(report.compiled).toBe(4)
+    expect(report.importTime).toBeUndefined()
+  })
+
+  it('should stage the sources only when there is no target', async () => {
+    const report = await createBundler({ target: undefined }).stagePackage('fakepkg', outDir)
+
+    expect(listFiles(outDir).filter((file) => file.endsWith('.pyc'))).toEqual([])
+    expect(report.compiled).toBe(0)
+  })
+
+  it('should stage single module packages and the packages of one run together', async () => {
+    const bundler = createBundler()
+    const [fakepkg, single] = await Promise.all([
+      bundler.stagePackage('fakepkg', path.join(outDir, 'fakepkg')),
+      bundler.stagePackage('single', path.join(outDir, 'single')),
+    ])
+
+    expect(fakepkg.compiled).toBe(2)
+    expect(single).toMatchObject({ files: 2, compiled: 1 })
+    expect(listFiles(path.join(outDir, 'single'))).toEqual(
+      [path.join('__pycache__', `single.${CACHE_TAG}.pyc`), 'single.py'].sort(),
+    )
+  })
+
+  it('should reject packages that are not installed', async () => {
+    await expect(createBundler().stagePackage('missing', outDir)).rejects.toThrow(
+      'Package not found in site-packages: missing',
+    )
+  })
+
+  it('should compile step files and reject the ones that do not compile', async () => {
+    writeFiles(projectDir, {
+      'steps/api_step.py': 'def handler(req, ctx):\n    return {"status": 200}\n',
+      'steps/bad_step.py': 'def handler(req, ctx)\n',
+    })
+    const bundler = createBundler()
+    const bytecodePath = path.join(projectDir, 'bytecode', 'api_step.pyc')
+
+    await bundler.compileFile(path.join(projectDir, 'steps', 'api_step.py'), bytecodePath, 'steps/api_step.py')
+    expect(fs.existsSync(bytecodePath)).toBe(true)
+
+    await expect(
+      bundler.compileFile(
+        path.join(projectDir, 'steps', 'bad_step.py'),
+        path.join(projectDir, 'bytecode', 'bad_step.pyc'),
+        'steps/bad_step.py',
+      ),
+    ).rejects.toThrow('Could not compile steps/bad_step.py')
+  })
+
+  it('should reject targets the running interpreter can not compile for', async () => {
+    await expect(createBundler({ target: '3.2' }).stagePackage('fakepkg', outDir)).rejects.toThrow(
+      'Bytecode for Python 3.2 can not be compiled by',
+    )
+  })
+})
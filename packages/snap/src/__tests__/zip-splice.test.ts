@@ -0,0 +1,200 @@
+import { execFileSync } from 'child_process'
+import fs from 'fs'
+import os from 'os'
+import path from 'path'
+import zlib from 'zlib'
+import { Archiver } from '../cloud/build/builders/archiver'
+import { assertSpliceable, spliceZips } from '../cloud/build/builders/zip-splice'
+
+type ZipEntry = {
+  name: string
+  offset: number
+  crc: number
+  content: string
+}
+
+// Entries of a zip as read by Python's zipfile, which checks the CRC of every entry it reads
+const READ_ZIP = `
+import base64, json, sys, zipfile
+with zipfile.ZipFile(sys.argv[1]) as zip_file:
+    print(json.dumps({
+        'bad': zip_file.testzip(),
+        'entries': [
+            {
+                'name': info.filename,
+                'offset': info.header_offset,
+                'crc': info.CRC,
+                'content': base64.b64encode(zip_file.read(info)).decode('ascii'),
+            }
+            for info in zip_file.infolist()
+        ],
+    }))
+`
+
+const WRITE_EMPTY_ENTRIES = `
+import sys, zipfile
+with zipfile.ZipFile(sys.argv[1], 'w') as zip_file:
+    for index in range(int(sys.argv[2])):
+        zip_file.writestr(f'file-{index}', b'')
+`
+
+const readZip = (zipPath: string): ZipEntry[] => {
+  const { bad, entries } = JSON.parse(execFileSync('python', ['-c', READ_ZIP, zipPath], { encoding: 'utf-8' }))
+  expect(bad).toBeNull()
+  return entries
+}
+
+const writeEmptyEntries = (zipPath: string, count: number) => {
+  execFileSync('python', ['-c', WRITE_EMPTY_ENTRIES, zipPath, String(count)])
+}
+
+const createZip = async (zipPath: string, files: Record<string, string>): Promise<number> => {
+  const archive = new Archiver(zipPath)
+  Object.entries(files).forEach(([name, content]) => archive.append(content, name))
+  return archive.finalize()
+}
+
+describe('spliceZips', () => {
+  let tmpDir: string
+  let basePath: string
+
+  const baseFiles = { 'steps/api_step.py': 'def handler(req, ctx):\n    return {"status": 200}\n' }
+  const chunkFiles: Record<string, Record<string, string>> = {
+    'requests.zip': {
+      'requests/__init__.py': 'from .api import get\n',
+      'requests/api.py': 'def get(url):\n    return url\n'.repeat(200),
+    },
+    'six.zip': { 'six.py': 'PY3 = True\n' },
+    'yaml.zip': {
+      'yaml/__init__.py': '',
+      'yaml/nested/loader.py': 'class Loader:\n    pass\n',
+    },
+  }
+
+  const expectEntries = (zipPath: string, files: Record<string, string>) => {
+    const zip = fs.readFileSync(zipPath)
+    const entries = readZip(zipPath)
+
+    expect(entries.map((entry) => entry.name).sort()).toEqual(Object.keys(files).sort())
+
+    for (const entry of entries) {
+      const content = Buffer.from(entry.content, 'base64')
+
+      // The offset of the central directory points at the local header of the same entry
+      expect(zip.readUInt32LE(entry.offset)).toBe(0x04034b50)
+      expect(zip.toString('utf-8', entry.offset + 30, entry.offset + 30 + zip.readUInt16LE(entry.offset + 26))).toBe(
+        entry.name,
+      )
+      expect(entry.crc).toBe(zlib.crc32(content))
+      expect(content.toString('utf-8')).toBe(files[entry.name])
+    }
+  }
+
+  beforeEach(async () => {
+    tmpDir = fs.mkdtempSync(path.join(os.tmpdir(), 'motia-zip-splice-'))
+    basePath = path.join(tmpDir, 'step.zip')
+
+    for (const [name, files] of Object.entries(chunkFiles)) {
+      await createZip(path.join(tmpDir, name), files)
+    }
+  })
+
+  afterEach(() => {
+    fs.rmSync(tmpDir, { recursive: true, force: true })
+  })
+
+  it('should append the entries of every chunk to the base', async () => {
+    await createZip(basePath, baseFiles)
+
+    const size = spliceZips(basePath, Object.keys(chunkFiles).map((name) => path.join(tmpDir, name)))
+
+    expect(size).toBe(fs.statSync(basePath).size)
+    expectEntries(basePath, Object.assign({}, baseFiles, ...Object.values(chunkFiles)))
+  })
+
+  it('should copy the compressed entries of a chunk without touching them', async () => {
+    await createZip(basePath, baseFiles)
+    const chunkPath = path.join(tmpDir, 'requests.zip')
+    const chunk = fs.readFileSync(chunkPath)
+    // The offset of the central directory is the last field of the end of central directory record
+    const baseEntriesSize = fs.readFileSync(basePath).readUInt32LE(fs.statSync(basePath).size - 6)
+    const chunkEntriesSize = chunk.readUInt32LE(chunk.length - 6)
+
+    spliceZips(basePath, [chunkPath])
+
+    const zip = fs.readFileSync(basePath)
+    expect(
+      zip.subarray(baseEntriesSize, baseEntriesSize + chunkEntriesSize).equals(chunk.subarray(0, chunkEntriesSize)),
+    ).toBe(true)
+  })
+
+  it('should splice the chunks appended to an Archiver when it is finalized', async () => {
+    const archive = new Archiver(basePath)
+    Object.entries(baseFiles).forEach(([name, content]) => archive.append(content, name))
+    archive.appendZip(path.join(tmpDir, 'six.zip'))
+    archive.appendZip(path.join(tmpDir, 'yaml.zip'))
+    // A package shared by several steps is only added once
+    archive.appendZip(path.join(tmpDir, 'six.zip'))
+
+    const size = await archive.finalize()
+
+    expect(size).toBe(fs.statSync(basePath).size)
+    expectEntries(basePath, { ...baseFiles, ...chunkFiles['six.zip'], ...chunkFiles['yaml.zip'] })
+  })
+
+  it('should splice a chunk into a base that was already spliced', async () => {
+    await createZip(basePath, baseFiles)
+
+    spliceZips(basePath, [path.join(tmpDir, 'six.zip')])
+    spliceZips(basePath, [path.join(tmpDir, 'yaml.zip')])
+
+    expectEntries(basePath, { ...baseFiles, ...chunkFiles['six.zip'], ...chunkFiles['yaml.zip'] })
+  })
+
+  it('should reject ZIP64 chunks and leave the base untouched', async () => {
+    await createZip(basePath, baseFiles)
+    const base = fs.readFileSync(basePath)
+    const zip64Path = path.join(tmpDir, 'zip64.zip')
+
+    // Python writes a ZIP64 end of central directory past 65535 entries
+    writeEmptyEntries(zip64Path, 0x10000)
+
+    expect(() => assertSpliceable(zip64Path)).toThrow('ZIP64 archives can not be spliced')
+    expect(() => spliceZips(basePath, [path.join(tmpDir, 'six.zip'), zip64Path])).toThrow(
+      'ZIP64 archives can not be spliced',
+    )
+    expect(fs.readFileSync(basePath).equals(base)).toBe(true)
+  })
+
+  it('should reject entries with a ZIP64 local header offset', async () => {
+    const chunkPath = path.join(tmpDir, 'six.zip')
+    const chunk = fs.readFileSync(chunkPath)
+    const centralDirectoryOffset = chunk.readUInt32LE(chunk.length - 6)
+
+    chunk.writeUInt32LE(0xffffffff, centralDirectoryOffset + 42)
+    fs.writeFileSync(chunkPath, chunk)
+
+    expect(() => assertSpliceable(chunkPath)).toThrow('ZIP64 archives can not be spliced')
+  })
+
+  it('should reject splices with more entries than a zip without ZIP64 holds', async () => {
+    await createZip(basePath, baseFiles)
+    const base = fs.readFileSync(basePath)
+    const firstPath = path.join(tmpDir, 'first.zip')
+    const secondPath = path.join(tmpDir, 'second.zip')
+
+    writeEmptyEntries(firstPath, 40000)
+    writeEmptyEntries(secondPath, 40000)
+
+    expect(() => assertSpliceable(firstPath)).not.toThrow()
+    expect(() => spliceZips(basePath, [firstPath, secondPath])).toThrow('is too large for a zip without ZIP64')
+    expect(fs.readFileSync(basePath).equals(base)).toBe(true)
+  })
+
+  it('should reject files that are not zips', () => {
+    const notZipPath = path.join(tmpDir, 'not-a.zip')
+    fs.writeFileSync(notZipPath, 'not a zip')
+
+    expect(() => assertSpliceable(notZipPath)).toThrow('End of central directory not found')
+  })
+})
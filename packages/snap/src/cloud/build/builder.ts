@@ -31,6 +31,8 @@ export interface RouterBuildResult {
 }
 
 export interface StepBuilder {
+  /** Starts the work the steps of this builder share, before they are built */
+  prepare?(steps: Step[]): void
   build(step: Step): Promise<void>
   buildApiSteps(steps: Step<ApiRouteConfig>[]): Promise<RouterBuildResult>
 }
@@ -73,6 +75,12 @@ export class Builder {
     }
   }
 
+  prepareSteps(steps: Step[]): void {
+    this.builders.forEach((builder, type) => {
+      builder.prepare?.(steps.filter((step) => this.determineStepType(step) === type))
+    })
+  }
+
   async buildStep(step: Step): Promise<void> {
     const type = this.determineStepType(step)
     const builder = this.builders.get(type)
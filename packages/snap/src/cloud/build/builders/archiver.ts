@@ -1,11 +1,13 @@
 import archiver from 'archiver'
 import fs from 'fs'
+import { spliceZips } from './zip-splice'
 
 export class Archiver {
   private readonly archive: archiver.Archiver
   private readonly outputStream: fs.WriteStream
+  private readonly zips = new Set<string>()
 
-  constructor(filePath: string) {
+  constructor(private readonly filePath: string) {
     this.archive = archiver('zip', { zlib: { level: 9 } })
     this.outputStream = fs.createWriteStream(filePath)
     this.archive.pipe(this.outputStream)
@@ -15,11 +17,18 @@ export class Archiver {
     this.archive.append(stream, { name: filePath })
   }
 
+  /** Adds the entries of another zip as they are, without compressing them again */
+  appendZip(zipPath: string) {
+    this.zips.add(zipPath)
+  }
+
   async finalize(): Promise<number> {
-    return new Promise<number>((resolve, reject) => {
+    const size = await new Promise<number>((resolve, reject) => {
       this.outputStream.on('close', () => resolve(this.archive.pointer()))
       this.outputStream.on('error', reject)
       this.archive.finalize()
     })
+
+    return this.zips.size > 0 ? spliceZips(this.filePath, [...this.zips]) : size
   }
 }
@@ -3,12 +3,19 @@ import path from 'path'
 import colors from 'colors'
 import { Archiver } from '../archiver'
 
-const shouldIgnore = (filePath: string): boolean => {
-  const ignorePatterns = [/\.pyc$/, /\.egg$/, /__pycache__/, /\.dist-info$/]
+const shouldIgnore = (filePath: string, includeBytecode: boolean): boolean => {
+  const ignorePatterns = includeBytecode
+    ? [/\.egg$/, /\.dist-info$/]
+    : [/\.pyc$/, /\.egg$/, /__pycache__/, /\.dist-info$/]
   return ignorePatterns.some((pattern) => pattern.test(filePath))
 }
 
-const addDirectoryToArchive = async (archive: Archiver, baseDir: string, dirPath: string): Promise<void> => {
+const addDirectoryToArchive = async (
+  archive: Archiver,
+  baseDir: string,
+  dirPath: string,
+  includeBytecode: boolean,
+): Promise<void> => {
   const files = fs.readdirSync(dirPath)
 
   await Promise.all(
@@ -17,14 +24,14 @@ const addDirectoryToArchive = async (archive: Archiver, baseDir: string, dirPath
         const fullPath = path.join(dirPath, file)
         const relativePath = path.relative(baseDir, fullPath)
 
-        if (shouldIgnore(relativePath)) {
+        if (shouldIgnore(relativePath, includeBytecode)) {
           return
         }
 
         const stat = fs.statSync(fullPath)
 
         if (stat.isDirectory()) {
-          await addDirectoryToArchive(archive, baseDir, fullPath)
+          await addDirectoryToArchive(archive, baseDir, fullPath, includeBytecode)
         } else {
           archive.append(fs.createReadStream(fullPath), relativePath)
         }
@@ -37,6 +44,8 @@ export const addPackageToArchive = async (
   archive: Archiver,
   sitePackagesDir: string,
   packageName: string,
+  // Packages staged by python-bundler.py only hold bytecode compiled for the target interpreter
+  includeBytecode = false,
 ): Promise<void> => {
   // First try the package name as is
   let fullPath = path.join(sitePackagesDir, packageName)
@@ -56,9 +65,17 @@ export const addPackageToArchive = async (
 
   const stat = fs.statSync(fullPath)
   if (stat.isDirectory()) {
-    await addDirectoryToArchive(archive, sitePackagesDir, fullPath)
+    await addDirectoryToArchive(archive, sitePackagesDir, fullPath, includeBytecode)
   } else {
     const relativePath = path.relative(sitePackagesDir, fullPath)
     archive.append(fs.createReadStream(fullPath), relativePath)
+
+    // The bytecode of a single module package is in the __pycache__ of the site-packages
+    const cacheDir = path.join(sitePackagesDir, '__pycache__')
+    if (includeBytecode && fs.existsSync(cacheDir)) {
+      fs.readdirSync(cacheDir)
+        .filter((file) => file.startsWith(`${packageName}.`) && file.endsWith('.pyc'))
+        .forEach((file) => archive.append(fs.createReadStream(path.join(cacheDir, file)), `__pycache__/${file}`))
+    }
   }
 }
@@ -0,0 +1,71 @@
+"""Time a python-builder.py run on the given steps, against the builder of a baseline revision.
+
+    python benchmarks/python_builder.py --baseline <revision> [--python <venv>/bin/python] <step files>
+
+The builders run with the given interpreter, use the one of a virtual environment holding the packages
+the steps import to see the cost of classifying their imports.
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Tuple
+
+BUILDER_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'python-builder.py')
+
+def baseline_builder(revision: str) -> str:
+    """Write the builder of a git revision to a temporary file and return its path"""
+    cwd = os.path.dirname(BUILDER_PATH)
+    prefix = subprocess.check_output(['git', 'rev-parse', '--show-prefix'], cwd=cwd, text=True).strip()
+    source = subprocess.check_output(['git', 'show', f'{revision}:{prefix}python-builder.py'], cwd=cwd)
+
+    with tempfile.NamedTemporaryFile('wb', prefix='python-builder-', suffix='.py', delete=False) as f:
+        f.write(source)
+    return f.name
+
+def run_builder(python: str, builder: str, files: List[str]) -> Tuple[Dict[str, Any], float]:
+    """Run a builder the way the bundler does and return its output and the seconds it took"""
+    node, channel = socket.socketpair()
+    start = time.perf_counter()
+    process = subprocess.run(
+        [python, builder, *files],
+        env={**os.environ, 'NODE_CHANNEL_FD': str(channel.fileno())},
+        pass_fds=[channel.fileno()],
+        capture_output=True,
+    )
+    elapsed = time.perf_counter() - start
+    channel.close()
+
+    output = b''
+    while chunk := node.recv(1 << 16):
+        output += chunk
+    node.close()
+
+    if process.returncode != 0:
+        raise SystemExit(process.stderr.decode('utf-8'))
+    return json.loads(output), elapsed
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', required=True, help='git revision to compare with')
+    parser.add_argument('--python', default=sys.executable, help='interpreter running the builders')
+    parser.add_argument('--runs', type=int, default=3)
+    parser.add_argument('files', nargs='+', help='step files')
+    args = parser.parse_args()
+    files = [os.path.abspath(file) for file in args.files]
+
+    for name, builder in ((args.baseline, baseline_builder(args.baseline)), ('current', BUILDER_PATH)):
+        times = []
+        for _ in range(args.runs):
+            output, elapsed = run_builder(args.python, builder, files)
+            times.append(elapsed)
+
+        packages = sorted({package for step in output['steps'].values() for package in step})
+        print(f'{name:12} {min(times):6.2f}s  {len(packages)} packages: {", ".join(packages)}')
+
+if __name__ == '__main__':
+    main()
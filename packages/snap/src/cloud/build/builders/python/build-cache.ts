@@ -0,0 +1,323 @@
+import crypto from 'crypto'
+import colors from 'colors'
+import fs from 'fs'
+import path from 'path'
+import { Archiver } from '../archiver'
+import { assertSpliceable } from '../zip-splice'
+import { addPackageToArchive } from './add-package-to-archive'
+import { PackageReport, PythonBundler } from './bundler'
+
+const CACHE_VERSION = 1
+const SHA1 = /^[0-9a-f]{40}$/
+
+type PackagesEntry = {
+  key: string
+  packages: string[]
+}
+
+type StepBytecode = {
+  path: string
+  archivePath: string
+}
+
+type PackagesFile = {
+  version: number
+  entries: Record<string, PackagesEntry>
+}
+
+const hash = (...parts: (string | Buffer)[]): string => {
+  const digest = crypto.createHash('sha1')
+  parts.forEach((part) => digest.update(part))
+  return digest.digest('hex')
+}
+
+/**
+ * Hashes of the RECORD files of the distributions installed in a site-packages directory,
+ * RECORD lists every installed file with its own hash so it changes whenever the content does
+ */
+export class SitePackages {
+  private records?: Map<string, string>
+  private readonly packageRecords = new Map<string, string[]>()
+
+  constructor(private readonly dir: string) {}
+
+  /** Identifies everything installed in the directory */
+  fingerprint(): string {
+    const records = this.load()
+    return hash(...[...records.keys()].sort().map((distInfo) => `${distInfo}:${records.get(distInfo)}`))
+  }
+
+  /** Identifies the content of a top-level package, undefined when no installed RECORD lists it */
+  packageHash(packageName: string): string | undefined {
+    this.load()
+    const records = this.packageRecords.get(packageName)
+    return records ? hash(packageName, ...[...records].sort()) : undefined
+  }
+
+  private load(): Map<string, string> {
+    if (this.records) {
+      return this.records
+    }
+
+    this.records = new Map()
+    const distInfos = fs.existsSync(this.dir)
+      ? fs.readdirSync(this.dir).filter((name) => name.endsWith('.dist-info'))
+      : []
+
+    for (const distInfo of distInfos) {
+      let record: Buffer
+      try {
+        record = fs.readFileSync(path.join(this.dir, distInfo, 'RECORD'))
+      } catch {
+        continue
+      }
+
+      const recordHash = hash(record)
+      this.records.set(distInfo, recordHash)
+
+      const topLevel = new Set<string>()
+      for (const line of record.toString('utf-8').split('\n')) {
+        const [file] = line.split(',')
+        const [first, ...rest] = file.split('/')
+
+        if (!first || first.startsWith('..') || first.endsWith('.dist-info') || first === '__pycache__') {
+          continue
+        }
+
+        // a directory is a package, a top-level file like six.py or _cffi_backend.*.so is a module
+        topLevel.add(rest.length > 0 ? first : first.split('.')[0])
+      }
+
+      // namespace packages like google are shared by several distributions
+      topLevel.forEach((packageName) => {
+        const records = this.packageRecords.get(packageName) ?? []
+        records.push(recordHash)
+        this.packageRecords.set(packageName, records)
+      })
+    }
+
+    return this.records
+  }
+}
+
+/**
+ * Build cache of the Python steps stored in `<projectDir>/.motia/build-cache/python`.
+ *
+ * `packages.json` holds the packages traced for each step file, keyed by the content of the step file,
+ * of python-builder.py and of every installed distribution. `chunks` holds one compressed zip per package
+ * of the lambda site-packages, named after its content, which is spliced into the step bundles.
+ * With a bundler, the chunks are stripped and compiled, each with a report next to it, and `bytecode`
+ * holds the compiled step files.
+ */
+export class PythonBuildCache {
+  private readonly cacheDir: string
+  private readonly environment: SitePackages
+  private readonly lambdaSitePackages: SitePackages
+  private environmentHash?: string
+  private entries?: Record<string, PackagesEntry>
+  private readonly chunks = new Map<string, Promise<string | undefined>>()
+  private bundleHash?: string
+  private readonly warnings = new Set<string>()
+
+  constructor(
+    projectDir: string,
+    sitePackagesDir: string,
+    private readonly lambdaSitePackagesDir: string,
+    private readonly tracerPath: string,
+    private readonly bundler?: PythonBundler,
+  ) {
+    this.cacheDir = path.join(projectDir, '.motia', 'build-cache', 'python')
+    this.environment = new SitePackages(sitePackagesDir)
+    this.lambdaSitePackages = new SitePackages(lambdaSitePackagesDir)
+  }
+
+  getPackages(filePath: string): string[] | undefined {
+    const entry = this.load()[filePath]
+    return entry && entry.key === this.packagesKey(filePath) ? entry.packages : undefined
+  }
+
+  setPackages(filePath: string, packages: string[]) {
+    const key = this.packagesKey(filePath)
+
+    if (key) {
+      this.load()[filePath] = { key, packages }
+    }
+  }
+
+  save() {
+    if (!this.entries) {
+      return
+    }
+
+    const data: PackagesFile = { version: CACHE_VERSION, entries: this.entries }
+    const filePath = path.join(this.cacheDir, 'packages.json')
+    const tmpPath = `${filePath}.${process.pid}.tmp`
+
+    try {
+      fs.mkdirSync(this.cacheDir, { recursive: true })
+      fs.writeFileSync(tmpPath, JSON.stringify(data), 'utf-8')
+      fs.renameSync(tmpPath, filePath)
+    } catch {
+      // the cache is best effort, steps are traced again when it is missing
+    }
+  }
+
+  /** Returns the compressed zip of a package of the lambda site-packages, undefined when it can't be cached */
+  getPackageChunk(packageName: string): Promise<string | undefined> {
+    let chunk = this.chunks.get(packageName)
+
+    if (!chunk) {
+      chunk = this.createPackageChunk(packageName).catch((error) => this.warn(error))
+      this.chunks.set(packageName, chunk)
+    }
+
+    return chunk
+  }
+
+  /** Returns the size and import time of a package measured when its chunk was created */
+  async getPackageReport(packageName: string): Promise<PackageReport | undefined> {
+    const chunkPath = await this.getPackageChunk(packageName)
+
+    try {
+      return chunkPath ? JSON.parse(fs.readFileSync(chunkPath.replace(/\.zip$/, '.json'), 'utf-8')) : undefined
+    } catch {
+      return undefined
+    }
+  }
+
+  /** Returns the compiled bytecode of a step file, undefined when no bytecode is shipped */
+  async getStepBytecode(filePath: string, archivePath: string): Promise<StepBytecode | undefined> {
+    const bytecodeArchivePath = this.bundler?.bytecodePath(archivePath)
+
+    if (!this.bundler || !bytecodeArchivePath) {
+      return undefined
+    }
+
+    try {
+      const bytecodePath = await this.createStepBytecode(this.bundler, filePath, archivePath)
+      return { path: bytecodePath, archivePath: bytecodeArchivePath }
+    } catch (error) {
+      return this.warn(error as Error)
+    }
+  }
+
+  private async createStepBytecode(bundler: PythonBundler, filePath: string, archivePath: string): Promise<string> {
+    const bytecodeDir = path.join(this.cacheDir, 'bytecode')
+    const bytecodeName = hash(archivePath)
+    const bytecodePath = path.join(
+      bytecodeDir,
+      `${bytecodeName}-${hash(this.getBundleHash(bundler), archivePath, fs.readFileSync(filePath))}.pyc`,
+    )
+
+    if (!fs.existsSync(bytecodePath)) {
+      fs.mkdirSync(bytecodeDir, { recursive: true })
+      this.prune(bytecodeDir, bytecodeName, ['.pyc'])
+
+      const tmpPath = `${bytecodePath}.${process.pid}.tmp`
+      try {
+        await bundler.compileFile(filePath, tmpPath, archivePath)
+        fs.renameSync(tmpPath, bytecodePath)
+      } finally {
+        fs.rmSync(tmpPath, { force: true })
+      }
+    }
+
+    return bytecodePath
+  }
+
+  private async createPackageChunk(packageName: string): Promise<string | undefined> {
+    const packageHash = this.lambdaSitePackages.packageHash(packageName)
+
+    if (!packageHash) {
+      return undefined
+    }
+
+    const chunksDir = path.join(this.cacheDir, 'chunks')
+    const chunkHash = this.bundler ? hash(packageHash, this.getBundleHash(this.bundler)) : packageHash
+    const chunkPath = path.join(chunksDir, `${packageName}-${chunkHash}.zip`)
+
+    if (fs.existsSync(chunkPath)) {
+      return chunkPath
+    }
+
+    fs.mkdirSync(chunksDir, { recursive: true })
+
+    // chunks of the versions installed before are not used anymore
+    this.prune(chunksDir, packageName, ['.zip', '.json'])
+
+    const tmpPath = `${chunkPath}.${process.pid}.tmp`
+    const stagingDir = `${chunkPath}.${process.pid}.staging`
+    const archive = new Archiver(tmpPath)
+
+    try {
+      if (this.bundler) {
+        const report = await this.bundler.stagePackage(packageName, stagingDir)
+        await addPackageToArchive(archive, stagingDir, packageName, true)
+        const compressedSize = await archive.finalize()
+        assertSpliceable(tmpPath)
+        fs.writeFileSync(chunkPath.replace(/\.zip$/, '.json'), JSON.stringify({ ...report, compressedSize }), 'utf-8')
+      } else {
+        await addPackageToArchive(archive, this.lambdaSitePackagesDir, packageName)
+        await archive.finalize()
+        assertSpliceable(tmpPath)
+      }
+
+      fs.renameSync(tmpPath, chunkPath)
+    } finally {
+      fs.rmSync(tmpPath, { force: true })
+      fs.rmSync(stagingDir, { recursive: true, force: true })
+    }
+
+    return chunkPath
+  }
+
+  /** Removes the `<name>-<hash><extension>` files written for the other versions of `name` */
+  private prune(dir: string, name: string, extensions: string[]) {
+    const isVersion = (file: string) =>
+      file.startsWith(`${name}-`) &&
+      extensions.some(
+        (extension) => file.endsWith(extension) && SHA1.test(file.slice(name.length + 1, -extension.length)),
+      )
+
+    fs.readdirSync(dir)
+      .filter(isVersion)
+      .forEach((file) => fs.rmSync(path.join(dir, file), { force: true }))
+  }
+
+  private getBundleHash(bundler: PythonBundler): string {
+    // the bundle options and python-bundler.py decide what a chunk holds
+    this.bundleHash ??= hash(fs.readFileSync(bundler.scriptPath), JSON.stringify(bundler.options))
+    return this.bundleHash
+  }
+
+  private warn(error: Error): undefined {
+    // the packages and steps are then shipped as they are installed, the same failure is only reported once
+    if (!this.warnings.has(error.message)) {
+      this.warnings.add(error.message)
+      console.log(colors.yellow(`Warning: Python bundle not optimized: ${error.message}`))
+    }
+    return undefined
+  }
+
+  private packagesKey(filePath: string): string | undefined {
+    try {
+      this.environmentHash ??= hash(fs.readFileSync(this.tracerPath), this.environment.fingerprint())
+      return hash(this.environmentHash, fs.readFileSync(filePath))
+    } catch {
+      return undefined
+    }
+  }
+
+  private load(): Record<string, PackagesEntry> {
+    if (!this.entries) {
+      try {
+        const data: PackagesFile = JSON.parse(fs.readFileSync(path.join(this.cacheDir, 'packages.json'), 'utf-8'))
+        this.entries = data.version === CACHE_VERSION ? data.entries : {}
+      } catch {
+        this.entries = {}
+      }
+    }
+
+    return this.entries
+  }
+}
@@ -0,0 +1,138 @@
+import { spawn } from 'child_process'
+import path from 'path'
+
+export type PythonBundleOptions = {
+  /** Python version the bytecode is compiled for, no bytecode is shipped when it is not set */
+  target?: string
+  /** Optimization level of the bytecode, 1 removes asserts and 2 also removes docstrings */
+  optimize: number
+  /** Removes the tests, docs and type stubs of the packages */
+  strip: boolean
+  /** Measures the import time of each package */
+  report: boolean
+}
+
+export type PackageReport = {
+  sourceSize: number
+  size: number
+  files: number
+  compiled: number
+  compressedSize?: number
+  importTime?: number | null
+}
+
+type BundlerJob = Omit<PythonBundleOptions, 'target'> & {
+  target: string | null
+  sitePackages: string
+  packages: Record<string, string>
+  files: Record<string, [string, string]>
+}
+
+type BundlerData = {
+  packages: Record<string, PackageReport>
+  errors: Record<string, string>
+}
+
+/** Reads the bundle options of the Python steps, undefined when the packages are shipped as they are installed */
+export const getBundleOptions = (): PythonBundleOptions | undefined => {
+  const options: PythonBundleOptions = {
+    target: process.env.MOTIA_PYTHON_BYTECODE || undefined,
+    optimize: Number(process.env.MOTIA_PYTHON_BYTECODE_OPTIMIZE ?? 0),
+    strip: process.env.MOTIA_PYTHON_STRIP === 'true',
+    report: process.env.MOTIA_PYTHON_BUNDLE_REPORT === 'true',
+  }
+
+  if (options.target && !/^3\.\d+$/.test(options.target)) {
+    throw new Error(`MOTIA_PYTHON_BYTECODE must be a Python version like 3.13, got ${options.target}`)
+  }
+  if (![0, 1, 2].includes(options.optimize)) {
+    throw new Error(`MOTIA_PYTHON_BYTECODE_OPTIMIZE must be 0, 1 or 2, got ${options.optimize}`)
+  }
+
+  return options.target || options.strip || options.report ? options : undefined
+}
+
+/**
+ * Stages the packages and compiles the step files of the Python bundles with python-bundler.py,
+ * the requests made while the builds add their files are sent to a single run.
+ */
+export class PythonBundler {
+  readonly scriptPath = path.join(__dirname, 'python-bundler.py')
+  private batch?: { job: BundlerJob; result: Promise<BundlerData> }
+
+  constructor(
+    readonly options: PythonBundleOptions,
+    private readonly projectDir: string,
+    private readonly sitePackagesDir: string,
+  ) {}
+
+  /** Name of the bytecode file of a source for the target interpreter, e.g. `__pycache__/step.cpython-313.pyc` */
+  bytecodePath(sourcePath: string): string | undefined {
+    if (!this.options.target) {
+      return undefined
+    }
+
+    const { dir, name } = path.parse(sourcePath)
+    return path.join(dir, '__pycache__', `${name}.cpython-${this.options.target.replace('.', '')}.pyc`)
+  }
+
+  /** Copies a package of the site-packages to `outDir`, stripped and compiled */
+  async stagePackage(packageName: string, outDir: string): Promise<PackageReport> {
+    const { packages, errors } = await this.enqueue((job) => (job.packages[packageName] = outDir))
+
+    if (errors[packageName] || !packages[packageName]) {
+      throw new Error(errors[packageName] ?? `${packageName} was not staged`)
+    }
+    return packages[packageName]
+  }
+
+  /** Compiles a source file to `bytecodePath`, `archivePath` is where the source is in the bundle */
+  async compileFile(sourcePath: string, bytecodePath: string, archivePath: string): Promise<void> {
+    const { errors } = await this.enqueue((job) => (job.files[sourcePath] = [bytecodePath, archivePath]))
+
+    if (errors[sourcePath]) {
+      throw new Error(errors[sourcePath])
+    }
+  }
+
+  private enqueue(add: (job: BundlerJob) => void): Promise<BundlerData> {
+    if (!this.batch) {
+      const job: BundlerJob = {
+        ...this.options,
+        target: this.options.target ?? null,
+        sitePackages: this.sitePackagesDir,
+        packages: {},
+        files: {},
+      }
+      const result = new Promise((resolve) => setImmediate(resolve)).then(() => {
+        this.batch = undefined
+        return this.runPythonBundler(job)
+      })
+
+      this.batch = { job, result }
+    }
+
+    add(this.batch.job)
+    return this.batch.result
+  }
+
+  private async runPythonBundler(job: BundlerJob): Promise<BundlerData> {
+    return new Promise((resolve, reject) => {
+      const child = spawn('python', [this.scriptPath, JSON.stringify(job)], {
+        cwd: this.projectDir,
+        stdio: [undefined, undefined, 'pipe', 'ipc'],
+      })
+      const err: string[] = []
+
+      child.stderr?.on('data', (data) => err.push(data.toString()))
+      child.on('message', (data) => resolve(data as BundlerData))
+      child.on('close', (code) => {
+        if (code !== 0) {
+          reject(new Error(err.join('')))
+        } else {
+          reject(new Error(`python-bundler.py exited without a result: ${err.join('')}`))
+        }
+      })
+    })
+  }
+}
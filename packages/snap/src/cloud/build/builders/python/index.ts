@@ -7,41 +7,102 @@ import { Builder, RouterBuildResult, StepBuilder } from '../../builder'
 import { Archiver } from '../archiver'
 import { includeStaticFiles } from '../include-static-files'
 import { addPackageToArchive } from './add-package-to-archive'
+import { PythonBuildCache } from './build-cache'
+import { getBundleOptions, PackageReport, PythonBundler } from './bundler'
 import { BuildListener } from '../../../new-deployment/listeners/listener.types'
-import { distDir } from '../../../new-deployment/constants'
+import { distDir, pythonPackagesReportPath } from '../../../new-deployment/constants'
+
+type PythonBuilderData = {
+  steps: Record<string, string[]>
+  errors: Record<string, string>
+}
 
 export class PythonBuilder implements StepBuilder {
+  // Packages of each step file, traced once and shared by its step bundle and the API router
+  private readonly packages = new Map<string, Promise<string[]>>()
+  private readonly cache: PythonBuildCache
+  private readonly bundler?: PythonBundler
+  // Size and import time of the packages added to the bundles so far
+  private readonly packageReports: Record<string, PackageReport> = {}
+
   constructor(
     private readonly builder: Builder,
     private readonly listener: BuildListener,
   ) {
     activatePythonVenv({ baseDir: this.builder.projectDir })
+
+    const bundleOptions = getBundleOptions()
+    const lambdaSitePackages = `${process.env.PYTHON_SITE_PACKAGES}-lambda`
+
+    if (bundleOptions) {
+      this.bundler = new PythonBundler(bundleOptions, this.builder.projectDir, lambdaSitePackages)
+    }
+
+    this.cache = new PythonBuildCache(
+      this.builder.projectDir,
+      `${process.env.PYTHON_SITE_PACKAGES}`,
+      lambdaSitePackages,
+      path.join(__dirname, 'python-builder.py'),
+      this.bundler,
+    )
+  }
+
+  private async addPackage(archive: Archiver, packageName: string): Promise<void> {
+    const chunk = await this.cache.getPackageChunk(packageName)
+
+    if (!chunk) {
+      await addPackageToArchive(archive, `${process.env.PYTHON_SITE_PACKAGES}-lambda`, packageName)
+      return
+    }
+
+    archive.appendZip(chunk)
+
+    const report = this.bundler?.options.report && (await this.cache.getPackageReport(packageName))
+    if (report) {
+      this.packageReports[packageName] = report
+    }
+  }
+
+  private writePackageReport() {
+    if (this.bundler?.options.report) {
+      const packages = Object.fromEntries(Object.entries(this.packageReports).sort(([a], [b]) => a.localeCompare(b)))
+      fs.writeFileSync(pythonPackagesReportPath, JSON.stringify({ ...this.bundler.options, packages }, null, 2))
+    }
   }
 
   private async buildStep(step: Step, archive: Archiver): Promise<string> {
     const entrypointPath = step.filePath.replace(this.builder.projectDir, '')
     const normalizedEntrypointPath = entrypointPath.replace(/[.]step.py$/, '_step.py')
-    const sitePackagesDir = `${process.env.PYTHON_SITE_PACKAGES}-lambda`
 
     // Get Python builder response
-    const { packages } = await this.getPythonBuilderData(step)
+    const packages = await this.getPackages(step)
 
     // Add main file to archive
     if (!fs.existsSync(step.filePath)) {
       throw new Error(`Source file not found: ${step.filePath}`)
     }
 
-    archive.append(fs.createReadStream(step.filePath), path.relative(this.builder.projectDir, normalizedEntrypointPath))
+    const archivePath = path.relative(this.builder.projectDir, normalizedEntrypointPath)
+    archive.append(fs.createReadStream(step.filePath), archivePath)
+
+    const bytecode = await this.cache.getStepBytecode(step.filePath, archivePath)
+    if (bytecode) {
+      archive.append(fs.createReadStream(bytecode.path), bytecode.archivePath)
+    }
 
-    await Promise.all(packages.map(async (packageName) => addPackageToArchive(archive, sitePackagesDir, packageName)))
+    await Promise.all(packages.map(async (packageName) => this.addPackage(archive, packageName)))
 
     return normalizedEntrypointPath
   }
 
+  prepare(steps: Step[]): void {
+    // Every step is traced by a single python-builder.py run, the builds wait for its result
+    this.tracePackages(steps.map((step) => step.filePath))
+  }
+
   async build(step: Step): Promise<void> {
     const entrypointPath = step.filePath.replace(this.builder.projectDir, '')
     const bundlePath = path.join('python', entrypointPath.replace(/(.*)\.py$/, '$1.zip'))
-    const normalizedEntrypointPath = entrypointPath.replace(/[.]step.py$/, '_step.py')
     const outfile = path.join(distDir, bundlePath)
 
     try {
@@ -49,36 +110,21 @@ export class PythonBuilder implements StepBuilder {
       fs.mkdirSync(path.dirname(outfile), { recursive: true })
       this.listener.onBuildStart(step)
 
-      // Get Python builder response
-      const { packages } = await this.getPythonBuilderData(step)
+      // Add the step file, its packages and all imported files to archive
+      this.listener.onBuildProgress(step, 'Adding imported files to archive...')
       const stepArchiver = new Archiver(outfile)
       const stepPath = await this.buildStep(step, stepArchiver)
 
-      // Add main file to archive
-      if (!fs.existsSync(step.filePath)) {
-        throw new Error(`Source file not found: ${step.filePath}`)
-      }
-
-      stepArchiver.append(
-        fs.createReadStream(step.filePath),
-        path.relative(this.builder.projectDir, normalizedEntrypointPath),
-      )
-
-      // Add all imported files to archive
-      this.listener.onBuildProgress(step, 'Adding imported files to archive...')
-      const sitePackagesDir = `${process.env.PYTHON_SITE_PACKAGES}-lambda`
-
       includeStaticFiles([step], this.builder, stepArchiver)
 
+      const packages = await this.getPackages(step)
       if (packages.length > 0) {
-        await Promise.all(
-          packages.map(async (packageName) => addPackageToArchive(stepArchiver, sitePackagesDir, packageName)),
-        )
         this.listener.onBuildProgress(step, `Added ${packages.length} packages to archive`)
       }
 
       // Finalize the archive and wait for completion
       const size = await stepArchiver.finalize()
+      this.writePackageReport()
 
       this.builder.registerStep({ entrypointPath: stepPath, bundlePath, step, type: 'python' })
       this.listener.onBuildEnd(step, size)
@@ -100,10 +146,7 @@ export class PythonBuilder implements StepBuilder {
     const zipName = 'router-python.zip'
     const archive = new Archiver(path.join(distDir, zipName))
     const dependencies = ['uvicorn', 'pydantic', 'pydantic_core', 'uvloop', 'starlette', 'typing_inspection']
-    const lambdaSitePackages = `${process.env.PYTHON_SITE_PACKAGES}-lambda`
-    await Promise.all(
-      dependencies.map(async (packageName) => addPackageToArchive(archive, lambdaSitePackages, packageName)),
-    )
+    await Promise.all(dependencies.map(async (packageName) => this.addPackage(archive, packageName)))
 
     for (const step of steps) {
       await this.buildStep(step, archive)
@@ -136,23 +179,64 @@ export class PythonBuilder implements StepBuilder {
 
     // Finalize the archive and wait for completion
     const size = await archive.finalize()
+    this.writePackageReport()
 
     return { size, path: zipName }
   }
 
-  private async getPythonBuilderData(step: Step): Promise<{ file: string; files: string[]; packages: string[] }> {
+  private getPackages(step: Step): Promise<string[]> {
+    const [packages] = this.tracePackages([step.filePath])
+    return packages
+  }
+
+  private tracePackages(filePaths: string[]): Promise<string[]>[] {
+    const untraced = filePaths.filter((filePath) => !this.packages.has(filePath))
+    const uncached = untraced.filter((filePath) => {
+      const packages = this.cache.getPackages(filePath)
+      if (packages) {
+        this.packages.set(filePath, Promise.resolve(packages))
+      }
+      return !packages
+    })
+
+    if (uncached.length > 0) {
+      const traced = this.runPythonBuilder(uncached).then((data) => {
+        Object.entries(data.steps).forEach(([filePath, packages]) => this.cache.setPackages(filePath, packages))
+        this.cache.save()
+        return data
+      })
+
+      uncached.forEach((filePath) => {
+        const packages = traced.then(({ steps, errors }) => {
+          if (errors[filePath]) {
+            throw new Error(errors[filePath])
+          }
+          return steps[filePath] ?? []
+        })
+        // Errors are reported by the build of the step once it waits for its packages
+        packages.catch(() => {})
+        this.packages.set(filePath, packages)
+      })
+    }
+
+    return filePaths.map((filePath) => this.packages.get(filePath) as Promise<string[]>)
+  }
+
+  private async runPythonBuilder(filePaths: string[]): Promise<PythonBuilderData> {
     return new Promise((resolve, reject) => {
-      const child = spawn('python', [path.join(__dirname, 'python-builder.py'), step.filePath], {
+      const child = spawn('python', [path.join(__dirname, 'python-builder.py'), ...filePaths], {
         cwd: this.builder.projectDir,
         stdio: [undefined, undefined, 'pipe', 'ipc'],
       })
       const err: string[] = []
 
-      child.on('stderr', (data) => err.push(data.toString()))
-      child.on('message', resolve)
+      child.stderr?.on('data', (data) => err.push(data.toString()))
+      child.on('message', (data) => resolve(data as PythonBuilderData))
       child.on('close', (code) => {
         if (code !== 0) {
           reject(new Error(err.join('')))
+        } else {
+          reject(new Error(`python-builder.py exited without tracing the steps: ${err.join('')}`))
         }
       })
     })
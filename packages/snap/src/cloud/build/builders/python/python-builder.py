@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import importlib.machinery
 import importlib.util
 import traceback
 import site
@@ -8,15 +9,16 @@ import builtins
 import ast
 import importlib.metadata
 import subprocess
+import sysconfig
 import re
-from typing import Set, List, Tuple, Optional, Dict, Any
+from typing import FrozenSet, Set, List, Tuple, Optional, Dict, Any
 from pathlib import Path
 from functools import lru_cache
 
 NODEIPCFD = int(os.environ["NODE_CHANNEL_FD"])
 
-# Cache for built-in modules to avoid repeated checks
-_builtin_modules_cache: Set[str] = set()
+# Standard library and built-in modules of the running interpreter, the list is available from Python 3.10
+STDLIB_MODULES: FrozenSet[str] = frozenset(getattr(sys, 'stdlib_module_names', ())) | frozenset(sys.builtin_module_names)
 
 @lru_cache(maxsize=1024)
 def is_valid_package_name(name: str) -> bool:
@@ -77,30 +79,31 @@ def is_package_installed(package_name: str) -> bool:
     except importlib.metadata.PackageNotFoundError:
         return False
 
+@lru_cache(maxsize=1024)
+def find_module_spec(module_name: str) -> Optional[importlib.machinery.ModuleSpec]:
+    """Find where a top-level module would be loaded from, without importing it."""
+    try:
+        return importlib.util.find_spec(module_name)
+    except (ImportError, ValueError):
+        return None
+
 @lru_cache(maxsize=1024)
 def is_builtin_module(module_name: str) -> bool:
-    """Check if a module is a Python built-in module."""
-    if module_name in _builtin_modules_cache:
+    """Check if a module is a Python built-in module, without importing it."""
+    if module_name in STDLIB_MODULES:
         return True
-        
-    try:
-        module = importlib.import_module(module_name)
-        
-        # Built-in modules either have no __file__ attribute or their file is in the standard library
-        if not hasattr(module, '__file__'):
-            _builtin_modules_cache.add(module_name)
-            return True
-            
-        # Get the standard library path
-        stdlib_path = os.path.dirname(os.__file__)
-        
-        # Check if the module's file is in the standard library
-        is_builtin = module.__file__ and module.__file__.startswith(stdlib_path)
-        if is_builtin:
-            _builtin_modules_cache.add(module_name)
-        return is_builtin
-    except ImportError:
+    if hasattr(sys, 'stdlib_module_names'):
+        return False
+
+    # Older interpreters have no list of the standard library, check where the module would be loaded from
+    spec = find_module_spec(module_name)
+    if spec is None:
         return False
+    if spec.origin in ('built-in', 'frozen'):
+        return True
+
+    origin = spec.origin or ''
+    return origin.startswith(sysconfig.get_paths()['stdlib']) and 'site-packages' not in origin
 
 def get_direct_imports(file_path: str) -> Set[str]:
     """Extract direct imports from a Python file using AST parsing."""
@@ -132,48 +135,80 @@ def is_optional_dependency(req: str) -> bool:
     """Check if a dependency is an optional dependency."""
     return '[' in req or 'extra ==' in req
 
-def get_package_dependencies(package_name: str, processed: Set[str] = None) -> Set[str]:
-    """Get all dependencies (including sub-dependencies) for a given package."""
-    if processed is None:
-        processed = set()
-    
-    if package_name in processed or is_builtin_module(package_name):
-        return set()
-    
-    processed.add(package_name)
-    all_dependencies = set()
-    
-    try:
-        # Try to get the distribution
+@lru_cache(maxsize=1024)
+def normalize_distribution_name(name: str) -> str:
+    """Normalize a distribution name so the spellings used by requirements and metadata compare equal."""
+    return re.sub(r'[-_.]+', '-', name).lower()
+
+@lru_cache(maxsize=None)
+def get_distribution_modules() -> Tuple[Dict[str, List[str]], Dict[str, List[str]]]:
+    """Map top-level modules to the distributions installing them and back, read once from the metadata."""
+    module_distributions = importlib.metadata.packages_distributions()
+    distribution_modules: Dict[str, List[str]] = {}
+
+    for module_name, dist_names in module_distributions.items():
+        for dist_name in dist_names:
+            distribution_modules.setdefault(normalize_distribution_name(dist_name), []).append(module_name)
+
+    return module_distributions, distribution_modules
+
+def get_required_modules(requirement: str) -> List[str]:
+    """Get the top-level modules installed by a required distribution, empty when it is not installed."""
+    base_pkg = extract_base_package_name(requirement)
+    if not base_pkg:
+        return []
+
+    _, distribution_modules = get_distribution_modules()
+    modules = distribution_modules.get(normalize_distribution_name(base_pkg))
+    if modules is not None:
+        return [module_name for module_name in modules if is_valid_package_name(module_name)]
+
+    # Distributions installed without a file list, try both hyphenated and non-hyphenated versions
+    for dep_name in [base_pkg, base_pkg.replace('-', '_'), base_pkg.replace('_', '-')]:
+        if find_module_spec(dep_name) is not None:
+            return [dep_name]
+    return []
+
+@lru_cache(maxsize=None)
+def get_direct_dependencies(package_name: str) -> Tuple[str, ...]:
+    """Get the installed packages a package requires, its metadata is only read once for all the steps."""
+    if is_builtin_module(package_name):
+        return ()
+
+    module_distributions, _ = get_distribution_modules()
+    dependencies: List[str] = []
+
+    for dist_name in module_distributions.get(package_name, [package_name]):
         try:
-            dist = importlib.metadata.distribution(package_name)
+            dist = importlib.metadata.distribution(dist_name)
         except importlib.metadata.PackageNotFoundError:
             print(f'Warning: Package {package_name} not found')
-            return all_dependencies
+            continue
 
-        # Filter out optional dependencies
-        sub_dependencies = list(filter(lambda dep: not is_optional_dependency(dep), dist.requires or []))
-        
-        # Get direct dependencies
-        for req in sub_dependencies:                
-            base_pkg = extract_base_package_name(req)
-            
-            if base_pkg and base_pkg not in processed:
-                # Try both hyphenated and non-hyphenated versions
-                for dep_name in [base_pkg, base_pkg.replace('-', '_'), base_pkg.replace('_', '-')]:
-                    try:
-                        importlib.import_module(dep_name)
-                        all_dependencies.add(dep_name)
-                        # Recursively get sub-dependencies
-                        all_dependencies.update(get_package_dependencies(dep_name, processed))
-                        break
-                    except ImportError:
-                        continue
-            
-    except Exception as e:
-        print(f"Warning: Error processing {package_name}: {str(e)}")
-    
-    return all_dependencies
+        try:
+            # Filter out optional dependencies
+            for req in filter(lambda dep: not is_optional_dependency(dep), dist.requires or []):
+                for dep_name in get_required_modules(req):
+                    if dep_name not in dependencies:
+                        dependencies.append(dep_name)
+        except Exception as e:
+            print(f"Warning: Error processing {package_name}: {str(e)}")
+
+    return tuple(dependencies)
+
+@lru_cache(maxsize=None)
+def get_package_dependencies(package_name: str) -> FrozenSet[str]:
+    """Get all dependencies (including sub-dependencies) for a given package, shared by the steps importing it."""
+    all_dependencies: Set[str] = set()
+    queue = [package_name]
+
+    while queue:
+        for dep_name in get_direct_dependencies(queue.pop()):
+            if dep_name != package_name and dep_name not in all_dependencies:
+                all_dependencies.add(dep_name)
+                queue.append(dep_name)
+
+    return frozenset(all_dependencies)
 
 def trace_imports(entry_file: str) -> List[str]:
     """Find all imported Python packages and files starting from an entry file."""
@@ -188,14 +223,13 @@ def trace_imports(entry_file: str) -> List[str]:
     
     # Initialize sets to track packages
     all_packages = set()
-    processed_packages = set()
     
     # Process each direct import and its dependencies
     for package_name in direct_imports:
         if is_valid_package_name(package_name):
             all_packages.add(package_name)
             # Get all dependencies including sub-dependencies
-            all_packages.update(get_package_dependencies(package_name, processed_packages))
+            all_packages.update(get_package_dependencies(package_name))
     
     # Filter out built-in packages
     non_builtin_packages = {pkg for pkg in all_packages if not is_builtin_module(pkg)}
@@ -203,24 +237,29 @@ def trace_imports(entry_file: str) -> List[str]:
     return sorted(list(non_builtin_packages))
 
 def main() -> None:
-    """Main entry point for the script."""
-    if len(sys.argv) != 2:
-        print("Usage: python python-builder.py <entry_file>", file=sys.stderr)
+    """Main entry point for the script, traces every entry file and sends their packages in one message."""
+    if len(sys.argv) < 2:
+        print("Usage: python python-builder.py <entry_file> [<entry_file> ...]", file=sys.stderr)
         sys.exit(1)
 
-    entry_file = sys.argv[1]
-    try:
-        packages = trace_imports(entry_file)
-        output = {
-            'packages': packages
-        }
-        bytes_message = (json.dumps(output) + '\n').encode('utf-8')
-        os.write(NODEIPCFD, bytes_message)
-        sys.exit(0)
-    except Exception as e:
-        print(f"Error: {str(e)}", file=sys.stderr)
-        traceback.print_exc(file=sys.stderr)
-        sys.exit(3)
+    steps: Dict[str, List[str]] = {}
+    errors: Dict[str, str] = {}
+
+    for entry_file in sys.argv[1:]:
+        try:
+            steps[entry_file] = trace_imports(entry_file)
+        except Exception as e:
+            print(f"Error: {entry_file}: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            errors[entry_file] = str(e)
+
+    output = {
+        'steps': steps,
+        'errors': errors
+    }
+    bytes_message = (json.dumps(output) + '\n').encode('utf-8')
+    os.write(NODEIPCFD, bytes_message)
+    sys.exit(0)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,170 @@
+import os
+import sys
+import json
+import shutil
+import subprocess
+import py_compile
+import importlib.util
+import traceback
+from typing import Any, Dict, List, Optional, Tuple
+
+NODEIPCFD = int(os.environ["NODE_CHANNEL_FD"])
+
+# Directories and files of installed packages that are never used when the package is imported
+STRIPPED_DIRS = frozenset({'tests', 'test', 'docs', 'doc', 'examples'})
+STRIPPED_SUFFIXES = ('.pyi',)
+
+# Imports a package in a fresh interpreter without the site-packages of the environment running the build
+IMPORT_TIMER = (
+    "import importlib, sys, time; sys.path[:0] = sys.argv[2:]; start = time.perf_counter(); "
+    "importlib.import_module(sys.argv[1]); print(time.perf_counter() - start)"
+)
+IMPORT_TIMEOUT = 60
+
+def check_target(target: Optional[str]) -> None:
+    """Check that the running interpreter writes bytecode the target interpreter loads."""
+    if target is None:
+        return
+
+    running = f'{sys.version_info[0]}.{sys.version_info[1]}'
+    if sys.implementation.cache_tag != f"cpython-{target.replace('.', '')}":
+        raise RuntimeError(
+            f'Bytecode for Python {target} can not be compiled by {sys.implementation.name} {running}, '
+            f'build with a Python {target} environment or change MOTIA_PYTHON_BYTECODE'
+        )
+
+def compile_file(source: str, cfile: str, dfile: str, optimize: int) -> bool:
+    """Compile a source file to bytecode loaded without checking the source, the archives don't keep its mtime."""
+    try:
+        py_compile.compile(
+            source,
+            cfile=cfile,
+            dfile=dfile,
+            doraise=True,
+            optimize=optimize,
+            invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+        )
+        return True
+    except py_compile.PyCompileError:
+        # Files like templates or Python 2 fixtures are shipped as they are
+        return False
+
+def get_bytecode_path(source: str) -> str:
+    """Path the target interpreter loads the bytecode of a source from, it runs without -O."""
+    return importlib.util.cache_from_source(source, optimization='')
+
+def get_tree_size(path: str) -> int:
+    """Size of a file or of all the files of a directory."""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names
+    )
+
+def measure_import_time(package_name: str, paths: List[str]) -> Optional[float]:
+    """Milliseconds it takes to import a package in a new interpreter, None when it can't be imported here."""
+    try:
+        result = subprocess.run(
+            [sys.executable, '-S', '-c', IMPORT_TIMER, package_name, *paths],
+            capture_output=True,
+            text=True,
+            timeout=IMPORT_TIMEOUT,
+            env={**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'},
+        )
+        lines = result.stdout.strip().splitlines()
+        if result.returncode != 0 or not lines:
+            return None
+        return round(float(lines[-1]) * 1000, 1)
+    except (subprocess.TimeoutExpired, ValueError):
+        return None
+
+def iter_package_files(source: str, strip: bool) -> List[Tuple[str, str]]:
+    """List the files of an installed package to ship as (path, path relative to the package) pairs."""
+    if os.path.isfile(source):
+        return [(source, os.path.basename(source))]
+
+    files = []
+    for root, dirs, names in os.walk(source):
+        # Bytecode in site-packages was written for the interpreter that installed it
+        dirs[:] = [name for name in dirs if name != '__pycache__' and not (strip and name in STRIPPED_DIRS)]
+        for name in names:
+            if name.endswith('.pyc') or (strip and name.endswith(STRIPPED_SUFFIXES)):
+                continue
+            path = os.path.join(root, name)
+            files.append((path, os.path.relpath(path, os.path.dirname(source))))
+    return files
+
+def stage_package(site_packages: str, package_name: str, out_dir: str, job: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy a package to out_dir, stripped and compiled for the target, and report its size."""
+    source = os.path.join(site_packages, package_name)
+    if not os.path.exists(source):
+        source = f'{source}.py'
+    if not os.path.exists(source):
+        raise FileNotFoundError(f'Package not found in site-packages: {package_name}')
+
+    size = 0
+    files = 0
+    compiled = 0
+
+    for path, relative_path in iter_package_files(source, job['strip']):
+        staged_path = os.path.join(out_dir, relative_path)
+        os.makedirs(os.path.dirname(staged_path), exist_ok=True)
+        shutil.copyfile(path, staged_path)
+        size += os.path.getsize(staged_path)
+        files += 1
+
+        if job['target'] and staged_path.endswith('.py'):
+            bytecode_path = get_bytecode_path(staged_path)
+            if compile_file(staged_path, bytecode_path, relative_path, job['optimize']):
+                size += os.path.getsize(bytecode_path)
+                files += 1
+                compiled += 1
+
+    report: Dict[str, Any] = {
+        'sourceSize': get_tree_size(source),
+        'size': size,
+        'files': files,
+        'compiled': compiled,
+    }
+    if job['report']:
+        report['importTime'] = measure_import_time(package_name, [out_dir, site_packages])
+    return report
+
+def main() -> None:
+    """Main entry point for the script, stages the packages and compiles the files of a job in one message."""
+    if len(sys.argv) != 2:
+        print("Usage: python python-bundler.py <job>", file=sys.stderr)
+        sys.exit(1)
+
+    job = json.loads(sys.argv[1])
+    packages: Dict[str, Dict[str, Any]] = {}
+    errors: Dict[str, str] = {}
+
+    try:
+        check_target(job['target'])
+    except RuntimeError as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        sys.exit(1)
+
+    for package_name, out_dir in job['packages'].items():
+        try:
+            packages[package_name] = stage_package(job['sitePackages'], package_name, out_dir, job)
+        except Exception as e:
+            print(f"Error: {package_name}: {str(e)}", file=sys.stderr)
+            traceback.print_exc(file=sys.stderr)
+            errors[package_name] = str(e)
+
+    for source, (cfile, dfile) in job['files'].items():
+        if not compile_file(source, cfile, dfile, job['optimize']):
+            errors[source] = f'Could not compile {dfile}'
+
+    output = {
+        'packages': packages,
+        'errors': errors
+    }
+    bytes_message = (json.dumps(output) + '\n').encode('utf-8')
+    os.write(NODEIPCFD, bytes_message)
+    sys.exit(0)
+
+if __name__ == "__main__":
+    main()
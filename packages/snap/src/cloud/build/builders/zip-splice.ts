@@ -0,0 +1,178 @@
+import fs from 'fs'
+
+const END_OF_CENTRAL_DIRECTORY = 0x06054b50
+const ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR = 0x07064b50
+const CENTRAL_DIRECTORY_HEADER = 0x02014b50
+const END_OF_CENTRAL_DIRECTORY_SIZE = 22
+const CENTRAL_DIRECTORY_HEADER_SIZE = 46
+const MAX_ENTRIES = 0xffff
+const MAX_OFFSET = 0xffffffff
+const COPY_BUFFER_SIZE = 1024 * 1024
+
+type CentralDirectory = {
+  entries: number
+  offset: number
+  size: number
+}
+
+const readCentralDirectory = (zip: Buffer): CentralDirectory => {
+  const searchStart = Math.max(0, zip.length - END_OF_CENTRAL_DIRECTORY_SIZE - 0xffff)
+
+  for (let position = zip.length - END_OF_CENTRAL_DIRECTORY_SIZE; position >= searchStart; position--) {
+    if (zip.readUInt32LE(position) !== END_OF_CENTRAL_DIRECTORY) {
+      continue
+    }
+
+    const entries = zip.readUInt16LE(position + 10)
+    const size = zip.readUInt32LE(position + 12)
+    const offset = zip.readUInt32LE(position + 16)
+    const isZip64 =
+      entries === MAX_ENTRIES ||
+      size === MAX_OFFSET ||
+      offset === MAX_OFFSET ||
+      (position >= 20 && zip.readUInt32LE(position - 20) === ZIP64_END_OF_CENTRAL_DIRECTORY_LOCATOR)
+
+    if (isZip64) {
+      throw new Error('ZIP64 archives can not be spliced')
+    }
+
+    return { entries, offset, size }
+  }
+
+  throw new Error('End of central directory not found')
+}
+
+/**
+ * Returns the central directory of a zip with the local header offsets moved by `shift`,
+ * the local entries are copied as they are so their compressed data is never touched
+ */
+const shiftCentralDirectory = (headers: Buffer, entries: number, shift: number): Buffer => {
+  const shifted = Buffer.from(headers)
+  let position = 0
+
+  for (let entry = 0; entry < entries; entry++) {
+    if (
+      position + CENTRAL_DIRECTORY_HEADER_SIZE > shifted.length ||
+      shifted.readUInt32LE(position) !== CENTRAL_DIRECTORY_HEADER
+    ) {
+      throw new Error('Invalid central directory header')
+    }
+
+    const localHeaderOffset = shifted.readUInt32LE(position + 42)
+    if (localHeaderOffset === MAX_OFFSET || shifted.readUInt32LE(position + 20) === MAX_OFFSET) {
+      throw new Error('ZIP64 archives can not be spliced')
+    }
+
+    shifted.writeUInt32LE(localHeaderOffset + shift, position + 42)
+    position +=
+      CENTRAL_DIRECTORY_HEADER_SIZE +
+      shifted.readUInt16LE(position + 28) +
+      shifted.readUInt16LE(position + 30) +
+      shifted.readUInt16LE(position + 32)
+  }
+
+  return shifted
+}
+
+type ZipFile = CentralDirectory & {
+  headers: Buffer
+}
+
+/** Reads the central directory of a zip, without reading its entries */
+const readZipFile = (zipPath: string): ZipFile => {
+  const fd = fs.openSync(zipPath, 'r')
+
+  try {
+    const { size: fileSize } = fs.fstatSync(fd)
+    const tail = Buffer.alloc(Math.min(fileSize, END_OF_CENTRAL_DIRECTORY_SIZE + 0xffff))
+    fs.readSync(fd, tail, 0, tail.length, fileSize - tail.length)
+
+    const directory = readCentralDirectory(tail)
+    if (directory.offset + directory.size > fileSize) {
+      throw new Error(`Invalid central directory in ${zipPath}`)
+    }
+
+    const headers = Buffer.alloc(directory.size)
+    fs.readSync(fd, headers, 0, headers.length, directory.offset)
+
+    return { ...directory, headers: shiftCentralDirectory(headers, directory.entries, 0) }
+  } finally {
+    fs.closeSync(fd)
+  }
+}
+
+const copyRange = (fromPath: string, length: number, fd: number, position: number) => {
+  const from = fs.openSync(fromPath, 'r')
+  const buffer = Buffer.alloc(Math.min(length, COPY_BUFFER_SIZE))
+
+  try {
+    for (let copied = 0; copied < length; ) {
+      const read = fs.readSync(from, buffer, 0, Math.min(buffer.length, length - copied), copied)
+      if (read === 0) {
+        throw new Error(`${fromPath} ended before its central directory`)
+      }
+
+      fs.writeSync(fd, buffer, 0, read, position + copied)
+      copied += read
+    }
+  } finally {
+    fs.closeSync(from)
+  }
+}
+
+/** Throws when the zip can't be spliced into another one */
+export const assertSpliceable = (zipPath: string): void => {
+  readZipFile(zipPath)
+}
+
+/**
+ * Appends the entries of `zipPaths` to the zip at `filePath` without decompressing them,
+ * returns the size of the resulting zip
+ */
+export const spliceZips = (filePath: string, zipPaths: string[]): number => {
+  const base = readZipFile(filePath)
+  const zips = zipPaths.map((zipPath) => ({ zipPath, ...readZipFile(zipPath) }))
+  const centralDirectories = [base.headers]
+  let offset = base.offset
+  let entries = base.entries
+
+  // Every zip is read before the base is touched, it is left as it is when one can't be spliced
+  for (const zip of zips) {
+    centralDirectories.push(shiftCentralDirectory(zip.headers, zip.entries, offset))
+    // Everything before the central directory is the local entries
+    offset += zip.offset
+    entries += zip.entries
+  }
+
+  const centralDirectory = Buffer.concat(centralDirectories)
+
+  if (entries >= MAX_ENTRIES || offset + centralDirectory.length >= MAX_OFFSET) {
+    throw new Error(`${filePath} is too large for a zip without ZIP64`)
+  }
+
+  const end = Buffer.alloc(END_OF_CENTRAL_DIRECTORY_SIZE)
+  end.writeUInt32LE(END_OF_CENTRAL_DIRECTORY, 0)
+  end.writeUInt16LE(entries, 8)
+  end.writeUInt16LE(entries, 10)
+  end.writeUInt32LE(centralDirectory.length, 12)
+  end.writeUInt32LE(offset, 16)
+
+  const fd = fs.openSync(filePath, 'r+')
+
+  try {
+    let position = base.offset
+
+    for (const zip of zips) {
+      copyRange(zip.zipPath, zip.offset, fd, position)
+      position += zip.offset
+    }
+
+    fs.writeSync(fd, centralDirectory, 0, centralDirectory.length, position)
+    fs.writeSync(fd, end, 0, end.length, position + centralDirectory.length)
+    fs.ftruncateSync(fd, position + centralDirectory.length + end.length)
+
+    return position + centralDirectory.length + end.length
+  } finally {
+    fs.closeSync(fd)
+  }
+}
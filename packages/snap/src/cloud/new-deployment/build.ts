@@ -34,6 +34,7 @@ export const build = async (listener: BuildListener): Promise<Builder> => {
     throw new Error('Project contains invalid steps, please fix them before building')
   }
 
+  builder.prepareSteps(lockedData.activeSteps)
   await Promise.all(lockedData.activeSteps.map((step) => builder.buildStep(step)))
   await builder.buildApiSteps(lockedData.activeSteps.filter(isApiStep))
 
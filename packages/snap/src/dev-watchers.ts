@@ -1,4 +1,5 @@
 import {
+  ConfigCache,
   CronManager,
   isApiStep,
   isCronStep,
@@ -20,7 +21,7 @@ export const createDevWatchers = (
   cronManager: CronManager,
 ) => {
   const stepDir = path.join(process.cwd(), 'steps')
-  const watcher = new Watcher(stepDir, lockedData)
+  const watcher = new Watcher(stepDir, lockedData, new ConfigCache(process.cwd()))
 
   watcher.onStreamChange((oldStream: Stream, stream: Stream) => {
     trackEvent('stream_updated', {
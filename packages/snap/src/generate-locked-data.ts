@@ -1,4 +1,4 @@
-import { LockedData, Step, getStepConfig, getStreamConfig } from '@motiadev/core'
+import { ConfigCache, LockedData, Step, getStepConfigs, getStreamConfigs } from '@motiadev/core'
 import { NoPrinter, Printer } from '@motiadev/core/dist/src/printer'
 import { randomUUID } from 'crypto'
 import { globSync } from 'glob'
@@ -23,8 +23,14 @@ export const collectFlows = async (projectDir: string, lockedData: LockedData):
     ...globSync(path.join(projectDir, '{steps,streams}/**/*_stream.{ts,js,py}')),
   ]
 
-  for (const filePath of stepFiles) {
-    const config = await getStepConfig(filePath)
+  const cache = new ConfigCache(projectDir)
+  const stepConfigs = await getStepConfigs(stepFiles, { cache })
+  const streamConfigs = await getStreamConfigs(streamFiles, { cache })
+
+  for (const { filePath, config, error } of stepConfigs) {
+    if (error) {
+      throw new Error(`Failed to read config of step ${filePath}: ${error}`)
+    }
 
     if (!config) {
       console.warn(`No config found in step ${filePath}, step skipped`)
@@ -38,8 +44,10 @@ export const collectFlows = async (projectDir: string, lockedData: LockedData):
     }
   }
 
-  for (const filePath of streamFiles) {
-    const config = await getStreamConfig(filePath)
+  for (const { filePath, config, error } of streamConfigs) {
+    if (error) {
+      throw new Error(`Failed to read config of stream ${filePath}: ${error}`)
+    }
 
     if (!config) {
       console.warn(`No config found in stream ${filePath}, stream skipped`)
@@ -1,4 +1,4 @@
-import { getStepConfig, getStreamConfig, LockedData, Printer } from '@motiadev/core'
+import { ConfigCache, getStepConfigs, getStreamConfigs, LockedData, Printer } from '@motiadev/core'
 import { randomUUID } from 'crypto'
 import { globSync } from 'glob'
 import path from 'path'
@@ -10,17 +10,22 @@ export const generateTypes = async (projectDir: string) => {
   const files = globSync('**/*.step.{ts,js,py,rb}', { absolute: true, cwd: stepsDir })
   const streamsFiles = globSync('**/*.stream.{ts,js,py,rb}', { absolute: true, cwd: stepsDir })
   const lockedData = new LockedData(projectDir, 'memory', new Printer(projectDir))
+  const cache = new ConfigCache(projectDir)
 
-  for (const filePath of files) {
-    const config = await getStepConfig(filePath)
+  for (const { filePath, config, error } of await getStepConfigs(files, { cache })) {
+    if (error) {
+      throw new Error(`Failed to read config of step ${filePath}: ${error}`)
+    }
 
     if (config) {
       lockedData.createStep({ filePath, version, config }, { disableTypeCreation: true })
     }
   }
 
-  for (const filePath of streamsFiles) {
-    const config = await getStreamConfig(filePath)
+  for (const { filePath, config, error } of await getStreamConfigs(streamsFiles, { cache })) {
+    if (error) {
+      throw new Error(`Failed to read config of stream ${filePath}: ${error}`)
+    }
 
     if (config) {
       lockedData.createStream({ filePath, config }, { disableTypeCreation: true })
@@ -1,6 +1,6 @@
 import chokidar, { FSWatcher } from 'chokidar'
 import { randomUUID } from 'crypto'
-import { getStepConfig, getStreamConfig, LockedData, Step } from '@motiadev/core'
+import { ConfigCache, getStepConfig, getStreamConfig, LockedData, Step } from '@motiadev/core'
 import type { Stream } from '@motiadev/core/dist/src/types-stream'
 
 type StepChangeHandler = (oldStep: Step, newStep: Step) => void
@@ -23,6 +23,7 @@ export class Watcher {
   constructor(
     private readonly dir: string,
     private lockedData: LockedData,
+    private readonly configCache?: ConfigCache,
   ) {}
 
   onStepChange(handler: StepChangeHandler) {
@@ -62,7 +63,7 @@ export class Watcher {
       return
     }
 
-    const config = await getStepConfig(path).catch((err) => console.error(err))
+    const config = await getStepConfig(path, this.configCache).catch((err) => console.error(err))
 
     if (!config) {
       return
@@ -75,7 +76,7 @@ export class Watcher {
   }
 
   private async onStepFileChange(path: string): Promise<void> {
-    const config = await getStepConfig(path).catch((err) => {
+    const config = await getStepConfig(path, this.configCache).catch((err) => {
       console.error(err)
     })
 
@@ -117,7 +118,7 @@ export class Watcher {
   }
 
   private async onStreamFileAdd(path: string): Promise<void> {
-    const config = await getStreamConfig(path).catch((err) => console.error(err))
+    const config = await getStreamConfig(path, this.configCache).catch((err) => console.error(err))
 
     if (!config) {
       return
@@ -128,7 +129,7 @@ export class Watcher {
 
   private async onStreamFileChange(path: string): Promise<void> {
     const stream = this.lockedData.findStream(path)
-    const config = await getStreamConfig(path).catch((err) => console.error(err))
+    const config = await getStreamConfig(path, this.configCache).catch((err) => console.error(err))
 
     if (!stream && config) {
       this.streamCreateHandler?.({ filePath: path, config, factory: null as never })
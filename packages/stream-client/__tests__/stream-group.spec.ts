@@ -133,4 +133,23 @@ describe('StreamGroupSubscription', () => {
       { id: '2', name: 'B' },
     ])
   })
+
+  it('should apply appends and patches to items', () => {
+    const sub = new StreamGroupSubscription<TestData>(joinMessage)
+    const syncData = [
+      { id: '1', name: 'A' },
+      { id: '2', name: 'B' },
+    ]
+    const timestamp = Date.now()
+
+    sub.listener(makeMessage('sync', syncData, timestamp))
+    sub.listener(makeMessage('append', { id: '1', field: 'name', value: '1' }, timestamp))
+    sub.listener(makeMessage('append', { id: '1', field: 'name', value: '2' }, timestamp))
+    sub.listener(makeMessage('patch', { id: '2', patch: { value: 3 } }, timestamp))
+
+    expect(sub.getState()).toEqual([
+      { id: '1', name: 'A12' },
+      { id: '2', name: 'B', value: 3 },
+    ])
+  })
 })
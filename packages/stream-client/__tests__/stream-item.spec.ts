@@ -63,4 +63,24 @@ describe('StreamItemSubscription', () => {
 
     expect(sub.getState()).toEqual(null)
   })
+
+  it('should apply appends sent within the same millisecond', () => {
+    const sub = new StreamItemSubscription<TestData>(joinMessage)
+    const timestamp = Date.now()
+
+    sub.listener(makeMessage('sync', { id: '1', name: 'A', value: 1 }, timestamp))
+    sub.listener(makeMessage('append', { id: '1', field: 'name', value: 'B' }, timestamp))
+    sub.listener(makeMessage('append', { id: '1', field: 'name', value: 'C' }, timestamp))
+
+    expect(sub.getState()).toEqual({ id: '1', name: 'ABC', value: 1 })
+  })
+
+  it('should patch item', () => {
+    const sub = new StreamItemSubscription<TestData>(joinMessage)
+
+    sub.listener(makeMessage('sync', { id: '1', name: 'A', value: 1 }))
+    sub.listener(makeMessage('patch', { id: '1', patch: { value: 2 } }, Date.now() + 1000))
+
+    expect(sub.getState()).toEqual({ id: '1', name: 'A', value: 2 })
+  })
 })
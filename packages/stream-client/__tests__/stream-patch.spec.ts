@@ -0,0 +1,26 @@
+import fs from 'fs'
+import path from 'path'
+import { appendToField, applyMergePatch } from '../src/stream-patch'
+
+// The server applies the events it sends with its own helpers, both are tested against the cases kept in core
+const cases = JSON.parse(
+  fs.readFileSync(path.join(__dirname, '../../core/src/__tests__/fixtures/stream-patch-cases.json'), 'utf-8'),
+)
+describe('stream patch helpers', () => {
+  it.each(cases.mergePatch)('should apply the merge patch %j', ({ target, patch, expected }) => {
+    expect(applyMergePatch(target, patch)).toEqual(expected)
+  })
+
+  it.each(cases.append)('should append to the field of %j', ({ item, field, value, expected }) => {
+    expect(appendToField(item, field, value)).toEqual(expected)
+  })
+
+  it('should not modify the item it updates', () => {
+    const item = { text: 'Hello', meta: { a: 1 } }
+
+    appendToField(item, 'text', ' world')
+    applyMergePatch(item, { meta: { a: null } })
+
+    expect(item).toEqual({ text: 'Hello', meta: { a: 1 } })
+  })
+})
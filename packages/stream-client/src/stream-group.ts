@@ -1,4 +1,5 @@
 import { StreamSubscription } from './stream-subscription'
+import { applyStreamDelta } from './stream-patch'
 import { GroupEventMessage, JoinMessage } from './stream.types'
 
 export class StreamGroupSubscription<TData extends { id: string }> extends StreamSubscription<
@@ -67,6 +68,18 @@ export class StreamGroupSubscription<TData extends { id: string }> extends Strea
       this.lastTimestamp = message.timestamp
       this.lastTimestampMap.set(messageDataId, message.timestamp)
       this.setState(state.map((item) => (item.id === messageDataId ? messageData : item)))
+    } else if (message.event.type === 'append' || message.event.type === 'patch') {
+      const event = message.event
+      const currentItemTimestamp = this.lastTimestampMap.get(event.data.id)
+
+      // Deltas sent within the same millisecond all have to be applied
+      if (currentItemTimestamp && currentItemTimestamp > message.timestamp) {
+        return
+      }
+
+      this.lastTimestamp = message.timestamp
+      this.lastTimestampMap.set(event.data.id, message.timestamp)
+      this.setState(this.getState().map((item) => (item.id === event.data.id ? applyStreamDelta(item, event) : item)))
     } else if (message.event.type === 'delete') {
       const messageDataId = message.event.data.id
       const state = this.getState()
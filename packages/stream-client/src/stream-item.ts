@@ -1,4 +1,5 @@
 import { StreamSubscription } from './stream-subscription'
+import { applyStreamDelta } from './stream-patch'
 import { ItemEventMessage, JoinMessage } from './stream.types'
 
 export class StreamItemSubscription<TData extends { id: string }> extends StreamSubscription<
@@ -12,7 +13,10 @@ export class StreamItemSubscription<TData extends { id: string }> extends Stream
   }
 
   listener(message: ItemEventMessage<TData>): void {
-    if (message.timestamp <= this.lastEventTimestamp) {
+    const isDelta = message.event.type === 'append' || message.event.type === 'patch'
+
+    // Deltas sent within the same millisecond all have to be applied
+    if (message.timestamp < this.lastEventTimestamp || (!isDelta && message.timestamp === this.lastEventTimestamp)) {
       return
     }
 
@@ -22,6 +26,12 @@ export class StreamItemSubscription<TData extends { id: string }> extends Stream
       this.setState(message.event.data)
     } else if (message.event.type === 'delete') {
       this.setState(null)
+    } else if (message.event.type === 'append' || message.event.type === 'patch') {
+      const state = this.getState()
+
+      if (state) {
+        this.setState(applyStreamDelta(state, message.event))
+      }
     } else if (message.event.type === 'event') {
       this.onEventReceived(message.event.event)
     }
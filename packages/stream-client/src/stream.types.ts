@@ -12,6 +12,8 @@ export type StreamEvent<TData extends { id: string }> =
   | { type: 'create'; data: TData }
   | { type: 'update'; data: TData }
   | { type: 'delete'; data: TData }
+  | { type: 'append'; data: { id: string; field: string; value: unknown } }
+  | { type: 'patch'; data: { id: string; patch: Record<string, unknown> } }
   | { type: 'event'; event: CustomEvent }
 export type ItemStreamEvent<TData extends { id: string }> = StreamEvent<TData> | { type: 'sync'; data: TData }
 export type GroupStreamEvent<TData extends { id: string }> = StreamEvent<TData> | { type: 'sync'; data: TData[] }
@@ -34,6 +34,9 @@ export const createMockContext = (options?: {
       delete: jest.fn(),
       clear: jest.fn(),
       getGroup: jest.fn(),
+      getMany: jest.fn(),
+      setMany: jest.fn(),
+      deleteMany: jest.fn(),
       ...state,
     },
   }
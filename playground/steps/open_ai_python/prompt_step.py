@@ -19,7 +19,8 @@ config = {
   "flows": ["open-ai"]
 }
 
-async def handler(input, context):
+# The OpenAI client is synchronous, as a plain function the handler runs in a thread instead of blocking the event loop
+def handler(input, context):
     logger = context.logger
     message = input["message"]
     assistant_message_id = input["assistantMessageId"]
@@ -34,13 +35,12 @@ async def handler(input, context):
         stream=True
     )
 
-    message_result = []
+    # Token chunks arrive faster than clients can render them, only send the new text every 100ms
+    context.streams.message_python.coalesce(0.1)
+    context.streams.message_python.set_nowait(thread_id, assistant_message_id, {"message": ""})
 
     for chunk in response:
         if chunk.choices[0].delta.content:
-            message_result.append(chunk.choices[0].delta.content)
-            context.streams.message_python.set(thread_id, assistant_message_id, {"message": "".join(message_result)})
-
-    context.streams.message_python.set(thread_id, assistant_message_id, {"message": "".join(message_result)})
+            context.streams.message_python.append_nowait(thread_id, assistant_message_id, "message", chunk.choices[0].delta.content)
 
     logger.info("OpenAI response completed")
@@ -15,9 +15,7 @@ export const config: EventConfig = {
 export const handler: Handlers['join-step'] = async (input, { emit, traceId, state, logger }) => {
   logger.info('[join-step] Handling Join Step', { input })
 
-  const stepA = await state.get<ParallelMergeStep>(traceId, 'stepA')
-  const stepB = await state.get<ParallelMergeStep>(traceId, 'stepB')
-  const stepC = await state.get<ParallelMergeStep>(traceId, 'stepC')
+  const [stepA, stepB, stepC] = await state.getMany<ParallelMergeStep>(traceId, ['stepA', 'stepB', 'stepC'])
 
   if (!stepA || !stepB || !stepC) {
     logger.info('[join-step] Not all steps done yet, ignoring for now.', { stepA, stepB, stepC })